@@ -0,0 +1,134 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Behave agent for steps which run on an event loop.
+
+Behave runs `async` step implementations on an event loop, blocking calls to ReportPortal from such steps stop all
+other coroutines of the step. `AsyncBehaveAgent` reports with the ASYNC_THREAD client, which sends requests from its
+own event loop in a background thread: hooks only schedule requests and get futures of Item UUIDs, log methods return
+awaitables which resolve when the request is done.
+"""
+
+import asyncio
+import concurrent.futures
+from os import PathLike
+from typing import Any, Mapping, Optional, Union
+
+from reportportal_client import RP, ClientType
+
+# noinspection PyProtectedMember
+from reportportal_client._internal.static.defines import NOT_SET
+
+from behave_reportportal.behave_agent import BehaveAgent, check_rp_enabled
+from behave_reportportal.config import Config
+from behave_reportportal.logs import LazyMessage
+
+
+async def _await_future(future: "asyncio.Future[Any]") -> Any:
+    return await future
+
+
+async def resolve(value: Any) -> Any:
+    """Wait for the result of a client call without blocking the running event loop.
+
+    Asynchronous clients return tasks of their own event loops, other clients return results. Deferred attachment
+    uploads return futures of upload threads, which resolve to client call results.
+
+    :param value: client call result
+    :return: resolved value
+    """
+    if isinstance(value, concurrent.futures.Future):
+        value = await asyncio.wrap_future(value)
+    if not isinstance(value, asyncio.Future):
+        return value
+    loop = value.get_loop()
+    if loop is asyncio.get_running_loop():
+        return await value
+    if loop.is_running():
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_await_future(value), loop))
+    # the loop runs only inside of blocking calls of its client
+    # noinspection PyUnresolvedReferences
+    return await asyncio.to_thread(value.blocking_result)
+
+
+class AsyncBehaveAgent(BehaveAgent):
+    """Behave agent with awaitable log methods, for steps which run on an event loop.
+
+    Hook methods have the same signatures as in `BehaveAgent` and don't wait for ReportPortal responses.
+    """
+
+    def __init__(self, cfg: Config, rp_service: Optional[RP] = NOT_SET) -> None:
+        """Initialize instance attributes.
+
+        Unless the client is given, the ASYNC_THREAD client is used regardless of `client_type`, and background
+        dispatch is turned off, since the client does not block the caller anyway.
+        """
+        if rp_service is NOT_SET:
+            cfg.client_type = ClientType.ASYNC_THREAD
+            cfg.background_dispatch = False
+        super().__init__(cfg, rp_service)
+
+    @check_rp_enabled
+    async def post_log(
+        self,
+        message: LazyMessage,
+        level: Optional[Union[int, str]] = "INFO",
+        item_id: Optional[str] = None,
+        file_to_attach: Optional[Union[PathLike, str]] = None,
+        args: Optional[Union[tuple, Mapping[str, Any]]] = None,
+    ) -> Optional[tuple[str, ...]]:
+        """Post log message to current test item, the message is built the same way as in `BehaveAgent.post_log`.
+
+        :return: response of the log batch request if the message completed a batch
+        """
+        return await self._post_log(message, level, file_to_attach, item_id or self._log_item_id, args)
+
+    @check_rp_enabled
+    async def post_launch_log(
+        self,
+        message: LazyMessage,
+        level: Optional[Union[int, str]] = "INFO",
+        file_to_attach: Optional[Union[PathLike, str]] = None,
+        args: Optional[Union[tuple, Mapping[str, Any]]] = None,
+    ) -> Optional[tuple[str, ...]]:
+        """Post log message to launch.
+
+        :return: response of the log batch request if the message completed a batch
+        """
+        return await self._post_log(message, level, file_to_attach, None, args)
+
+    async def _post_log(
+        self,
+        message: LazyMessage,
+        level: Optional[Union[int, str]],
+        file_to_attach: Optional[Union[PathLike, str]],
+        item_id: Optional[Any],
+        args: Optional[Union[tuple, Mapping[str, Any]]],
+    ) -> Optional[tuple[str, ...]]:
+        if file_to_attach:
+            # attachment files are read outside of the event loop
+            result = await asyncio.to_thread(self._log, message, level, file_to_attach, item_id, args)
+        else:
+            result = self._log(message, level, item_id=item_id, args=args)
+        return await resolve(result)
+
+    @check_rp_enabled
+    async def get_item_id(self) -> Optional[str]:
+        """Return UUID of the item which logs are posted to, waiting for the item start if necessary."""
+        return await resolve(self._log_item_id)
+
+    @check_rp_enabled
+    async def get_launch_id(self) -> Optional[str]:
+        """Return UUID of the launch, waiting for the launch start if necessary."""
+        return await resolve(self._launch_id)
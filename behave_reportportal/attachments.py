@@ -0,0 +1,191 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Module contains helpers for reading of log attachments."""
+
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, BinaryIO, Iterator, NamedTuple, Optional
+
+READ_CHUNK_SIZE = 1024 * 1024
+GZIP_MIME_TYPE = "application/gzip"
+TEXT_MIME_TYPES = {"application/javascript", "application/x-ndjson", "application/x-yaml", "application/yaml"}
+TEXT_EXTENSIONS = {".har", ".log", ".ndjson", ".yml", ".yaml"}
+
+
+class FileChangedError(OSError):
+    """Attachment file was changed after it was logged."""
+
+
+def _signature(stat: os.stat_result) -> tuple[int, int, int]:
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class FileContent(object):
+    """Attachment content backed by an open file.
+
+    The object is passed to the ReportPortal client instead of the file bytes. The client calculates batch size with
+    `len()` and reads the content only when the log batch request is serialized, so the file is never kept in memory
+    while the log waits in the batch. The file is opened in advance, so it can still be read if it was removed or
+    replaced with a new file after logging. If the content is read after it was closed, the file is opened again by its
+    path, which allows keeping many attachments without open files. Reading of a file which was overwritten or
+    replaced since the object creation raises `FileChangedError` instead of returning different content.
+    """
+
+    __slots__ = ("_file", "_size", "_path", "_signature")
+
+    _file: BinaryIO
+    _size: int
+    _path: str
+    _signature: tuple[int, int, int]
+
+    def __init__(self, file: BinaryIO) -> None:
+        """Initialize instance attributes.
+
+        :param file: File object opened in binary mode
+        """
+        self._file = file
+        self._signature = _signature(os.fstat(file.fileno()))
+        self._size = self._signature[1]
+        self._path = file.name
+
+    def __len__(self) -> int:
+        """Return file size in bytes."""
+        return self._size
+
+    def _open(self) -> BinaryIO:
+        if self._file.closed:
+            self._file = open(self._path, "rb")
+        if _signature(os.fstat(self._file.fileno())) != self._signature:
+            raise FileChangedError(f"Attachment file '{self._path}' was changed after it was logged")
+        self._file.seek(0)
+        return self._file
+
+    def read(self) -> bytes:
+        """Read the whole file content."""
+        return self._open().read()
+
+    def chunks(self) -> Iterator[bytes]:
+        """Read the file content chunk by chunk."""
+        file = self._open()
+        return iter(lambda: file.read(READ_CHUNK_SIZE), b"")
+
+    def digest(self) -> str:
+        """Calculate SHA-256 hash of the file content, reading it in chunks."""
+        sha = hashlib.sha256()
+        for chunk in self.chunks():
+            sha.update(chunk)
+        return sha.hexdigest()
+
+    def close(self) -> None:
+        """Close underlying file, it's opened again if the content is read."""
+        self._file.close()
+
+    def __del__(self) -> None:
+        """Close underlying file on object disposal."""
+        self.close()
+
+
+def oversize_message(name: str, size: int, max_size: Optional[int]) -> str:
+    """Return placeholder text for an attachment which exceeds the configured size limit.
+
+    :param name:     attachment name
+    :param size:     attachment size in bytes
+    :param max_size: size limit in bytes
+    :return: placeholder text
+    """
+    return f"Attachment '{name}' was not uploaded: its size {size} bytes exceeds the limit of {max_size} bytes."
+
+
+class UploadedAttachment(NamedTuple):
+    """Reference to an already uploaded attachment."""
+
+    name: str
+    item_id: Optional[str]
+
+
+class AttachmentIndex(object):
+    """LRU index of uploaded attachments by their content hash."""
+
+    _capacity: int
+    _entries: "OrderedDict[str, UploadedAttachment]"
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize instance attributes.
+
+        :param capacity: maximum number of remembered attachments
+        """
+        self._capacity = capacity
+        self._entries = OrderedDict()
+
+    def get(self, digest: str) -> Optional[UploadedAttachment]:
+        """Return the uploaded attachment with the given content hash or None if it's unknown.
+
+        :param digest: attachment content hash
+        :return: reference to the uploaded attachment
+        """
+        uploaded = self._entries.get(digest)
+        if uploaded:
+            self._entries.move_to_end(digest)
+        return uploaded
+
+    def put(self, digest: str, name: str, item_id: Optional[str]) -> None:
+        """Remember the uploaded attachment.
+
+        :param digest:  attachment content hash
+        :param name:    attachment name
+        :param item_id: UUID of the item the attachment was logged to
+        """
+        self._entries[digest] = UploadedAttachment(name, item_id)
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def forget(self, item_ids: set[str]) -> None:
+        """Forget attachments logged to the given items, e.g. if the items were not reported.
+
+        :param item_ids: UUIDs of the items
+        """
+        for digest in [d for d, uploaded in self._entries.items() if uploaded.item_id in item_ids]:
+            del self._entries[digest]
+
+    def clear(self) -> None:
+        """Forget all uploaded attachments."""
+        self._entries.clear()
+
+
+def is_text(name: str, mime: str) -> bool:
+    """Check if the attachment is a text one and worth compressing.
+
+    :param name: attachment file name
+    :param mime: attachment MIME type
+    :return: True for text, JSON, XML and other textual formats
+    """
+    return (
+        mime.startswith("text/")
+        or mime.endswith(("json", "xml"))
+        or mime in TEXT_MIME_TYPES
+        or os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS
+    )
+
+
+def compress(name: str, data: bytes) -> dict[str, Any]:
+    """Return gzip compressed attachment.
+
+    :param name: attachment file name
+    :param data: attachment content
+    :return: attachment with the `.gz` file name and the gzip MIME type
+    """
+    return {"name": f"{name}.gz", "data": gzip.compress(data, mtime=0), "mime": GZIP_MIME_TYPE}
@@ -13,19 +13,23 @@
 
 """Functionality for integration of Behave tests with ReportPortal."""
 
+import inspect
+import json
+import logging
 import mimetypes
 import os
-import traceback
+import threading
 from collections import defaultdict
-from functools import wraps
+from contextlib import nullcontext
+from functools import partial, wraps
 from os import PathLike
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, ContextManager, Mapping, Optional, Union
+from warnings import warn
 
 from behave.model import Feature, Scenario, Step
 from behave.model_core import BasicStatement, TagAndStatusStatement, TagStatement
 from behave.runner import Context
-from prettytable import MARKDOWN, PrettyTable
-from reportportal_client import RP, create_client
+from reportportal_client import RP, BatchedRPClient, RPClient, ThreadedRPClient, create_client
 
 # noinspection PyProtectedMember
 from reportportal_client._internal.static.defines import NOT_SET
@@ -37,7 +41,38 @@ from reportportal_client.helpers import (
     timestamp,
 )
 
-from behave_reportportal.config import Config, LogLayout
+from behave_reportportal.attachments import (
+    AttachmentIndex,
+    FileContent,
+    UploadedAttachment,
+    compress,
+    is_text,
+    oversize_message,
+)
+from behave_reportportal.captured import collect_output, format_output
+from behave_reportportal.compression import enable_log_compression
+from behave_reportportal.config import (
+    CaptureMode,
+    Config,
+    FixtureReportMode,
+    LogLayout,
+    OutlineMode,
+    SkippedStepsMode,
+)
+from behave_reportportal.coordinator import LaunchCoordinator
+from behave_reportportal.dispatch import BackgroundDispatcher
+from behave_reportportal.failures import FINGERPRINT_ATTRIBUTE, FailureIndex
+from behave_reportportal.fixtures import TimedCleanup, instrument_cleanups
+from behave_reportportal.handler import DEFAULT_HANDLER_CAPACITY, AgentLogHandler
+from behave_reportportal.journal import JournalClient
+from behave_reportportal.logs import CoalescedLog, LazyMessage, LogLimiter, level_rank, render_message
+from behave_reportportal.outlines import CollapsedOutline, RecordingClient
+from behave_reportportal.posthoc import PostHocReporter
+from behave_reportportal.profiling import Profiler, ProfilingClient
+from behave_reportportal.rendering import StepContentCache, markdown_table
+from behave_reportportal.tags import get_parsed_tags
+from behave_reportportal.tracebacks import format_traceback, strip_traceback
+from behave_reportportal.uploads import UploadPool
 from behave_reportportal.utils import Singleton
 
 STATUS_MAPPINGS: dict[str, str] = defaultdict(lambda: "FAILED")
@@ -59,6 +94,8 @@ def convert_to_rp_status(behave_status: str) -> str:
 
 def check_rp_enabled(func: Callable) -> Callable:
     """Verify is RP is enabled in config."""
+    if inspect.iscoroutinefunction(func):
+        return _check_rp_enabled_async(func)
 
     @wraps(func)
     def wrap(*args, **kwargs):
@@ -66,37 +103,73 @@ def check_rp_enabled(func: Callable) -> Callable:
             # noinspection PyProtectedMember
             if not args[0]._rp:
                 return None
+            with _profiled_hook(args[0], func.__name__):
+                return func(*args, **kwargs)
 
         return func(*args, **kwargs)
 
     return wrap
 
 
+def _check_rp_enabled_async(func: Callable) -> Callable:
+    @wraps(func)
+    async def wrap(*args, **kwargs):
+        if args and isinstance(args[0], BehaveAgent):
+            # noinspection PyProtectedMember
+            if not args[0]._rp:
+                return None
+            with _profiled_hook(args[0], func.__name__):
+                return await func(*args, **kwargs)
+
+        return await func(*args, **kwargs)
+
+    return wrap
+
+
+def _profiled_hook(agent: "BehaveAgent", name: str) -> ContextManager[None]:
+    """Return context which measures the hook if profiling is enabled."""
+    # noinspection PyProtectedMember
+    profiler = agent._profiler
+    return profiler.hook(name) if profiler else nullcontext()
+
+
 def create_rp_service(cfg: Config) -> Optional[RP]:
     """Create instance of ReportPortalService."""
     if cfg.enabled:
-        return create_client(
-            client_type=cfg.client_type,
-            endpoint=cfg.endpoint,
-            project=cfg.project,
-            api_key=cfg.api_key,
-            is_skipped_an_issue=cfg.is_skipped_an_issue,
-            launch_uuid=cfg.launch_uuid,
-            retries=cfg.retries,
-            mode="DEBUG" if cfg.debug_mode else "DEFAULT",
-            log_batch_size=cfg.log_batch_size,
-            log_batch_payload_limit=cfg.log_batch_payload_limit,
-            launch_uuid_print=cfg.launch_uuid_print,
-            print_output=cfg.launch_uuid_print_output,
-            http_timeout=cfg.http_timeout,
-            # OAuth 2.0 parameters
-            oauth_uri=cfg.oauth_uri,
-            oauth_username=cfg.oauth_username,
-            oauth_password=cfg.oauth_password,
-            oauth_client_id=cfg.oauth_client_id,
-            oauth_client_secret=cfg.oauth_client_secret,
-            oauth_scope=cfg.oauth_scope,
-        )
+        if cfg.journal_file:
+            client = JournalClient(cfg.journal_file, project=cfg.project, launch_uuid=cfg.launch_uuid)
+        else:
+            client = create_client(
+                client_type=cfg.client_type,
+                endpoint=cfg.endpoint,
+                project=cfg.project,
+                api_key=cfg.api_key,
+                is_skipped_an_issue=cfg.is_skipped_an_issue,
+                launch_uuid=cfg.launch_uuid,
+                retries=cfg.retries,
+                mode="DEBUG" if cfg.debug_mode else "DEFAULT",
+                log_batch_size=cfg.log_batch_size,
+                log_batch_payload_limit=cfg.log_batch_payload_limit,
+                launch_uuid_print=cfg.launch_uuid_print,
+                print_output=cfg.launch_uuid_print_output,
+                http_timeout=cfg.http_timeout,
+                # OAuth 2.0 parameters
+                oauth_uri=cfg.oauth_uri,
+                oauth_username=cfg.oauth_username,
+                oauth_password=cfg.oauth_password,
+                oauth_client_id=cfg.oauth_client_id,
+                oauth_client_secret=cfg.oauth_client_secret,
+                oauth_scope=cfg.oauth_scope,
+            )
+            if cfg.log_batch_compression and not enable_log_compression(client):
+                warn(
+                    "Log batch compression is supported only by the SYNC client, ignoring it",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        if client and cfg.background_dispatch:
+            return BackgroundDispatcher(client, cfg.dispatch_queue_size)
+        return client
     return None
 
 
@@ -113,14 +186,33 @@ class BehaveAgent(metaclass=Singleton):
     _scenario_id: Optional[str]
     _step_id: Optional[str]
     _log_item_id: Optional[str]
-    _ignore_tag_prefixes: list[str]
+    _lazy_attachments: bool
+    _attachment_index: Optional[AttachmentIndex]
+    _attachment_lock: threading.Lock
+    _upload_pool: Optional[UploadPool]
+    _post_hoc: Optional[PostHocReporter]
+    _coordinator: Optional[LaunchCoordinator]
+    _launch_failed: bool
+    _profiler: Optional[Profiler]
+    _step_contents: StepContentCache
+    _outline: Optional[CollapsedOutline]
+    _recorder: Optional[RecordingClient]
+    _reporting_rp: Optional[RP]
+    _scenario_log: Optional[CoalescedLog]
+    _deferred_finishes: list[Callable[..., None]]
+    _failure_index: Optional[FailureIndex]
+    _scenario_failures: list[str]
+    _log_limiter: Optional[LogLimiter]
+    _log_threshold: Optional[int]
+    _log_handlers: list[AgentLogHandler]
 
     def __init__(self, cfg: Config, rp_service: Optional[RP] = NOT_SET) -> None:
         """Initialize instance attributes."""
+        self._profiler = Profiler() if cfg.profiling else None
         if rp_service is NOT_SET:
-            self._rp = create_rp_service(cfg)
+            self._rp = self._profiled(create_rp_service(cfg))
         else:
-            self._rp = rp_service
+            self._rp = self._profiled(rp_service)
         self._cfg = cfg
         self._handle_lifecycle = True
         self._launch_id = None
@@ -130,15 +222,87 @@ class BehaveAgent(metaclass=Singleton):
         self._log_item_id = None
         self.agent_name = "behave-reportportal"
         self.agent_version = get_package_version(self.agent_name)
-        # these tags are ignored during collection of test attributes
-        # there are other rules for processing of these tags
-        self._ignore_tag_prefixes = ["attribute", "fixture", "test_case_id"]
+        # the journal client copies attachment content at once, the synchronous client reads it on log batch
+        # serialization, so the file should not be changed until the batch is sent
+        self._lazy_attachments = isinstance(self._client, JournalClient) or (
+            cfg.lazy_attachments and isinstance(self._client, RPClient)
+        )
+        self._attachment_index = (
+            AttachmentIndex(cfg.attachment_dedup_cache_size) if cfg.attachment_deduplication else None
+        )
+        self._attachment_lock = threading.Lock()
+        self._upload_pool = UploadPool(cfg.upload_workers) if cfg.upload_workers else None
+        self._post_hoc = PostHocReporter() if cfg.post_hoc_reporting else None
+        self._coordinator = (
+            LaunchCoordinator(
+                cfg.launch_coordinator_file, cfg.launch_coordinator_workers, cfg.launch_coordinator_run_id
+            )
+            if cfg.launch_coordinator_file
+            else None
+        )
+        self._launch_failed = False
+        self._step_contents = StepContentCache()
+        self._outline = None
+        self._recorder = None
+        self._reporting_rp = None
+        # step, fixture and cleanup messages of a scenario are sent as one log entry in the SCENARIO layout
+        self._scenario_log = (
+            CoalescedLog(cfg.coalesced_log_size)
+            if cfg.coalesce_step_logs and cfg.log_layout is LogLayout.SCENARIO
+            else None
+        )
+        # item finishes which wait for the item cleanup functions to be executed
+        self._deferred_finishes = []
+        self._failure_index = FailureIndex() if cfg.failure_deduplication else None
+        self._scenario_failures = []
+        self._log_limiter = (
+            LogLimiter(
+                cfg.log_budget_messages,
+                cfg.log_budget_bytes,
+                cfg.launch_log_budget_messages,
+                cfg.launch_log_budget_bytes,
+                cfg.log_budget_period,
+                cfg.log_budget_sampling,
+            )
+            if cfg.log_budget_messages
+            or cfg.log_budget_bytes
+            or cfg.launch_log_budget_messages
+            or cfg.launch_log_budget_bytes
+            else None
+        )
+        self._log_threshold = level_rank(cfg.log_level) if cfg.log_level is not None else None
+        self._log_handlers = []
+
+    @property
+    def _client(self) -> Optional[RP]:
+        """Return the client which sends requests to ReportPortal."""
+        client = self._rp
+        while isinstance(client, (ProfilingClient, BackgroundDispatcher)):
+            client = client.client
+        return client
+
+    def _profiled(self, client: Optional[RP]) -> Optional[RP]:
+        """Wrap the client to measure its calls if profiling is enabled."""
+        if client and self._profiler:
+            return ProfilingClient(client, self._profiler)
+        return client
 
     @check_rp_enabled
     def start_launch(self, _: Context, **kwargs: Any) -> None:
         """Start launch in ReportPortal."""
+        if self._attachment_index is not None:
+            self._attachment_index.clear()
+        if self._failure_index is not None:
+            self._failure_index.clear()
+        if self._coordinator and not self._rp.launch_uuid:
+            self._join_coordinated_launch(**kwargs)
+            return
+        self._coordinator = None
         self._handle_lifecycle = False if self._rp.launch_uuid else True
-        self._launch_id = self._rp.launch_uuid or self._rp.start_launch(
+        self._launch_id = self._rp.launch_uuid or self._start_new_launch(**kwargs)
+
+    def _start_new_launch(self, **kwargs: Any) -> Optional[str]:
+        return self._rp.start_launch(
             name=self._cfg.launch_name,
             start_time=timestamp(),
             attributes=self._get_launch_attributes(),
@@ -148,18 +312,101 @@ class BehaveAgent(metaclass=Singleton):
             **kwargs,
         )
 
+    def _join_coordinated_launch(self, **kwargs: Any) -> None:
+        """Start the launch or join the one started by another process.
+
+        Joined launch is reported the same way as one passed with `launch_uuid`, the last process to finish will take
+        the launch over and finish it.
+        """
+        self._launch_id, created = self._coordinator.join(lambda: self._start_shared_launch(**kwargs))
+        self._handle_lifecycle = False
+        if self._launch_id and not created:
+            self._cfg.launch_uuid = self._launch_id
+            self._rp.close()
+            self._rp = self._profiled(create_rp_service(self._cfg))
+
+    def _start_shared_launch(self, **kwargs: Any) -> Optional[str]:
+        """Start a new launch and wait for its UUID, asynchronous clients return a task of the UUID."""
+        launch_uuid = self._start_new_launch(**kwargs)
+        if hasattr(launch_uuid, "blocking_result"):
+            launch_uuid = launch_uuid.blocking_result()
+        return launch_uuid
+
     @check_rp_enabled
     def finish_launch(self, _: Context, **kwargs: Any) -> None:
         """Finish launch in ReportPortal."""
+        self._flush_log_handlers()
+        self._flush_deferred_finishes()
+        if self._post_hoc:
+            self._finish_post_hoc()
+        if self._upload_pool is not None:
+            self._finish_uploads()
+        if self._log_limiter:
+            self._finish_log_budget(None)
+        if self._profiler and self._launch_id:
+            self._log_profile()
+        if self._failure_index and self._launch_id:
+            self._rp.log(time=timestamp(), message=self._failure_index.summary(), level="INFO")
+        if self._coordinator:
+            status = self._coordinator.leave(self._launch_failed)
+            if status:
+                self._own_launch()
+                self._handle_lifecycle = True
+                kwargs.setdefault("status", status)
         if self._handle_lifecycle:
+            if self._profiler and self._cfg.profiling_attributes:
+                # attributes sent on finish replace the ones of the launch start, so the configured ones are repeated
+                attributes = kwargs.get("attributes") or self._get_launch_attributes()
+                kwargs["attributes"] = attributes + self._profiler.attributes()
             self._rp.finish_launch(end_time=timestamp(), **kwargs)
         self._rp.close()
 
+    def _own_launch(self) -> None:
+        """Make the client finish the launch it joined, sync and async clients name the flag differently."""
+        client = self._client
+        if isinstance(client, (ThreadedRPClient, BatchedRPClient)):
+            client.own_launch = True
+        else:
+            # noinspection PyUnresolvedReferences
+            client.use_own_launch = True
+
+    def _finish_post_hoc(self) -> None:
+        """Send the feature which was not finished and wait until all features are sent."""
+        if self._post_hoc.recorder:
+            self._rp = self._post_hoc.submit()
+        self._post_hoc.close()
+
+    def _finish_uploads(self) -> None:
+        """Wait for deferred attachment uploads and report the ones which did not finish in time."""
+        timeout = self._cfg.upload_timeout
+        not_finished = self._upload_pool.close(timeout)
+        if not_finished and self._launch_id:
+            self._rp.log(
+                time=timestamp(),
+                message=f"{not_finished} attachment(s) were not uploaded in {timeout} seconds",
+                level="WARN",
+            )
+
+    def _log_profile(self) -> None:
+        """Post the agent self-profiling summary to the launch."""
+        self._rp.log(
+            time=timestamp(),
+            message=self._profiler.format_summary(),
+            level="INFO",
+            attachment={
+                "name": "agent_profile.json",
+                "data": json.dumps(self._profiler.summary(), indent=2).encode("utf-8"),
+                "mime": "application/json",
+            },
+        )
+
     @check_rp_enabled
     def start_feature(self, context: Context, feature: Feature, **kwargs: Any) -> None:
         """Start feature in ReportPortal."""
-        if feature.tags and "skip" in feature.tags:
+        if get_parsed_tags(feature.tags).skip:
             feature.skip("Marked with @skip")
+        if self._post_hoc:
+            self._rp = self._post_hoc.start(self._rp, feature, self._launch_id)
         self._feature_id = self._rp.start_test_item(
             name=feature.name,
             start_time=timestamp(),
@@ -169,32 +416,55 @@ class BehaveAgent(metaclass=Singleton):
             attributes=self._attributes(feature),
             **kwargs,
         )
+        self._bind(self._feature_id, feature)
         self._log_fixtures(feature, "BEFORE_SUITE", self._feature_id)
         self._log_item_id = self._feature_id
 
     @check_rp_enabled
     def finish_feature(self, context: Context, feature: Feature, status: Optional[str] = None, **kwargs: Any) -> None:
         """Finish feature in ReportPortal."""
-        if feature.tags and "skip" in feature.tags:
+        self._flush_log_handlers()
+        self._flush_deferred_finishes()
+        if self._outline:
+            self._finish_outline()
+        if get_parsed_tags(feature.tags).skip:
             status = "SKIPPED"
-        self._log_cleanups(context, "feature")
-        self._rp.finish_test_item(
-            item_id=self._feature_id,
-            end_time=timestamp(),
-            status=status or convert_to_rp_status(feature.status.name),
-            **kwargs,
-        )
+        status = status or convert_to_rp_status(feature.status.name)
+        if self._log_limiter:
+            self._finish_log_budget(self._feature_id)
+        self._launch_failed = self._launch_failed or status == "FAILED"
+        finish = partial(self._rp.finish_test_item, item_id=self._feature_id, status=status, **kwargs)
+        if self._post_hoc and self._post_hoc.recorder:
+            finish = partial(self._submit_feature, self._post_hoc.recorder, finish)
+        if not self._log_cleanups(context, "feature", finish):
+            finish(end_time=timestamp())
+
+    def _submit_feature(self, recorder: RecordingClient, finish: Callable[..., None], end_time: str) -> None:
+        """Finish the recorded feature and send it in background, the next feature is reported meanwhile."""
+        finish(end_time=end_time)
+        if self._post_hoc.recorder is recorder:
+            self._rp = self._post_hoc.submit()
+
+    def _bind(self, item_id: Optional[str], element: Union[Feature, Scenario, Step]) -> None:
+        """Let the post-hoc reporter replace hook times of the item with the times measured by Behave."""
+        if self._post_hoc and self._post_hoc.recorder:
+            self._post_hoc.recorder.bind(item_id, element)
 
     @check_rp_enabled
     def start_scenario(self, context: Context, scenario: Scenario, **kwargs: Any) -> None:
         """Start scenario in ReportPortal."""
-        if scenario.tags and "skip" in scenario.tags:
+        if get_parsed_tags(scenario.tags).skip:
             scenario.skip("Marked with @skip")
+        if self._cfg.outline_mode is OutlineMode.COLLAPSED:
+            self._start_outline_row(context, scenario)
+        if self._scenario_log is not None:
+            self._scenario_log.clear()
+        self._scenario_failures = []
         self._scenario_id = self._rp.start_test_item(
             name=scenario.name,
             start_time=timestamp(),
             item_type="STEP",
-            parent_item_id=self._feature_id,
+            parent_item_id=self._outline.item_id if self._outline else self._feature_id,
             code_ref=self._code_ref(scenario),
             attributes=self._attributes(scenario),
             parameters=self._get_parameters(context),
@@ -202,6 +472,7 @@ class BehaveAgent(metaclass=Singleton):
             test_case_id=self._test_case_id(scenario),
             **kwargs,
         )
+        self._bind(self._scenario_id, scenario)
         self._log_fixtures(scenario, "BEFORE_TEST", self._scenario_id)
         self._log_item_id = self._scenario_id
 
@@ -214,27 +485,129 @@ class BehaveAgent(metaclass=Singleton):
         **kwargs: Any,
     ) -> None:
         """Finish scenario in ReportPortal."""
-        if scenario.tags and "skip" in scenario.tags:
+        self._flush_log_handlers()
+        if get_parsed_tags(scenario.tags).skip:
             status = "SKIPPED"
         rp_status = convert_to_rp_status(scenario.status.name)
         if rp_status == "FAILED":
             self._log_skipped_steps(context, scenario)
             self._log_scenario_exception(scenario)
-        self._log_cleanups(context, "scenario")
-        self._rp.finish_test_item(
-            item_id=self._scenario_id,
-            end_time=timestamp(),
-            status=status or rp_status,
-            **kwargs,
-        )
+        if self._cfg.capture_output is not CaptureMode.OFF:
+            self._log_captured_output(scenario, rp_status)
+        if self._scenario_failures:
+            # attributes sent on finish replace the ones of the item start, so the tag attributes are repeated
+            kwargs["attributes"] = (kwargs.get("attributes") or self._attributes(scenario)) + [
+                {"key": FINGERPRINT_ATTRIBUTE, "value": fingerprint} for fingerprint in self._scenario_failures
+            ]
+        if self._log_limiter:
+            self._finish_log_budget(self._scenario_id)
+        finish = partial(self._rp.finish_test_item, item_id=self._scenario_id, status=status or rp_status, **kwargs)
+        deferred = self._log_cleanups(context, "scenario", finish)
+        if self._scenario_log:
+            self._flush_scenario_log()
+        if not deferred:
+            finish(end_time=timestamp())
         self._log_item_id = self._feature_id
+        if self._recorder:
+            self._finish_outline_row(context, status or rp_status)
+
+    def _log_captured_output(self, scenario: Scenario, rp_status: str) -> None:
+        """Post the output captured by Behave for the scenario steps, only the last part of it for passed scenarios."""
+        output = collect_output(scenario, None if rp_status == "FAILED" else self._cfg.capture_max_size)
+        if not output:
+            return
+        text = format_output(output)
+        if self._cfg.capture_output is CaptureMode.ATTACHMENT:
+            self._rp.log(
+                time=timestamp(),
+                message="Captured output",
+                level="INFO",
+                attachment={"name": "captured_output.txt", "data": text.encode("utf-8"), "mime": "text/plain"},
+                item_id=self._scenario_id,
+            )
+            return
+        chunks = CoalescedLog(self._cfg.coalesced_log_size)
+        for line in text.splitlines():
+            chunks.add(line)
+        for _, chunk in chunks.flush():
+            self._rp.log(time=timestamp(), message=chunk, level="INFO", item_id=self._scenario_id)
+
+    def _flush_scenario_log(self) -> None:
+        for time, message in self._scenario_log.flush():
+            self._rp.log(time=time or timestamp(), message=message, level="INFO", item_id=self._scenario_id)
+
+    def _start_outline_row(self, context: Context, scenario: Scenario) -> None:
+        """Start the outline parent item on the first row and start recording of the row reporting calls."""
+        outline = scenario.parent if context.active_outline else None
+        if self._outline and self._outline.outline is not outline:
+            self._finish_outline()
+        if outline is None:
+            return
+        if not self._outline:
+            item_id = self._rp.start_test_item(
+                name=outline.name,
+                start_time=timestamp(),
+                item_type="TEST",
+                parent_item_id=self._feature_id,
+                code_ref=self._code_ref(outline),
+                attributes=self._attributes(outline),
+                description="\n".join(outline.description) if outline.description else None,
+            )
+            self._bind(item_id, outline)
+            self._outline = CollapsedOutline(outline, item_id)
+        self._recorder = RecordingClient(self._launch_id)
+        self._reporting_rp, self._rp = self._rp, self._recorder
+
+    def _finish_outline_row(self, context: Context, status: str) -> None:
+        """Stop recording of the row, send recorded calls only if the row should be reported as a separate item."""
+        recorder, self._recorder = self._recorder, None
+        self._rp, self._reporting_rp = self._reporting_rp, None
+        if self._outline.add_row(context.active_outline.headings, context.active_outline.cells, status):
+            recorder.replay(self._rp)
+        elif self._attachment_index is not None:
+            self._attachment_index.forget(recorder.item_ids)
+
+    def _finish_outline(self) -> None:
+        """Post the summary of the collapsed outline and finish its parent item."""
+        outline, self._outline = self._outline, None
+        self._rp.log(time=timestamp(), message=outline.summary(), level="INFO", item_id=outline.item_id)
+        self._rp.finish_test_item(item_id=outline.item_id, end_time=timestamp(), status=outline.status)
 
     def _log_skipped_steps(self, context: Context, scenario: Scenario) -> None:
-        if self._cfg.log_layout is not LogLayout.SCENARIO:
-            skipped_steps = [step for step in scenario.steps if step.status.name == "skipped"]
-            for step in skipped_steps:
-                self.start_step(context, step)
-                self.finish_step(context, step)
+        if self._cfg.log_layout is LogLayout.SCENARIO:
+            return
+        skipped_steps = [step for step in scenario.steps if step.status.name == "skipped"]
+        if not skipped_steps:
+            return
+        mode = self._cfg.skipped_steps_mode
+        if mode is SkippedStepsMode.SUMMARY:
+            self._rp.log(
+                time=timestamp(),
+                message="Skipped steps:\n" + "\n".join(f"[{step.keyword}]: {step.name}" for step in skipped_steps),
+                level="INFO",
+                item_id=self._scenario_id,
+            )
+            return
+        if mode is SkippedStepsMode.LIGHT:
+            self._report_skipped_steps(skipped_steps)
+            return
+        for step in skipped_steps:
+            self.start_step(context, step)
+            self.finish_step(context, step)
+
+    def _report_skipped_steps(self, steps: list[Step]) -> None:
+        """Report skipped steps as one item which lists them in its description, with the same start and end time."""
+        time = timestamp()
+        item_id = self._rp.start_test_item(
+            name=f"Skipped steps ({len(steps)})",
+            start_time=time,
+            item_type="STEP",
+            parent_item_id=self._scenario_id,
+            code_ref=self._code_ref(steps[0]),
+            description="\n".join(f"[{step.keyword}]: {step.name}" for step in steps),
+            has_stats=self._cfg.log_layout is not LogLayout.NESTED,
+        )
+        self._rp.finish_test_item(item_id=item_id, end_time=time, status="SKIPPED")
 
     @check_rp_enabled
     def start_step(self, _: Context, step: Step, **kwargs: Any) -> None:
@@ -251,72 +624,151 @@ class BehaveAgent(metaclass=Singleton):
                 has_stats=False if self._cfg.log_layout is LogLayout.NESTED else True,
                 **kwargs,
             )
+            self._bind(self._step_id, step)
             self._log_item_id = self._step_id
             if self._cfg.log_layout is LogLayout.NESTED and step_content:
-                self.post_log(step_content)
+                self._log(step_content, "INFO", item_id=self._step_id)
 
     @check_rp_enabled
     def finish_step(self, _: Context, step: Step, **kwargs: Any) -> None:
         """Finish test in ReportPortal."""
+        self._flush_log_handlers()
         if self._cfg.log_layout is not LogLayout.SCENARIO:
             self._finish_step_step_based(step, **kwargs)
             return
         self._finish_step_scenario_based(step, **kwargs)
 
+    def create_log_handler(
+        self, level: int = logging.NOTSET, capacity: int = DEFAULT_HANDLER_CAPACITY
+    ) -> AgentLogHandler:
+        """Create logging handler which posts records to the current item.
+
+        Records are buffered and posted in bulk when the buffer is full and before the agent finishes an item.
+
+        :param level:    minimum level of records
+        :param capacity: number of buffered records which triggers posting
+        :return: logging handler
+        """
+        handler = AgentLogHandler(self, level, capacity)
+        self._log_handlers.append(handler)
+        return handler
+
+    def _flush_log_handlers(self) -> None:
+        for handler in self._log_handlers:
+            handler.flush()
+
     @check_rp_enabled
     def post_log(
         self,
-        message: str,
+        message: LazyMessage,
         level: Optional[Union[int, str]] = "INFO",
         item_id: Optional[str] = None,
         file_to_attach: Optional[Union[PathLike, str]] = None,
+        args: Optional[Union[tuple, Mapping[str, Any]]] = None,
     ) -> None:
-        """Post log message to current test item."""
+        """Post log message to current test item.
+
+        The message may be a function which returns the text, or a `%` format template for `args`. In both cases the
+        text is built only if the message passes the `log_level` threshold.
+        """
         self._log(
             message,
             level,
             file_to_attach=file_to_attach,
             item_id=item_id or self._log_item_id,
+            args=args,
         )
 
     @check_rp_enabled
     def post_launch_log(
         self,
-        message: str,
+        message: LazyMessage,
         level: Optional[Union[int, str]] = "INFO",
         file_to_attach: Optional[Union[PathLike, str]] = None,
+        args: Optional[Union[tuple, Mapping[str, Any]]] = None,
     ) -> None:
-        """Post log message to launch."""
-        self._log(message, level, file_to_attach=file_to_attach)
+        """Post log message to launch, the message is built the same way as in `post_log`."""
+        self._log(message, level, file_to_attach=file_to_attach, args=args)
 
     def _log(
         self,
-        message: str,
+        message: LazyMessage,
         level: Optional[Union[int, str]],
         file_to_attach: Optional[Union[PathLike, str]] = None,
         item_id: Optional[str] = None,
-    ) -> None:
-        attachment = None
+        args: Optional[Union[tuple, Mapping[str, Any]]] = None,
+        time: Optional[str] = None,
+    ) -> Any:
+        if self._log_threshold is not None and level_rank(level) < self._log_threshold:
+            return None
+        message = render_message(message, args)
+        if self._log_limiter and not self._log_limiter.allow(item_id, level, self._log_size(message, file_to_attach)):
+            return None
         if file_to_attach:
             try:
-                with open(file_to_attach, "rb") as f:
-                    attachment = {
-                        "name": os.path.basename(file_to_attach),
-                        "data": f.read(),
-                        "mime": mimetypes.guess_type(file_to_attach)[0] or "application/octet-stream",
-                    }
+                content = FileContent(open(file_to_attach, "rb"))
             except OSError:
                 self._rp.log(
                     time=timestamp(), message=f"Attachment not found: {file_to_attach}", level="WARN", item_id=item_id
                 )
-        self._rp.log(
-            time=timestamp(),
+            else:
+                log_args = (self._rp, time or timestamp(), message, level, item_id, content, file_to_attach)
+                # recorded calls are replayed or dropped later, so they can't get late uploads
+                if self._upload_pool is not None and not isinstance(self._rp, RecordingClient):
+                    return self._upload_pool.submit(self._log_attachment, *log_args)
+                return self._log_attachment(*log_args)
+        return self._rp.log(
+            time=time or timestamp(),
             message=message,
             level=level,
-            attachment=attachment,
+            attachment=None,
             item_id=item_id,
         )
 
+    def _log_attachment(
+        self,
+        rp: RP,
+        time: str,
+        message: str,
+        level: Optional[Union[int, str]],
+        item_id: Optional[str],
+        content: FileContent,
+        file_to_attach: Union[PathLike, str],
+    ) -> Any:
+        """Check, prepare and post the attachment, in the deferred upload mode it's called from upload threads."""
+        attachment = None
+        name = os.path.basename(file_to_attach)
+        max_size = self._cfg.attachment_max_size
+        if max_size is not None and len(content) > max_size:
+            content.close()
+            message = f"{message}\n\n{oversize_message(name, len(content), max_size)}"
+        elif uploaded := self._attachment_index and self._find_uploaded(content, name, item_id):
+            content.close()
+            reference = self._cfg.attachment_dedup_message.format(name=uploaded.name, item_id=uploaded.item_id)
+            message = f"{message}\n\n{reference}"
+        else:
+            attachment = self._attachment(name, content, mimetypes.guess_type(file_to_attach)[0])
+        return rp.log(time=time, message=message, level=level, attachment=attachment, item_id=item_id)
+
+    def _attachment(self, name: str, content: FileContent, mime: Optional[str]) -> dict[str, Any]:
+        """Return attachment of the log request, gzip compressed if it's a text one above the threshold."""
+        mime = mime or "application/octet-stream"
+        threshold = self._cfg.attachment_compression_threshold
+        if threshold is not None and len(content) > threshold and is_text(name, mime):
+            data = content.read()
+            content.close()
+            return compress(name, data)
+        return {"name": name, "data": content if self._lazy_attachments else content.read(), "mime": mime}
+
+    def _find_uploaded(self, content: FileContent, name: str, item_id: Optional[str]) -> Optional[UploadedAttachment]:
+        """Return the earlier upload of the same content or remember the given one as uploaded."""
+        digest = content.digest()
+        with self._attachment_lock:
+            uploaded = self._attachment_index.get(digest)
+            if not uploaded:
+                self._attachment_index.put(digest, name, item_id or self._launch_id)
+        return uploaded
+
     def _get_launch_attributes(self) -> list[dict[str, str]]:
         """Return launch attributes in the format supported by the rp."""
         launch_attributes = self._cfg.launch_attributes
@@ -325,23 +777,31 @@ class BehaveAgent(metaclass=Singleton):
         system_attributes["agent"] = f"{self.agent_name}|{self.agent_version}"
         return attributes + dict_to_payload(system_attributes)
 
+    def _build_step_content(self, step: Step) -> str:
+        return self._step_contents.get(step)
+
     @staticmethod
-    def _build_step_content(step: Step) -> str:
-        txt = ""
-        if step.text:
-            txt += f"```\n{step.text}\n```\n"
-        if step.table:
-            pt = PrettyTable(field_names=step.table.headings)
-            for row in step.table.rows:
-                pt.add_row(row.cells)
-            pt.set_style(MARKDOWN)
-            txt += pt.get_string()
-        return txt
+    def _log_size(message: str, file_to_attach: Optional[Union[PathLike, str]]) -> int:
+        size = len(message.encode("utf-8"))
+        if file_to_attach:
+            try:
+                size += os.path.getsize(file_to_attach)
+            except OSError:
+                pass
+        return size
+
+    def _finish_log_budget(self, item_id: Optional[str]) -> None:
+        """Post the number of suppressed log messages of the finished item."""
+        summary = self._log_limiter.finish_item(item_id)
+        if summary:
+            self._rp.log(time=timestamp(), message=summary, level="WARN", item_id=item_id)
 
     def _finish_step_step_based(self, step: Step, status: Optional[str] = None, **kwargs: Any) -> None:
         rp_status = convert_to_rp_status(step.status.name)
         if rp_status == "FAILED":
             self._log_step_exception(step, self._step_id)
+        if self._log_limiter:
+            self._finish_log_budget(self._step_id)
         self._rp.finish_test_item(
             item_id=self._step_id,
             end_time=timestamp(),
@@ -352,13 +812,11 @@ class BehaveAgent(metaclass=Singleton):
 
     def _finish_step_scenario_based(self, step: Step, **kwargs: Any) -> None:
         step_content = self._build_step_content(step)
-        self._rp.log(
-            item_id=self._scenario_id,
-            time=timestamp(),
-            message=f"[{step.keyword}]: {step.name}." + (f"\n\n{step_content}" if step_content else ""),
-            level="INFO",
-            **kwargs,
-        )
+        message = f"[{step.keyword}]: {step.name}." + (f"\n\n{step_content}" if step_content else "")
+        if self._scenario_log is not None and not kwargs:
+            self._scenario_log.add(message, timestamp())
+        else:
+            self._rp.log(item_id=self._scenario_id, time=timestamp(), message=message, level="INFO", **kwargs)
         if convert_to_rp_status(step.status.name) == "FAILED":
             self._log_step_exception(step, self._scenario_id)
 
@@ -378,18 +836,36 @@ class BehaveAgent(metaclass=Singleton):
 
     def _log_exception(self, initial_msg: str, exc_holder: BasicStatement, item_id: Optional[str]) -> None:
         message = [initial_msg]
+        compact = self._cfg.compact_tracebacks
+        if self._failure_index is not None and exc_holder.exception:
+            cluster, first = self._failure_index.add(
+                exc_holder.exception, exc_holder.exc_traceback, item_id or self._launch_id
+            )
+            if cluster.fingerprint not in self._scenario_failures:
+                self._scenario_failures.append(cluster.fingerprint)
+            if not first:
+                message.append(f"Same failure as in item {cluster.item_id}, fingerprint: {cluster.fingerprint}")
+                # the first line of Behave error message is the exception message
+                if exc_holder.error_message:
+                    message.append(exc_holder.error_message.split("\n", 1)[0])
+                self._rp.log(item_id=item_id, time=timestamp(), level="ERROR", message="\n".join(message))
+                return
         if exc_holder.exception and exc_holder.exc_traceback:
             message.append(
-                "".join(
-                    traceback.format_exception(
-                        type(exc_holder.exception),
-                        exc_holder.exception,
-                        exc_holder.exc_traceback,
-                    )
+                format_traceback(
+                    exc_holder.exception,
+                    exc_holder.exc_traceback,
+                    compact,
+                    self._cfg.traceback_max_depth,
+                    self._cfg.traceback_max_length,
                 )
             )
-        if exc_holder.error_message:
-            message.append(exc_holder.error_message)
+        error_message = exc_holder.error_message
+        if error_message and compact:
+            # Behave puts the full traceback into the message of non-assertion errors
+            error_message = strip_traceback(error_message)
+        if error_message:
+            message.append(error_message)
 
         self._rp.log(
             item_id=item_id,
@@ -410,12 +886,12 @@ class BehaveAgent(metaclass=Singleton):
         It will log records for scenario based approach
         and step for step based.
         """
-        if not item.tags:
+        fixtures = get_parsed_tags(item.tags).fixtures
+        if fixtures and self._cfg.fixture_report_mode is not FixtureReportMode.ITEMS:
+            self._report_fixtures(fixtures, item_type, parent_item_id)
             return
-        for tag in item.tags:
-            if not tag.startswith("fixture."):
-                continue
-            msg = f"Using of '{tag[len('fixture.'):]}' fixture"
+        for fixture in fixtures:
+            msg = f"Using of '{fixture}' fixture"
             if self._cfg.log_layout is not LogLayout.SCENARIO:
                 self._step_id = self._rp.start_test_item(
                     name=msg,
@@ -426,6 +902,9 @@ class BehaveAgent(metaclass=Singleton):
                 )
                 self._rp.finish_test_item(item_id=self._step_id, end_time=timestamp(), status="PASSED")
                 continue
+            if self._scenario_log is not None and item_type == "BEFORE_TEST":
+                self._scenario_log.add(msg, timestamp())
+                continue
             self._rp.log(
                 timestamp(),
                 msg,
@@ -433,13 +912,49 @@ class BehaveAgent(metaclass=Singleton):
                 item_id=parent_item_id,
             )
 
-    def _log_cleanups(self, context: Context, scope: str) -> None:
+    def _aggregates_items(self) -> bool:
+        return self._cfg.fixture_report_mode is FixtureReportMode.AGGREGATED and (
+            self._cfg.log_layout is not LogLayout.SCENARIO
+        )
+
+    def _report_fixtures(self, fixtures: tuple[str, ...], item_type: str, parent_item_id: str) -> None:
+        """Report all fixtures of the item as one aggregated item or one log entry."""
+        msg = "Using of fixtures: " + ", ".join(f"'{fixture}'" for fixture in fixtures)
+        if self._aggregates_items():
+            time = timestamp()
+            self._step_id = self._rp.start_test_item(
+                name=msg,
+                start_time=time,
+                item_type=item_type,
+                parent_item_id=parent_item_id,
+                has_stats=False if self._cfg.log_layout is LogLayout.NESTED else True,
+            )
+            self._rp.finish_test_item(item_id=self._step_id, end_time=time, status="PASSED")
+        elif self._scenario_log is not None and item_type == "BEFORE_TEST":
+            self._scenario_log.add(msg, timestamp())
+        else:
+            self._rp.log(timestamp(), msg, level="INFO", item_id=parent_item_id)
+
+    def _log_cleanups(self, context: Context, scope: str, finish: Optional[Callable[..., None]] = None) -> bool:
+        """Log cleanup functions of the layer.
+
+        In aggregated and log modes the cleanup functions are reported after their execution, with measured
+        durations. An aggregated item can't be added to a finished item, so the finish of the parent item is deferred
+        until the cleanup functions are executed.
+
+        :param context: Behave context
+        :param scope:   layer name, "feature" or "scenario"
+        :param finish:  function which finishes the parent item, takes `end_time` argument
+        :return: True if the parent item finish was deferred
+        """
         # noinspection PyProtectedMember
         layer = next((level for level in context._stack if level.get("@layer") == scope), None)
         if not layer:
-            return
+            return False
         item_type = "AFTER_SUITE" if scope == "feature" else "AFTER_TEST"
         item_id = self._feature_id if scope == "feature" else self._scenario_id
+        if self._cfg.fixture_report_mode is not FixtureReportMode.ITEMS:
+            return self._measure_cleanups(layer, scope, item_type, item_id, finish)
         for cleanup in layer.get("@cleanups", []):
             msg = f"Execution of '{cleanup.__name__}' cleanup function"
             if self._cfg.log_layout is not LogLayout.SCENARIO:
@@ -452,12 +967,88 @@ class BehaveAgent(metaclass=Singleton):
                 )
                 self._rp.finish_test_item(item_id=self._step_id, end_time=timestamp(), status="PASSED")
                 continue
+            if self._scenario_log is not None and scope == "scenario":
+                self._scenario_log.add(msg, timestamp())
+                continue
             self._rp.log(
                 timestamp(),
                 msg,
                 level="INFO",
                 item_id=item_id,
             )
+        return False
+
+    def _measure_cleanups(
+        self,
+        layer: dict[str, Any],
+        scope: str,
+        item_type: str,
+        item_id: Optional[str],
+        finish: Optional[Callable[..., None]],
+    ) -> bool:
+        cleanups = layer.get("@cleanups")
+        if not cleanups:
+            return False
+        if self._recorder:
+            # recorded outline rows are sent or dropped right after the scenario, before its cleanups run
+            log = self._scenario_log if scope == "scenario" else None
+            self._report_cleanups(self._rp, [TimedCleanup(c) for c in reversed(cleanups)], item_type, item_id, log)
+            return False
+        rp = self._rp
+        # a recorded feature is sent on its finish, so it waits for its cleanup functions in any mode
+        deferred = finish if self._aggregates_items() or (scope == "feature" and self._post_hoc) else None
+
+        def on_finish(executed: list[TimedCleanup]) -> None:
+            if deferred is None:
+                self._report_cleanups(rp, executed, item_type, item_id)
+            elif deferred in self._deferred_finishes:
+                # otherwise the parent item was already finished on the launch finish
+                self._deferred_finishes.remove(deferred)
+                self._report_cleanups(rp, executed, item_type, item_id)
+                deferred(end_time=timestamp())
+
+        instrument_cleanups(layer, on_finish)
+        if deferred:
+            self._deferred_finishes.append(deferred)
+        return deferred is not None
+
+    def _report_cleanups(
+        self,
+        rp: RP,
+        cleanups: list[TimedCleanup],
+        item_type: str,
+        item_id: Optional[str],
+        log: Optional[CoalescedLog] = None,
+    ) -> None:
+        """Report cleanup functions as one aggregated item or one log entry."""
+        if not cleanups:
+            return
+        failed = any(cleanup.error is not None for cleanup in cleanups)
+        message = "\n".join(cleanup.message for cleanup in cleanups)
+        if not self._aggregates_items():
+            if log is not None:
+                log.add(message, timestamp())
+            else:
+                rp.log(timestamp(), message, level="ERROR" if failed else "INFO", item_id=item_id)
+            return
+        start_time = cleanups[0].start_time or timestamp()
+        cleanup_id = rp.start_test_item(
+            name="Execution of cleanup functions: " + ", ".join(f"'{cleanup.__name__}'" for cleanup in cleanups),
+            start_time=start_time,
+            item_type=item_type,
+            parent_item_id=item_id,
+            description=message,
+            has_stats=False if self._cfg.log_layout is LogLayout.NESTED else True,
+        )
+        rp.finish_test_item(
+            item_id=cleanup_id, end_time=cleanups[-1].end_time or start_time, status="FAILED" if failed else "PASSED"
+        )
+
+    def _flush_deferred_finishes(self) -> None:
+        """Finish items whose cleanup functions were never executed."""
+        deferred, self._deferred_finishes = self._deferred_finishes, []
+        for finish in deferred:
+            finish(end_time=timestamp())
 
     @staticmethod
     def _item_description(context: Context, item: Union[Scenario, Feature]) -> str:
@@ -466,11 +1057,8 @@ class BehaveAgent(metaclass=Singleton):
             text_desc = "\n".join(item.description)
             desc = f"Description:\n{text_desc}"
         if context.active_outline:
-            pt = PrettyTable(field_names=context.active_outline.headings)
-            pt.add_row(context.active_outline.cells)
-            pt.set_style(MARKDOWN)
             desc += "\n\n" if desc else ""
-            desc += pt.get_string()
+            desc += markdown_table(context.active_outline.headings, [context.active_outline.cells])
         return desc
 
     @staticmethod
@@ -485,43 +1073,15 @@ class BehaveAgent(metaclass=Singleton):
             return f"{item.location.filename}:{item.location.line}"
         return None
 
-    def _attributes(self, item: Union[TagAndStatusStatement, TagStatement]) -> list[dict[str, str]]:
-        attrs = []
-        if item.tags:
-            significant_tags = [t for t in item.tags if not any(t.startswith(p) for p in self._ignore_tag_prefixes)]
-            attrs.extend(significant_tags)
-            attrs.extend(self._get_attributes_from_tags(item.tags))
-
-        return gen_attributes(attrs)
+    @staticmethod
+    def _attributes(item: Union[TagAndStatusStatement, TagStatement]) -> list[dict[str, str]]:
+        # parsed tags are shared between items, so the client gets its own copies
+        return [dict(attribute) for attribute in get_parsed_tags(item.tags).payload]
 
     @staticmethod
     def _get_attributes_from_tags(tags: list[str]) -> list[str]:
-        result = []
-        attr_tags = [t for t in tags if t.startswith("attribute")]
-
-        for attr_tag in attr_tags:
-            start = attr_tag.find("(")
-            end = attr_tag.find(")")
-            if start == -1 or end == -1:
-                continue
-            attr_str = attr_tag[start + 1 : end]
-            if not attr_str:
-                continue
-            result.extend([a.strip() for a in attr_str.split(",")])
-
-        return result
+        return list(get_parsed_tags(tags).attributes)
 
     @staticmethod
     def _test_case_id(scenario: Scenario) -> Optional[Any]:
-        if scenario.tags:
-            tc_tag = next((t for t in scenario.tags if t.startswith("test_case_id(")), None)
-            if not tc_tag:
-                return None
-            start, end = tc_tag.find("("), tc_tag.find(")")
-            if start == -1 or end == -1:
-                return None
-            tc_id = tc_tag[start + 1 : end]
-            if not tc_id:
-                return None
-            return tc_id
-        return None
+        return get_parsed_tags(scenario.tags).test_case_id
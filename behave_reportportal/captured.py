@@ -0,0 +1,105 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Collection of stdout, stderr and logging output which Behave captures for steps.
+
+Behave stores the output of a step after its `after_step` hook, so the output of all steps is collected when the
+scenario finishes. Output of a passed scenario is kept in ring buffers which hold only the last part of each stream.
+"""
+
+from collections import deque
+from typing import Optional
+
+from behave.model import Scenario
+
+STREAMS = ("stdout", "stderr", "log")
+DEFAULT_CAPTURE_MAX_SIZE = 16 * 1024
+
+
+class RingBuffer(object):
+    """Text buffer which keeps only the last `max_size` characters."""
+
+    _max_size: Optional[int]
+    _chunks: "deque[str]"
+    _size: int
+    dropped: int
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """Initialize instance attributes.
+
+        :param max_size: maximum number of kept characters, unlimited if None
+        """
+        self._max_size = max_size
+        self._chunks = deque()
+        self._size = 0
+        self.dropped = 0
+
+    def __bool__(self) -> bool:
+        """Return True if there is kept text."""
+        return bool(self._size)
+
+    def add(self, text: str) -> None:
+        """Append the text, drop the oldest text over the limit."""
+        if not text:
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._max_size is None:
+            return
+        while self._size > self._max_size:
+            excess = self._size - self._max_size
+            oldest = self._chunks[0]
+            if len(oldest) <= excess:
+                self._chunks.popleft()
+                self._size -= len(oldest)
+                self.dropped += len(oldest)
+            else:
+                self._chunks[0] = oldest[excess:]
+                self._size -= excess
+                self.dropped += excess
+
+    def text(self) -> str:
+        """Return kept text, with a note on the dropped part."""
+        text = "".join(self._chunks)
+        if self.dropped:
+            text = f"... {self.dropped} characters skipped ...\n{text}"
+        return text
+
+
+def collect_output(scenario: Scenario, max_size: Optional[int]) -> dict[str, str]:
+    """Collect the captured output of scenario steps, including Background ones, by stream.
+
+    :param scenario: finished scenario
+    :param max_size: maximum number of characters per stream, unlimited if None
+    :return: output text by stream name, only streams with output are included
+    """
+    buffers = {stream: RingBuffer(max_size) for stream in STREAMS}
+    for step in scenario.all_steps:
+        for captured in getattr(step.captured, "captures", ()):
+            for stream in STREAMS:
+                text = getattr(captured, stream, "")
+                # Behave adds the error message of a failed step as captured stderr, it's logged by the agent already
+                if not text or (stream == "stderr" and text == step.error_message):
+                    continue
+                buffers[stream].add(f"[{step.keyword}]: {step.name}\n{text.rstrip()}\n")
+    return {stream: buffer.text() for stream, buffer in buffers.items() if buffer}
+
+
+def format_output(output: dict[str, str]) -> str:
+    """Join the output of all streams into one text.
+
+    :param output: output text by stream name
+    :return: text with stream sections
+    """
+    return "\n".join(f"Captured {stream}:\n{text}" for stream, text in output.items())
@@ -0,0 +1,251 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Base classes of the ReportPortal client implementations of the agent."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Optional, Union
+from uuid import uuid4
+
+from reportportal_client import RP
+from reportportal_client.steps import StepReporter
+
+
+class DelegatingClient(RP):
+    """ReportPortal client wrapper which passes all reporting calls to the wrapped client through `_call` method.
+
+    Subclasses override `_call` to change how calls are executed and implement `clone` method.
+    """
+
+    _client: RP
+
+    def __init__(self, client: RP) -> None:
+        """Initialize instance attributes.
+
+        :param client: client to wrap
+        """
+        self._client = client
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        return getattr(self._client, method)(**kwargs)
+
+    @property
+    def client(self) -> RP:
+        """Return wrapped client."""
+        return self._client
+
+    @property
+    def launch_uuid(self) -> Optional[str]:
+        """Return current Launch UUID."""
+        return self._client.launch_uuid
+
+    @property
+    def endpoint(self) -> str:
+        """Return current base URL."""
+        return self._client.endpoint
+
+    @property
+    def project(self) -> str:
+        """Return current Project name."""
+        return self._client.project
+
+    @property
+    def step_reporter(self) -> StepReporter:
+        """Return StepReporter object for the current launch."""
+        return StepReporter(self)
+
+    def use_microseconds(self) -> Optional[bool]:
+        """Return if the server supports microseconds precision."""
+        return self._client.use_microseconds()
+
+    def _convert_time(self, time: Union[str, datetime]) -> str:
+        # noinspection PyProtectedMember
+        return self._client._convert_time(time)
+
+    def start_launch(self, name: str, start_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Start a new Launch."""
+        return self._call("start_launch", name=name, start_time=start_time, **kwargs)
+
+    def start_test_item(
+        self, name: str, start_time: Union[str, datetime], item_type: str, **kwargs: Any
+    ) -> Optional[str]:
+        """Start a new Test Item."""
+        return self._call("start_test_item", name=name, start_time=start_time, item_type=item_type, **kwargs)
+
+    def finish_test_item(self, item_id: str, end_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Finish a Test Item."""
+        return self._call("finish_test_item", item_id=item_id, end_time=end_time, **kwargs)
+
+    def finish_launch(self, end_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Finish the Launch."""
+        return self._call("finish_launch", end_time=end_time, **kwargs)
+
+    def update_test_item(self, item_uuid: Optional[str], **kwargs: Any) -> Optional[str]:
+        """Update a Test Item."""
+        return self._call("update_test_item", item_uuid=item_uuid, **kwargs)
+
+    def log(
+        self,
+        time: Union[str, datetime],
+        message: str,
+        level: Optional[Union[int, str]] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[Any] = None,
+    ) -> Any:
+        """Send a Log message."""
+        return self._call("log", time=time, message=message, level=level, attachment=attachment, item_id=item_id)
+
+    def get_launch_info(self) -> Optional[dict]:
+        """Get current Launch information."""
+        return self._call("get_launch_info")
+
+    def get_item_id_by_uuid(self, item_uuid: str) -> Optional[str]:
+        """Get Test Item ID by the given Item UUID."""
+        return self._call("get_item_id_by_uuid", item_uuid=item_uuid)
+
+    def get_launch_ui_id(self) -> Optional[int]:
+        """Get Launch ID of the current Launch."""
+        return self._call("get_launch_ui_id")
+
+    def get_launch_ui_url(self) -> Optional[str]:
+        """Get full quality URL of the current Launch."""
+        return self._call("get_launch_ui_url")
+
+    def get_project_settings(self) -> Optional[dict]:
+        """Get settings of the current Project."""
+        return self._call("get_project_settings")
+
+    def get_api_info(self) -> Optional[dict]:
+        """Get information about the ReportPortal API."""
+        return self._call("get_api_info")
+
+    def current_item(self) -> Optional[str]:
+        """Return the last started and not finished Item UUID."""
+        return self._call("current_item")
+
+    def close(self) -> None:
+        """Close the wrapped client."""
+        self._call("close")
+
+
+class LocalClient(RP, ABC):
+    """ReportPortal client implementation which stores calls locally instead of sending them.
+
+    Test Item UUIDs are generated on the client side. Subclasses implement `_record` method which stores a call and
+    launch related methods.
+    """
+
+    _launch_uuid: Optional[str]
+    _item_stack: list[str]
+
+    def __init__(self, launch_uuid: Optional[str] = None) -> None:
+        """Initialize instance attributes.
+
+        :param launch_uuid: UUID of the launch to report to
+        """
+        self._launch_uuid = launch_uuid
+        self._item_stack = []
+
+    @abstractmethod
+    def _record(self, method: str, **kwargs: Any) -> None:
+        """Store the call.
+
+        :param method: client method name
+        :param kwargs: call arguments
+        """
+
+    @property
+    def launch_uuid(self) -> Optional[str]:
+        """Return current Launch UUID."""
+        return self._launch_uuid
+
+    @property
+    def step_reporter(self) -> StepReporter:
+        """Return StepReporter object for the current launch."""
+        return StepReporter(self)
+
+    def use_microseconds(self) -> Optional[bool]:
+        """Return None, since there is no server to check."""
+        return None
+
+    def _convert_time(self, time: Union[str, datetime]) -> Union[str, datetime]:
+        return time
+
+    def start_test_item(
+        self, name: str, start_time: Union[str, datetime], item_type: str, **kwargs: Any
+    ) -> Optional[str]:
+        """Record Test Item start."""
+        item_uuid = kwargs.pop("uuid", None) or str(uuid4())
+        self._record(
+            "start_test_item",
+            name=name,
+            start_time=self._convert_time(start_time),
+            item_type=item_type,
+            uuid=item_uuid,
+            **kwargs,
+        )
+        self._item_stack.append(item_uuid)
+        return item_uuid
+
+    def finish_test_item(self, item_id: str, end_time: Union[str, datetime], **kwargs: Any) -> None:
+        """Record Test Item finish."""
+        self._record("finish_test_item", item_id=item_id, end_time=self._convert_time(end_time), **kwargs)
+        if item_id in self._item_stack:
+            self._item_stack.remove(item_id)
+
+    def update_test_item(self, item_uuid: Optional[str], **kwargs: Any) -> None:
+        """Record Test Item update."""
+        self._record("update_test_item", item_uuid=item_uuid, **kwargs)
+
+    def log(
+        self,
+        time: Union[str, datetime],
+        message: str,
+        level: Optional[Union[int, str]] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[Any] = None,
+    ) -> None:
+        """Record Log message."""
+        self._record(
+            "log", time=self._convert_time(time), message=message, level=level, attachment=attachment, item_id=item_id
+        )
+
+    def get_launch_info(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_item_id_by_uuid(self, item_uuid: str) -> Optional[str]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_launch_ui_id(self) -> Optional[int]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_launch_ui_url(self) -> Optional[str]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_project_settings(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_api_info(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def current_item(self) -> Optional[str]:
+        """Return the last started and not finished Item UUID."""
+        return self._item_stack[-1] if self._item_stack else None
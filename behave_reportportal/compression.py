@@ -0,0 +1,87 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Compression of log batch requests.
+
+The synchronous ReportPortal client sends log batches as multipart requests. HTTP adapters of the client session are
+replaced with ones which compress bodies of such requests and set the `Content-Encoding: gzip` header. The server, or
+a proxy in front of it, must support compressed request bodies.
+"""
+
+import gzip
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from reportportal_client import RPClient
+from requests import PreparedRequest, Response
+from requests.adapters import DEFAULT_RETRIES, HTTPAdapter, Retry
+
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+LOG_PATH_SUFFIX = "/log"
+
+
+class GzipLogAdapter(HTTPAdapter):
+    """HTTP adapter which compresses bodies of log batch requests."""
+
+    min_size: int
+
+    def __init__(self, min_size: int = DEFAULT_COMPRESSION_MIN_SIZE, **kwargs: Any) -> None:
+        """Initialize instance attributes.
+
+        :param min_size: minimum body size in bytes to compress, smaller bodies are sent as is
+        :param kwargs:   `HTTPAdapter` arguments
+        """
+        super().__init__(**kwargs)
+        self.min_size = min_size
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        """Compress the request body if it's a log batch and send the request."""
+        body = request.body
+        if (
+            request.method == "POST"
+            and isinstance(body, bytes)
+            and len(body) >= self.min_size
+            and "Content-Encoding" not in request.headers
+            and urlparse(request.url).path.endswith(LOG_PATH_SUFFIX)
+        ):
+            request.body = gzip.compress(body, mtime=0)
+            request.headers["Content-Encoding"] = "gzip"
+            request.headers["Content-Length"] = str(len(request.body))
+        return super().send(request, **kwargs)
+
+
+def enable_log_compression(client: Any, min_size: Optional[int] = None) -> bool:
+    """Replace HTTP adapters of the client session with compressing ones.
+
+    Retry and connection pool settings are the same as the client uses.
+
+    :param client:   ReportPortal client
+    :param min_size: minimum body size in bytes to compress
+    :return: False if the client does not support compression
+    """
+    if not isinstance(client, RPClient):
+        return False
+    retry_strategy = (
+        Retry(total=client.retries, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
+        if client.retries
+        else DEFAULT_RETRIES
+    )
+    for prefix in ("https://", "http://"):
+        client.session.mount(
+            prefix,
+            GzipLogAdapter(
+                min_size or DEFAULT_COMPRESSION_MIN_SIZE, max_retries=retry_strategy, pool_maxsize=client.max_pool_size
+            ),
+        )
+    return True
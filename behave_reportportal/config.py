@@ -15,7 +15,7 @@
 
 from configparser import ConfigParser
 from enum import Enum
-from typing import Optional, Union
+from typing import Any, Mapping, Optional, Union
 from warnings import warn
 
 from behave.runner import Context
@@ -23,17 +23,21 @@ from reportportal_client import ClientType, OutputType
 from reportportal_client.helpers import to_bool
 from reportportal_client.logs import MAX_LOG_BATCH_PAYLOAD_SIZE
 
+from behave_reportportal.captured import DEFAULT_CAPTURE_MAX_SIZE
+from behave_reportportal.dispatch import DEFAULT_QUEUE_SIZE
+from behave_reportportal.logs import DEFAULT_COALESCED_LOG_SIZE
+from behave_reportportal.tracebacks import DEFAULT_TRACEBACK_MAX_DEPTH, DEFAULT_TRACEBACK_MAX_LENGTH
+from behave_reportportal.uploads import DEFAULT_UPLOAD_TIMEOUT
+
 RP_CFG_SECTION = "report_portal"
 DEFAULT_LAUNCH_NAME = "Python Behave Launch"
 DEFAULT_CFG_FILE = "behave.ini"
+DEFAULT_DEDUP_CACHE_SIZE = 1000
+DEFAULT_DEDUP_MESSAGE = "Same as attachment '{name}' in item {item_id}"
 
 
-class LogLayout(Enum):
-    """Enum holding the different log layout styles that are possible."""
-
-    SCENARIO = 0
-    STEP = 1
-    NESTED = 2
+class _NamedEnum(Enum):
+    """Enum which members can be looked up by case-insensitive name, the first member is the default one."""
 
     @classmethod
     def _missing_(cls, value):
@@ -42,7 +46,46 @@ class LogLayout(Enum):
             for member in cls:
                 if member.name == value_upper:
                     return member
-        return cls.SCENARIO
+        return next(iter(cls))
+
+
+class LogLayout(_NamedEnum):
+    """Enum holding the different log layout styles that are possible."""
+
+    SCENARIO = 0
+    STEP = 1
+    NESTED = 2
+
+
+class OutlineMode(_NamedEnum):
+    """Enum holding the possible ways of Scenario Outline reporting."""
+
+    FULL = 0
+    COLLAPSED = 1
+
+
+class SkippedStepsMode(_NamedEnum):
+    """Enum holding the possible ways of reporting steps skipped after a failure."""
+
+    ITEMS = 0
+    LIGHT = 1
+    SUMMARY = 2
+
+
+class FixtureReportMode(_NamedEnum):
+    """Enum holding the possible ways of fixture and cleanup function reporting."""
+
+    ITEMS = 0
+    AGGREGATED = 1
+    LOG = 2
+
+
+class CaptureMode(_NamedEnum):
+    """Enum holding the possible ways of reporting Behave captured output."""
+
+    OFF = 0
+    LOG = 1
+    ATTACHMENT = 2
 
 
 class Config(object):
@@ -68,6 +111,42 @@ class Config(object):
     launch_uuid_print_output: Optional[OutputType]
     client_type: ClientType
     http_timeout: Optional[Union[tuple[float, float], float]]
+    background_dispatch: bool
+    dispatch_queue_size: int
+    attachment_max_size: Optional[int]
+    lazy_attachments: bool
+    attachment_deduplication: bool
+    attachment_dedup_cache_size: int
+    attachment_dedup_message: str
+    launch_coordinator_file: Optional[str]
+    launch_coordinator_workers: Optional[int]
+    launch_coordinator_run_id: Optional[str]
+    journal_file: Optional[str]
+    profiling: bool
+    profiling_attributes: bool
+    outline_mode: OutlineMode
+    coalesce_step_logs: bool
+    coalesced_log_size: int
+    skipped_steps_mode: SkippedStepsMode
+    fixture_report_mode: FixtureReportMode
+    compact_tracebacks: bool
+    traceback_max_depth: int
+    traceback_max_length: int
+    failure_deduplication: bool
+    log_budget_messages: Optional[int]
+    log_budget_bytes: Optional[int]
+    launch_log_budget_messages: Optional[int]
+    launch_log_budget_bytes: Optional[int]
+    log_budget_period: Optional[float]
+    log_budget_sampling: int
+    log_level: Optional[Union[int, str]]
+    capture_output: CaptureMode
+    capture_max_size: int
+    attachment_compression_threshold: Optional[int]
+    log_batch_compression: bool
+    upload_workers: int
+    upload_timeout: float
+    post_hoc_reporting: bool
 
     # OAuth 2.0 parameters
     oauth_uri: Optional[str]
@@ -100,6 +179,42 @@ class Config(object):
         client_type: Optional[str] = None,
         connect_timeout: Optional[Union[str, float]] = None,
         read_timeout: Optional[Union[str, float]] = None,
+        background_dispatch: Optional[Union[str, bool]] = None,
+        dispatch_queue_size: Optional[Union[str, int]] = None,
+        attachment_max_size: Optional[Union[str, int]] = None,
+        lazy_attachments: Optional[Union[str, bool]] = None,
+        attachment_deduplication: Optional[Union[str, bool]] = None,
+        attachment_dedup_cache_size: Optional[Union[str, int]] = None,
+        attachment_dedup_message: Optional[str] = None,
+        launch_coordinator_file: Optional[str] = None,
+        launch_coordinator_workers: Optional[Union[str, int]] = None,
+        launch_coordinator_run_id: Optional[str] = None,
+        journal_file: Optional[str] = None,
+        profiling: Optional[Union[str, bool]] = None,
+        profiling_attributes: Optional[Union[str, bool]] = None,
+        outline_mode: Optional[Union[str, OutlineMode]] = None,
+        coalesce_step_logs: Optional[Union[str, bool]] = None,
+        coalesced_log_size: Optional[Union[str, int]] = None,
+        skipped_steps_mode: Optional[Union[str, SkippedStepsMode]] = None,
+        fixture_report_mode: Optional[Union[str, FixtureReportMode]] = None,
+        compact_tracebacks: Optional[Union[str, bool]] = None,
+        traceback_max_depth: Optional[Union[str, int]] = None,
+        traceback_max_length: Optional[Union[str, int]] = None,
+        failure_deduplication: Optional[Union[str, bool]] = None,
+        log_budget_messages: Optional[Union[str, int]] = None,
+        log_budget_bytes: Optional[Union[str, int]] = None,
+        launch_log_budget_messages: Optional[Union[str, int]] = None,
+        launch_log_budget_bytes: Optional[Union[str, int]] = None,
+        log_budget_period: Optional[Union[str, float]] = None,
+        log_budget_sampling: Optional[Union[str, int]] = None,
+        log_level: Optional[Union[str, int]] = None,
+        capture_output: Optional[Union[str, CaptureMode]] = None,
+        capture_max_size: Optional[Union[str, int]] = None,
+        attachment_compression_threshold: Optional[Union[str, int]] = None,
+        log_batch_compression: Optional[Union[str, bool]] = None,
+        upload_workers: Optional[Union[str, int]] = None,
+        upload_timeout: Optional[Union[str, float]] = None,
+        post_hoc_reporting: Optional[Union[str, bool]] = None,
         # OAuth 2.0 parameters
         oauth_uri: Optional[str] = None,
         oauth_username: Optional[str] = None,
@@ -177,16 +292,70 @@ class Config(object):
         else:
             self.http_timeout = connect_timeout or read_timeout
 
+        self.background_dispatch = to_bool(background_dispatch or "False")
+        self.dispatch_queue_size = (dispatch_queue_size and int(dispatch_queue_size)) or DEFAULT_QUEUE_SIZE
+        self.attachment_max_size = int(attachment_max_size) if attachment_max_size else None
+        self.lazy_attachments = to_bool(lazy_attachments or "False")
+        self.attachment_deduplication = to_bool(attachment_deduplication or "False")
+        self.attachment_dedup_cache_size = (
+            attachment_dedup_cache_size and int(attachment_dedup_cache_size)
+        ) or DEFAULT_DEDUP_CACHE_SIZE
+        self.attachment_dedup_message = attachment_dedup_message or DEFAULT_DEDUP_MESSAGE
+        self.launch_coordinator_file = launch_coordinator_file or None
+        self.launch_coordinator_workers = int(launch_coordinator_workers) if launch_coordinator_workers else None
+        self.launch_coordinator_run_id = launch_coordinator_run_id or None
+        self.journal_file = journal_file or None
+        self.profiling = to_bool(profiling or "False")
+        self.profiling_attributes = to_bool(profiling_attributes or "False")
+        self.outline_mode = OutlineMode(outline_mode)
+        self.coalesce_step_logs = to_bool(coalesce_step_logs or "False")
+        self.coalesced_log_size = (coalesced_log_size and int(coalesced_log_size)) or DEFAULT_COALESCED_LOG_SIZE
+        self.skipped_steps_mode = SkippedStepsMode(skipped_steps_mode)
+        self.fixture_report_mode = FixtureReportMode(fixture_report_mode)
+        self.compact_tracebacks = to_bool(compact_tracebacks or "False")
+        self.traceback_max_depth = (
+            int(traceback_max_depth) if traceback_max_depth is not None else DEFAULT_TRACEBACK_MAX_DEPTH
+        )
+        self.traceback_max_length = (
+            traceback_max_length and int(traceback_max_length)
+        ) or DEFAULT_TRACEBACK_MAX_LENGTH
+        self.failure_deduplication = to_bool(failure_deduplication or "False")
+        self.log_budget_messages = int(log_budget_messages) if log_budget_messages else None
+        self.log_budget_bytes = int(log_budget_bytes) if log_budget_bytes else None
+        self.launch_log_budget_messages = int(launch_log_budget_messages) if launch_log_budget_messages else None
+        self.launch_log_budget_bytes = int(launch_log_budget_bytes) if launch_log_budget_bytes else None
+        self.log_budget_period = float(log_budget_period) if log_budget_period else None
+        self.log_budget_sampling = int(log_budget_sampling) if log_budget_sampling else 0
+        self.log_level = log_level or None
+        self.capture_output = CaptureMode(capture_output)
+        self.capture_max_size = (capture_max_size and int(capture_max_size)) or DEFAULT_CAPTURE_MAX_SIZE
+        self.attachment_compression_threshold = (
+            int(attachment_compression_threshold) if attachment_compression_threshold else None
+        )
+        self.log_batch_compression = to_bool(log_batch_compression or "False")
+        self.upload_workers = int(upload_workers) if upload_workers else 0
+        self.upload_timeout = float(upload_timeout) if upload_timeout else DEFAULT_UPLOAD_TIMEOUT
+        self.post_hoc_reporting = to_bool(post_hoc_reporting or "False")
 
-def read_config(context: Context) -> Config:
-    """Read config from file and return instance of Config."""
+
+def load_config(path: Optional[str] = None, overrides: Optional[Mapping[str, Any]] = None) -> Config:
+    """Read config from file, apply overrides and return instance of Config.
+
+    :param path:      path to the config file, `behave.ini` by default
+    :param overrides: parameter values which take precedence over the file
+    :return: agent config
+    """
     cp = ConfigParser()
-    cmd_data = context._config.userdata
-    path = cmd_data.get("config_file")
     cp.read(path or DEFAULT_CFG_FILE)
     rp_cfg = {}
     if cp.has_section(RP_CFG_SECTION):
         rp_cfg.update(cp[RP_CFG_SECTION])
-    rp_cfg.update(cmd_data)
+    rp_cfg.update(overrides or {})
 
     return Config(**rp_cfg)
+
+
+def read_config(context: Context) -> Config:
+    """Read config from file and return instance of Config."""
+    cmd_data = context._config.userdata
+    return load_config(cmd_data.get("config_file"), cmd_data)
@@ -0,0 +1,167 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Coordination of a single launch between several Behave processes."""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+try:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+except ImportError:  # pragma: no cover
+    import msvcrt
+    import time
+
+    def _lock(fd: int) -> None:
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def _unlock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class JoinResult(NamedTuple):
+    """Result of joining a coordinated launch."""
+
+    launch_uuid: Optional[str]
+    created: bool
+
+
+def _is_alive(pid: int) -> bool:
+    """Check if the process with the given PID is running."""
+    if os.name == "nt":  # pragma: no cover
+        # signal 0 is CTRL_C_EVENT on Windows, the check is not available there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LaunchCoordinator(object):
+    """Share one launch between several processes through a state file guarded by an OS file lock.
+
+    The first process to join starts the launch, others get its UUID. Every process leaves the launch on finish, the
+    last one gets the aggregated launch status and finishes the launch. If the number of processes is known in advance
+    it's used to detect the last one, otherwise the last one is the one which leaves when no other process is active.
+    In the latter case a process which finishes before the others join finishes the launch alone, and the later
+    processes share a new launch.
+
+    The state belongs to a run, processes of the same run share the run ID, which is the parent PID by default. The
+    state of another run, or the one whose active processes are all dead, is left by a crashed run and is replaced.
+    """
+
+    _path: str
+    _lock_path: str
+    _workers: Optional[int]
+    _run_id: str
+
+    def __init__(self, path: str, workers: Optional[int] = None, run_id: Optional[str] = None) -> None:
+        """Initialize instance attributes.
+
+        :param path:    path to the shared state file
+        :param workers: expected number of processes which will report to the launch
+        :param run_id:  ID of the run the processes belong to, the parent PID by default
+        """
+        self._path = path
+        self._lock_path = f"{path}.lock"
+        self._workers = workers
+        self._run_id = str(run_id or os.getppid())
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, Any]]:
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT)
+        try:
+            _lock(fd)
+            try:
+                state = {}
+                if os.path.exists(self._path):
+                    with open(self._path, encoding="utf-8") as f:
+                        state = json.load(f)
+                yield state
+                if state:
+                    with open(self._path, "w", encoding="utf-8") as f:
+                        json.dump(state, f)
+                elif os.path.exists(self._path):
+                    os.remove(self._path)
+            finally:
+                _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def _is_stale(self, state: dict[str, Any]) -> bool:
+        if state.get("run_id") != self._run_id:
+            return True
+        pids = state.get("pids") or []
+        return bool(pids) and not any(_is_alive(pid) for pid in pids)
+
+    def join(self, start_launch: Callable[[], Optional[str]]) -> JoinResult:
+        """Join the coordinated launch, start it if this process is the first one.
+
+        :param start_launch: function which starts a new launch and returns its UUID as a string
+        :return: launch UUID and a flag if the launch was started by this call
+        """
+        with self._state() as state:
+            if state.get("launch_uuid") and not self._is_stale(state):
+                state["active"] += 1
+                state["pids"].append(os.getpid())
+                return JoinResult(state["launch_uuid"], False)
+            state.clear()
+            launch_uuid = start_launch()
+            if launch_uuid:
+                state.update(
+                    run_id=self._run_id,
+                    launch_uuid=launch_uuid,
+                    active=1,
+                    finished=0,
+                    failed=False,
+                    pids=[os.getpid()],
+                )
+            return JoinResult(launch_uuid, True)
+
+    def leave(self, failed: bool) -> Optional[str]:
+        """Leave the coordinated launch.
+
+        :param failed: if any test of this process failed
+        :return: aggregated launch status if this process is the last one and should finish the launch, else None
+        """
+        with self._state() as state:
+            if not state or self._is_stale(state):
+                return None
+            if os.getpid() in state["pids"]:
+                state["pids"].remove(os.getpid())
+            state["active"] -= 1
+            state["finished"] += 1
+            state["failed"] = state["failed"] or failed
+            last = state["finished"] >= self._workers if self._workers else state["active"] <= 0
+            if not last:
+                return None
+            status = "FAILED" if state["failed"] else "PASSED"
+            state.clear()
+            return status
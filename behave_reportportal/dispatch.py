@@ -0,0 +1,109 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Background dispatching of ReportPortal client calls."""
+
+import logging
+import threading
+from datetime import datetime
+from queue import Queue
+from typing import Any, NamedTuple, Optional, Union
+from uuid import uuid4
+
+from reportportal_client import RP
+
+from behave_reportportal.clients import DelegatingClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10000
+
+
+class ReportEvent(NamedTuple):
+    """Immutable snapshot of a single ReportPortal client call."""
+
+    method: str
+    kwargs: dict[str, Any]
+
+
+_STOP = ReportEvent("", {})
+# calls which do not need a server response
+_QUEUED_METHODS = frozenset(("start_test_item", "finish_test_item", "finish_launch", "update_test_item", "log"))
+
+
+class BackgroundDispatcher(DelegatingClient):
+    """ReportPortal client wrapper which sends reporting calls from a background thread.
+
+    Calls which do not need a server response (item start and finish, logs) are captured as events and put in
+    a bounded queue, so the calling thread never waits for HTTP. Test Item UUIDs are generated on the client side
+    and passed to the server, which allows returning them immediately. All other calls drain the queue first and
+    are then executed synchronously on the wrapped client.
+    """
+
+    _queue: "Queue[ReportEvent]"
+    _worker: threading.Thread
+
+    def __init__(self, client: RP, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Initialize instance attributes and start the worker thread.
+
+        :param client:     The client which will send the requests.
+        :param queue_size: Maximum number of events waiting in the queue, the caller blocks when it is full.
+        """
+        super().__init__(client)
+        self._queue = Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name="rp-dispatcher", daemon=True)
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is _STOP:
+                    return
+                getattr(self._client, event.method)(**event.kwargs)
+            except Exception:  # noqa
+                logger.exception("Unable to execute ReportPortal '%s' call", event.method)
+            finally:
+                self._queue.task_done()
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        if method in _QUEUED_METHODS:
+            self._queue.put(ReportEvent(method, kwargs))
+            return None
+        self.drain()
+        return super()._call(method, **kwargs)
+
+    def drain(self) -> None:
+        """Wait until all queued events are sent."""
+        if self._worker.is_alive():
+            self._queue.join()
+
+    def start_test_item(
+        self, name: str, start_time: Union[str, datetime], item_type: str, **kwargs: Any
+    ) -> Optional[str]:
+        """Queue Test Item start and return its client-side generated UUID."""
+        item_uuid = kwargs.pop("uuid", None) or str(uuid4())
+        self._call("start_test_item", name=name, start_time=start_time, item_type=item_type, uuid=item_uuid, **kwargs)
+        return item_uuid
+
+    def clone(self) -> "BackgroundDispatcher":
+        """Clone the wrapped client and wrap it into a new dispatcher."""
+        self.drain()
+        return BackgroundDispatcher(self._client.clone(), self._queue.maxsize)
+
+    def close(self) -> None:
+        """Send all queued events, stop the worker thread and close the wrapped client."""
+        if self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join()
+        self._client.close()
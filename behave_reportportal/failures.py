@@ -0,0 +1,138 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Launch-wide clustering of failures by exception fingerprint.
+
+A fingerprint is calculated from the exception type, the exception message with variable parts replaced and the
+traceback frames outside of Behave and the agent. Failures with the same fingerprint are considered the same: only the
+first one is logged in full.
+"""
+
+import hashlib
+import re
+import traceback
+from types import TracebackType
+from typing import Optional
+
+from behave_reportportal.rendering import markdown_table
+from behave_reportportal.tracebacks import is_internal_frame
+
+FINGERPRINT_ATTRIBUTE = "failure"
+FINGERPRINT_LENGTH = 12
+SUMMARY_MESSAGE_LENGTH = 120
+
+_VARIABLE_PARTS = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"  # UUIDs
+    r"|0x[0-9a-f]+"  # addresses
+    r"|\d+(?:[.:]\d+)*",  # numbers, times and IP addresses
+    re.IGNORECASE,
+)
+
+
+def normalize_message(message: str) -> str:
+    """Replace parts of the exception message which differ between occurrences of the same failure.
+
+    :param message: exception message
+    :return: normalized message
+    """
+    return _VARIABLE_PARTS.sub("<*>", message)
+
+
+def fingerprint(exception: BaseException, exc_traceback: Optional[TracebackType]) -> str:
+    """Calculate the failure fingerprint.
+
+    :param exception:     failure exception
+    :param exc_traceback: traceback of the exception
+    :return: hexadecimal fingerprint
+    """
+    exc_type = type(exception)
+    sha = hashlib.sha1(f"{exc_type.__module__}.{exc_type.__qualname__}".encode("utf-8"))
+    sha.update(normalize_message(str(exception)).encode("utf-8", "replace"))
+    for frame in traceback.extract_tb(exc_traceback):
+        if not is_internal_frame(frame):
+            sha.update(f"{frame.filename}:{frame.name}:{frame.lineno}".encode("utf-8", "replace"))
+    return sha.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+class FailureCluster(object):
+    """Failures with the same fingerprint."""
+
+    __slots__ = ("fingerprint", "exception_type", "message", "item_id", "count")
+
+    fingerprint: str
+    exception_type: str
+    message: str
+    item_id: Optional[str]
+    count: int
+
+    def __init__(self, fingerprint: str, exception: BaseException, item_id: Optional[str]) -> None:
+        """Initialize instance attributes.
+
+        :param fingerprint: failure fingerprint
+        :param exception:   the first exception of the cluster
+        :param item_id:     UUID of the item the first failure was logged to
+        """
+        self.fingerprint = fingerprint
+        self.exception_type = type(exception).__name__
+        self.message = str(exception)
+        self.item_id = item_id
+        self.count = 0
+
+
+class FailureIndex(object):
+    """Index of failures of the launch by fingerprint."""
+
+    _clusters: dict[str, FailureCluster]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self._clusters = {}
+
+    def __len__(self) -> int:
+        """Return the number of clusters."""
+        return len(self._clusters)
+
+    def add(
+        self, exception: BaseException, exc_traceback: Optional[TracebackType], item_id: Optional[str]
+    ) -> tuple[FailureCluster, bool]:
+        """Count the failure.
+
+        :param exception:     failure exception
+        :param exc_traceback: traceback of the exception
+        :param item_id:       UUID of the item the failure is logged to
+        :return: the failure cluster and True if it's the first failure of the cluster
+        """
+        key = fingerprint(exception, exc_traceback)
+        cluster = self._clusters.get(key)
+        first = cluster is None
+        if first:
+            cluster = FailureCluster(key, exception, item_id)
+            self._clusters[key] = cluster
+        cluster.count += 1
+        return cluster, first
+
+    def summary(self) -> str:
+        """Return the table of failure clusters, the most frequent first."""
+        clusters = sorted(self._clusters.values(), key=lambda c: c.count, reverse=True)
+        rows = []
+        for cluster in clusters:
+            message = " ".join(cluster.message.split()).replace("|", "\\|")
+            if len(message) > SUMMARY_MESSAGE_LENGTH:
+                message = message[: SUMMARY_MESSAGE_LENGTH - 3] + "..."
+            rows.append([cluster.fingerprint, str(cluster.count), f"{cluster.exception_type}: {message}"])
+        return f"Failure clusters: {len(clusters)}\n\n" + markdown_table(["Fingerprint", "Count", "Failure"], rows)
+
+    def clear(self) -> None:
+        """Forget all failures."""
+        self._clusters.clear()
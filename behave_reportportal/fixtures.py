@@ -0,0 +1,134 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Measurement of Behave cleanup functions.
+
+Behave runs cleanup functions of a layer in reverse order of registration when the layer is popped, which happens after
+`after_scenario` and `after_feature` hooks. The functions are replaced with measuring wrappers and a callback is
+registered first, so it is called last, when all cleanup functions of the layer are finished. The wrappers compare
+equal to their functions, so Behave still detects duplicates added with `add_cleanup`, and a cleanup error handler is
+added to the layer, which passes the original function to the `on_cleanup_error` handler of the user.
+"""
+
+from time import perf_counter_ns
+from typing import Any, Callable, Optional
+
+from reportportal_client.helpers import timestamp
+
+
+class TimedCleanup(object):
+    """Cleanup function wrapper which records its start time, end time and error."""
+
+    __slots__ = ("func", "__name__", "start_time", "end_time", "duration", "error")
+
+    func: Callable[[], Any]
+    start_time: Optional[str]
+    end_time: Optional[str]
+    duration: int
+    error: Optional[BaseException]
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        """Initialize instance attributes.
+
+        :param func: cleanup function
+        """
+        self.func = func
+        self.__name__ = getattr(func, "__name__", repr(func))
+        self.start_time = None
+        self.end_time = None
+        self.duration = 0
+        self.error = None
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare as the wrapped function."""
+        return self.func == (other.func if isinstance(other, TimedCleanup) else other)
+
+    def __hash__(self) -> int:
+        """Hash as the wrapped function."""
+        return hash(self.func)
+
+    def __call__(self) -> Any:
+        """Call the cleanup function and measure it."""
+        self.start_time = timestamp()
+        start = perf_counter_ns()
+        try:
+            return self.func()
+        except Exception as exc:
+            self.error = exc
+            raise
+        finally:
+            self.duration = perf_counter_ns() - start
+            self.end_time = timestamp()
+
+    @property
+    def message(self) -> str:
+        """Return description of the cleanup function execution, with its duration if it was measured."""
+        text = f"Execution of '{self.__name__}' cleanup function"
+        if self.start_time is not None:
+            text += f": {self.duration / 1e6:.1f} ms"
+        if self.error is not None:
+            text += f", failed with {type(self.error).__name__}: {self.error}"
+        return text
+
+
+_ERROR_HANDLER = "on_cleanup_error"
+
+
+class _UnwrappingErrorHandler(object):
+    """Cleanup error handler of a layer which passes the wrapped function to the handler set by the user."""
+
+    __slots__ = ("_layer", "_handler")
+
+    _layer: dict[str, Any]
+    _handler: Optional[Callable[[Any, Callable[[], Any], Exception], None]]
+
+    def __init__(self, layer: dict[str, Any]) -> None:
+        """Initialize instance attributes.
+
+        :param layer: Behave context layer, its own handler is kept if it has one
+        """
+        self._layer = layer
+        self._handler = layer.get(_ERROR_HANDLER)
+
+    def __call__(self, context: Any, cleanup_func: Callable[[], Any], exception: Exception) -> None:
+        """Call the user handler, or the default Behave one, with the original cleanup function."""
+        handler = self._handler
+        if handler is None:
+            # noinspection PyProtectedMember
+            frames = (f for f in context._stack if f is not self._layer and _ERROR_HANDLER in f)
+            handler = next((f[_ERROR_HANDLER] for f in frames), context.print_cleanup_error)
+        if isinstance(cleanup_func, TimedCleanup):
+            cleanup_func = cleanup_func.func
+        handler(context, cleanup_func, exception)
+
+
+def instrument_cleanups(layer: dict[str, Any], on_finish: Callable[[list[TimedCleanup]], None]) -> bool:
+    """Wrap cleanup functions of the layer and register the callback to be called after them.
+
+    :param layer:     Behave context layer
+    :param on_finish: function which gets executed cleanup functions in order of execution
+    :return: False if the layer has no cleanup functions and nothing was done
+    """
+    cleanups = layer.get("@cleanups")
+    if not cleanups:
+        return False
+    timed = [c if isinstance(c, TimedCleanup) else TimedCleanup(c) for c in cleanups]
+    cleanups[:] = timed
+    if not isinstance(layer.get(_ERROR_HANDLER), _UnwrappingErrorHandler):
+        layer[_ERROR_HANDLER] = _UnwrappingErrorHandler(layer)
+
+    def report_cleanups() -> None:
+        on_finish([c for c in reversed(timed) if c.start_time is not None])
+
+    cleanups.insert(0, report_cleanups)
+    return True
@@ -0,0 +1,147 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Behave formatter which reports to ReportPortal without hooks in `environment.py`.
+
+Formatters get no event on scenario finish, so a scenario is finished when the next one starts or the feature ends.
+Behave cleanup functions are not visible to formatters and are not reported.
+"""
+
+from collections import deque
+from typing import Any, Optional
+
+from behave.formatter.base import Formatter, StreamOpener
+from behave.matchers import Match
+from behave.model import Feature, Scenario, Step
+
+from behave_reportportal.behave_agent import BehaveAgent, convert_to_rp_status
+from behave_reportportal.config import load_config
+
+
+class FormatterContext(object):
+    """Part of Behave context which the agent reads, built from formatter events."""
+
+    _stack: list[dict[str, Any]]
+    active_outline: Optional[Any]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self._stack = []
+        self.active_outline = None
+
+
+class ReportPortalFormatter(Formatter):
+    """Formatter which drives `BehaveAgent` with formatter events.
+
+    Usage: `behave -f behave_reportportal.formatter:ReportPortalFormatter`, the configuration is read the same way as
+    by hooks. `-f reportportal` works only with a user-defined `reportportal` alias in the `[behave.formatters]`
+    section of `behave.ini`, since Behave doesn't discover formatters of installed packages. The formatter output is
+    a summary of reported features, buffered and written when the run ends.
+    """
+
+    name = "reportportal"
+    description = "Reports test results to ReportPortal"
+
+    agent: BehaveAgent
+    _context: FormatterContext
+    _launch_started: bool
+    _feature: Optional[Feature]
+    _scenario: Optional[Scenario]
+    _steps: "deque[Step]"
+    _step: Optional[Step]
+    _buffer: list[str]
+
+    def __init__(self, stream_opener: StreamOpener, config: Any) -> None:
+        """Initialize instance attributes and the agent.
+
+        :param stream_opener: Behave stream opener of the formatter output
+        :param config:        Behave configuration
+        """
+        super().__init__(stream_opener, config)
+        userdata = config.userdata
+        self.agent = BehaveAgent(load_config(userdata.get("config_file"), userdata))
+        self._context = FormatterContext()
+        self._launch_started = False
+        self._feature = None
+        self._scenario = None
+        self._steps = deque()
+        self._step = None
+        self._buffer = []
+
+    def feature(self, feature: Feature) -> None:
+        """Start the launch on the first feature and start the feature."""
+        if not feature.should_run(self.config):
+            return
+        if not self._launch_started:
+            self.agent.start_launch(self._context)
+            self._launch_started = True
+        self._feature = feature
+        self.agent.start_feature(self._context, feature)
+
+    def scenario(self, scenario: Scenario) -> None:
+        """Finish the previous scenario and start the given one."""
+        self._finish_scenario()
+        if not self._feature or not scenario.should_run(self.config):
+            return
+        self._scenario = scenario
+        self._context.active_outline = getattr(scenario, "_row", None)
+        self.agent.start_scenario(self._context, scenario)
+
+    def step(self, step: Step) -> None:
+        """Remember the step of the scenario, steps are announced in order of execution before they run."""
+        if self._scenario:
+            self._steps.append(step)
+
+    def match(self, match: Match) -> None:
+        """Start the next step, the match is sent right before the step execution."""
+        if not self._steps or self.config.dry_run or match.func is None:
+            return
+        self._step = self._steps.popleft()
+        self.agent.start_step(self._context, self._step)
+
+    def result(self, step: Step) -> None:
+        """Finish the started step."""
+        if self._step is not step:
+            return
+        self._step = None
+        self.agent.finish_step(self._context, step)
+
+    def eof(self) -> None:
+        """Finish the last scenario and the feature."""
+        self._finish_scenario()
+        feature, self._feature = self._feature, None
+        if not feature:
+            return
+        self.agent.finish_feature(self._context, feature)
+        self._buffer.append(f"{feature.name}: {convert_to_rp_status(feature.status.name)}")
+
+    def close(self) -> None:
+        """Finish the launch and write the summary of reported features."""
+        if self._launch_started:
+            self.agent.finish_launch(self._context)
+            self._launch_started = False
+        if self._buffer:
+            stream = self.open()
+            stream.write("\n".join(self._buffer) + "\n")
+            stream.flush()
+            self._buffer = []
+        super().close()
+
+    def _finish_scenario(self) -> None:
+        scenario, self._scenario = self._scenario, None
+        self._steps.clear()
+        self._step = None
+        if scenario:
+            self.agent.finish_scenario(self._context, scenario)
+            self._context.active_outline = None
@@ -0,0 +1,102 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Python logging handler which sends records to the current ReportPortal item through the agent."""
+
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from reportportal_client.logs import LOG_LEVEL_MAPPING
+
+if TYPE_CHECKING:
+    from behave_reportportal.behave_agent import BehaveAgent
+
+DEFAULT_HANDLER_CAPACITY = 100
+IGNORED_LOGGERS = ("reportportal_client", "behave_reportportal")
+
+_SORTED_LEVELS = sorted(LOG_LEVEL_MAPPING, reverse=True)
+
+
+def rp_level(levelno: int) -> str:
+    """Convert `logging` level number to ReportPortal level name."""
+    return next((LOG_LEVEL_MAPPING[level] for level in _SORTED_LEVELS if levelno >= level), "TRACE")
+
+
+class AgentLogHandler(logging.Handler):
+    """Logging handler which buffers records and posts them with the agent.
+
+    Every record is bound to the item which is current on its emission. Buffered records are posted when the buffer
+    is full and when the agent finishes a step, a scenario, a feature or the launch, so they still get to the item
+    before its finish. Records are formatted on posting, they go through the agent `log_level` threshold and log
+    budgets as `post_log` messages do.
+    """
+
+    agent: "BehaveAgent"
+    capacity: int
+    _buffer: list[tuple[logging.LogRecord, Optional[Any]]]
+
+    def __init__(
+        self, agent: "BehaveAgent", level: int = logging.NOTSET, capacity: int = DEFAULT_HANDLER_CAPACITY
+    ) -> None:
+        """Initialize instance attributes.
+
+        :param agent:    agent to post records with
+        :param level:    minimum level of records
+        :param capacity: number of buffered records which triggers posting
+        """
+        super().__init__(level)
+        self.agent = agent
+        self.capacity = capacity
+        self._buffer = []
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Skip records of the agent and of the ReportPortal client."""
+        if record.name.startswith(IGNORED_LOGGERS):
+            return False
+        return super().filter(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer the record with the current item, post the buffer if it's full."""
+        # noinspection PyProtectedMember
+        self._buffer.append((record, self.agent._log_item_id))
+        if len(self._buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        """Post buffered records one by one, the client groups them into log batches."""
+        self.acquire()
+        try:
+            records, self._buffer = self._buffer, []
+            # noinspection PyProtectedMember
+            if not records or not self.agent._rp:
+                return
+            for record, item_id in records:
+                try:
+                    message = self.format(record)
+                except Exception:
+                    self.handleError(record)
+                    continue
+                # noinspection PyProtectedMember
+                self.agent._log(
+                    message, rp_level(record.levelno), item_id=item_id, time=str(int(record.created * 1000))
+                )
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Post buffered records and close the handler."""
+        try:
+            self.flush()
+        finally:
+            super().close()
@@ -0,0 +1,197 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Offline recording of ReportPortal events into a local journal file.
+
+The journal is a sequence of records, each record is a 4-byte big-endian length followed by UTF-8 encoded JSON object
+with "method" and "kwargs" keys, which correspond to a ReportPortal client call. Attachments are stored in a directory
+next to the journal under names equal to SHA-256 hash of their content and referenced from log records.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Iterator, Optional, Union
+from uuid import uuid4
+
+from behave_reportportal.attachments import FileContent
+from behave_reportportal.clients import LocalClient
+from behave_reportportal.dispatch import ReportEvent
+
+_HEADER = struct.Struct(">I")
+
+
+def attachments_dir(path: str) -> str:
+    """Return path to the directory with attachments of the given journal.
+
+    :param path: path to the journal file
+    :return: path to attachments directory
+    """
+    return f"{path}.attachments"
+
+
+def checkpoint_path(path: str) -> str:
+    """Return path to the replay progress file of the given journal.
+
+    :param path: path to the journal file
+    :return: path to the progress file
+    """
+    return f"{path}.replay"
+
+
+def write_event(file: BinaryIO, event: ReportEvent) -> None:
+    """Append the event to the journal file.
+
+    :param file:  journal file opened in binary mode
+    :param event: event to write
+    """
+    body = json.dumps({"method": event.method, "kwargs": event.kwargs}, default=str).encode("utf-8")
+    file.write(_HEADER.pack(len(body)) + body)
+
+
+def read_journal(path: str) -> Iterator[ReportEvent]:
+    """Read events from the journal file.
+
+    Incomplete record at the end of the file, which is the case if recording process was killed, is ignored.
+
+    :param path: path to the journal file
+    :return: iterator over recorded events
+    """
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            body = f.read(_HEADER.unpack(header)[0])
+            try:
+                record = json.loads(body.decode("utf-8"))
+            except ValueError:
+                return
+            yield ReportEvent(record["method"], record["kwargs"])
+
+
+class JournalClient(LocalClient):
+    """ReportPortal client implementation which records all calls into a journal file instead of sending them.
+
+    Launch and Test Item UUIDs are generated on the client side, so the journal can be uploaded later with the same
+    UUIDs.
+    """
+
+    _path: str
+    _project: Optional[str]
+    use_own_launch: bool
+    _file: BinaryIO
+    _lock: threading.Lock
+
+    def __init__(self, path: str, project: Optional[str] = None, launch_uuid: Optional[str] = None) -> None:
+        """Initialize instance attributes and open the journal file for appending.
+
+        The start of a new launch overwrites the journal and drops replay progress of the previous one, so a journal
+        always holds a single launch. Processes which join an existing launch only append to the file.
+
+        :param path:        path to the journal file
+        :param project:     ReportPortal project name
+        :param launch_uuid: UUID of an existing launch to report to
+        """
+        super().__init__(launch_uuid)
+        self._path = path
+        self._project = project
+        self.use_own_launch = not launch_uuid
+        self._file = open(path, "ab")
+        self._lock = threading.Lock()
+        os.makedirs(attachments_dir(path), exist_ok=True)
+
+    def _record(self, method: str, **kwargs: Any) -> None:
+        with self._lock:
+            write_event(self._file, ReportEvent(method, kwargs))
+            self._file.flush()
+
+    def _store_attachment(self, attachment: dict[str, Any]) -> dict[str, Any]:
+        data = attachment.get("data")
+        chunks = data.chunks() if isinstance(data, FileContent) else [data.encode() if isinstance(data, str) else data]
+        directory = attachments_dir(self._path)
+        tmp_path = os.path.join(directory, f".{uuid4()}")
+        sha = hashlib.sha256()
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                sha.update(chunk)
+                f.write(chunk)
+        digest = sha.hexdigest()
+        os.replace(tmp_path, os.path.join(directory, digest))
+        return {"name": attachment.get("name"), "mime": attachment.get("mime"), "file": digest}
+
+    @property
+    def path(self) -> str:
+        """Return path to the journal file."""
+        return self._path
+
+    @property
+    def endpoint(self) -> str:
+        """Return path to the journal file as the client endpoint."""
+        return self._path
+
+    @property
+    def project(self) -> str:
+        """Return current Project name."""
+        return self._project
+
+    def _convert_time(self, time: Union[str, datetime]) -> str:
+        if isinstance(time, datetime):
+            return str(int(time.timestamp() * 1000))
+        return time
+
+    def start_launch(self, name: str, start_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Record Launch start."""
+        if not self.use_own_launch:
+            return self._launch_uuid
+        self._launch_uuid = str(uuid4())
+        with self._lock:
+            self._file.truncate(0)
+        if os.path.exists(checkpoint_path(self._path)):
+            os.remove(checkpoint_path(self._path))
+        self._record(
+            "start_launch", name=name, start_time=self._convert_time(start_time), uuid=self._launch_uuid, **kwargs
+        )
+        return self._launch_uuid
+
+    def finish_launch(self, end_time: Union[str, datetime], **kwargs: Any) -> None:
+        """Record Launch finish."""
+        if self.use_own_launch:
+            self._record("finish_launch", end_time=self._convert_time(end_time), **kwargs)
+
+    def log(
+        self,
+        time: Union[str, datetime],
+        message: str,
+        level: Optional[Union[int, str]] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[Any] = None,
+    ) -> None:
+        """Record Log message, the attachment is copied into the journal attachments directory."""
+        super().log(time, message, level, self._store_attachment(attachment) if attachment else None, item_id)
+
+    def clone(self) -> "JournalClient":
+        """Create a new client which appends to the same journal."""
+        cloned = JournalClient(self._path, self._project, self._launch_uuid)
+        current_item = self.current_item()
+        if current_item:
+            cloned._item_stack.append(current_item)
+        return cloned
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,286 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Helpers which reduce the number of log entries sent to ReportPortal."""
+
+import time
+from typing import Any, Callable, Mapping, Optional, Union
+from warnings import warn
+
+DEFAULT_COALESCED_LOG_SIZE = 64 * 1024
+
+
+class CoalescedLog(object):
+    """Buffer of messages which are sent as one log entry, or as few entries if they don't fit the size limit.
+
+    An entry keeps the time of its first message, so it's sorted before the logs posted after that message.
+    """
+
+    _max_size: int
+    _messages: list[tuple[Optional[str], str]]
+
+    def __init__(self, max_size: int = DEFAULT_COALESCED_LOG_SIZE) -> None:
+        """Initialize instance attributes.
+
+        :param max_size: maximum length of a single log entry in characters
+        """
+        self._max_size = max_size
+        self._messages = []
+
+    def __bool__(self) -> bool:
+        """Return True if there are buffered messages."""
+        return bool(self._messages)
+
+    def add(self, message: str, time: Optional[str] = None) -> None:
+        """Buffer the message.
+
+        :param message: message text
+        :param time:    time of the message
+        """
+        self._messages.append((time, message))
+
+    def flush(self) -> list[tuple[Optional[str], str]]:
+        """Return buffered messages joined into log entries and clear the buffer.
+
+        Messages are never split, a message longer than the limit is sent as a separate entry.
+
+        :return: log entries, each is a tuple of the time of its first message and the entry text
+        """
+        chunks = []
+        current = []
+        time = None
+        size = 0
+        for message_time, message in self._messages:
+            if current and size + len(message) + 1 > self._max_size:
+                chunks.append((time, "\n".join(current)))
+                current, size = [], 0
+            if not current:
+                time = message_time
+            current.append(message)
+            size += len(message) + 1
+        if current:
+            chunks.append((time, "\n".join(current)))
+        self._messages = []
+        return chunks
+
+    def clear(self) -> None:
+        """Drop buffered messages."""
+        self._messages = []
+
+
+LazyMessage = Union[str, Callable[[], str]]
+
+
+def render_message(message: LazyMessage, args: Optional[Union[tuple, Mapping[str, Any]]] = None) -> str:
+    """Build the log message text.
+
+    :param message: text, `%` format template or function which returns the text
+    :param args:    arguments of the format template
+    :return: message text
+    """
+    if callable(message):
+        message = message()
+    if args is not None:
+        message = message % args
+    return str(message)
+
+
+LEVEL_RANKS = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40, "FATAL": 50}
+UNLIMITED_LEVEL_RANK = LEVEL_RANKS["WARN"]
+
+
+def level_rank(level: Optional[Union[int, str]]) -> int:
+    """Return numeric rank of the log level, compatible with the `logging` module levels.
+
+    :param level: level name or number, INFO if None or unknown, a warning is issued for an unknown level
+    :return: level rank
+    """
+    if level is None:
+        return LEVEL_RANKS["INFO"]
+    if isinstance(level, int):
+        return level
+    name = str(level).strip().upper()
+    if name.isdigit():
+        return int(name)
+    rank = LEVEL_RANKS.get(name)
+    if rank is None:
+        warn(f"Unknown log level '{level}', it's ranked as INFO", RuntimeWarning, stacklevel=2)
+        return LEVEL_RANKS["INFO"]
+    return rank
+
+
+class TokenBucket(object):
+    """Token bucket which is refilled evenly, the whole capacity in the given period."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    capacity: float
+    rate: float
+    tokens: float
+    updated: float
+
+    def __init__(self, capacity: int, period: Optional[float], now: float) -> None:
+        """Initialize instance attributes.
+
+        :param capacity: maximum number of tokens
+        :param period:   time in seconds to refill the empty bucket, the bucket is never refilled if None
+        :param now:      current time
+        """
+        self.capacity = capacity
+        self.rate = capacity / period if period else 0.0
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, amount: int, now: float) -> bool:
+        """Take tokens if there are enough of them.
+
+        :param amount: number of tokens
+        :param now:    current time
+        :return: True if the tokens were taken
+        """
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class _Budget(object):
+    """Message count and byte buckets of one log level."""
+
+    __slots__ = ("messages", "bytes")
+
+    messages: Optional[TokenBucket]
+    bytes: Optional[TokenBucket]
+
+    def __init__(
+        self, max_messages: Optional[int], max_bytes: Optional[int], period: Optional[float], now: float
+    ) -> None:
+        self.messages = TokenBucket(max_messages, period, now) if max_messages else None
+        self.bytes = TokenBucket(max_bytes, period, now) if max_bytes else None
+
+    def take(self, size: int, now: float) -> bool:
+        # a message is never taken partially, the count is returned if the bytes don't fit
+        if self.messages and not self.messages.take(1, now):
+            return False
+        if self.bytes and not self.bytes.take(size, now):
+            if self.messages:
+                self.messages.tokens += 1
+            return False
+        return True
+
+    def refund(self, size: int) -> None:
+        # return tokens of a message which was rejected by another budget
+        if self.messages:
+            self.messages.tokens += 1
+        if self.bytes:
+            self.bytes.tokens += size
+
+
+class LogLimiter(object):
+    """Per-item and per-launch log budgets.
+
+    Each item and the launch have a budget for every log level below WARN, WARN and ERROR messages always pass.
+    Messages over the budget are suppressed, or sampled if sampling is set, and counted for the item summary.
+    """
+
+    _item_messages: Optional[int]
+    _item_bytes: Optional[int]
+    _launch_messages: Optional[int]
+    _launch_bytes: Optional[int]
+    _period: Optional[float]
+    _sampling: int
+    _clock: Callable[[], float]
+    _items: dict[Any, dict[int, _Budget]]
+    _launch: dict[int, _Budget]
+    _suppressed: dict[Any, list[int]]
+    _excess: int
+
+    def __init__(
+        self,
+        item_messages: Optional[int] = None,
+        item_bytes: Optional[int] = None,
+        launch_messages: Optional[int] = None,
+        launch_bytes: Optional[int] = None,
+        period: Optional[float] = None,
+        sampling: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize instance attributes.
+
+        :param item_messages:   number of messages of one level per item
+        :param item_bytes:      size of messages of one level per item
+        :param launch_messages: number of messages of one level per launch
+        :param launch_bytes:    size of messages of one level per launch
+        :param period:          time in seconds in which budgets are fully restored, never restored if None
+        :param sampling:        pass one of every `sampling` messages over the budget, suppress all if 0
+        :param clock:           source of the current time
+        """
+        self._item_messages = item_messages
+        self._item_bytes = item_bytes
+        self._launch_messages = launch_messages
+        self._launch_bytes = launch_bytes
+        self._period = period
+        self._sampling = sampling
+        self._clock = clock
+        self._items = {}
+        self._launch = {}
+        self._suppressed = {}
+        self._excess = 0
+
+    def allow(self, item_id: Any, level: Optional[Union[int, str]], size: int) -> bool:
+        """Check the message against the budgets, count it if it's suppressed.
+
+        :param item_id: UUID of the item the message is logged to, None for the launch
+        :param level:   message level
+        :param size:    message size in bytes, including attachment
+        :return: True if the message should be sent
+        """
+        rank = level_rank(level)
+        if rank >= UNLIMITED_LEVEL_RANK:
+            return True
+        now = self._clock()
+        item_budget = self._items.setdefault(item_id, {}).get(rank)
+        if item_budget is None:
+            item_budget = _Budget(self._item_messages, self._item_bytes, self._period, now)
+            self._items[item_id][rank] = item_budget
+        launch_budget = self._launch.get(rank)
+        if launch_budget is None:
+            launch_budget = _Budget(self._launch_messages, self._launch_bytes, self._period, now)
+            self._launch[rank] = launch_budget
+        if item_budget.take(size, now):
+            if launch_budget.take(size, now):
+                return True
+            # a suppressed message should not spend the item budget
+            item_budget.refund(size)
+        self._excess += 1
+        if self._sampling and (self._excess - 1) % self._sampling == 0:
+            return True
+        suppressed = self._suppressed.setdefault(item_id, [0, 0])
+        suppressed[0] += 1
+        suppressed[1] += size
+        return False
+
+    def finish_item(self, item_id: Any) -> Optional[str]:
+        """Forget budgets of the finished item.
+
+        :param item_id: UUID of the item, None for the launch
+        :return: summary of suppressed messages or None if nothing was suppressed
+        """
+        self._items.pop(item_id, None)
+        suppressed = self._suppressed.pop(item_id, None)
+        if not suppressed:
+            return None
+        return f"{suppressed[0]} log messages ({suppressed[1]} bytes) suppressed by the log budget"
@@ -0,0 +1,166 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Collapsed reporting of Scenario Outlines.
+
+In collapsed mode an outline is reported as one parent item. Reporting calls of each example row are recorded in
+memory, the calls of a failed row are sent to ReportPortal when the row finishes, passed and skipped rows are dropped
+and only listed in the summary of the parent item.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Union
+
+from behave.model import ScenarioOutline
+from reportportal_client import RP
+
+from behave_reportportal.clients import LocalClient
+from behave_reportportal.dispatch import ReportEvent
+from behave_reportportal.rendering import markdown_table
+
+
+class RecordingClient(LocalClient):
+    """ReportPortal client implementation which records calls in memory, Test Item UUIDs are generated locally."""
+
+    events: list[ReportEvent]
+    item_ids: set[str]
+
+    def __init__(self, launch_uuid: Optional[str] = None) -> None:
+        """Initialize instance attributes.
+
+        :param launch_uuid: UUID of the launch the recorded items belong to
+        """
+        super().__init__(launch_uuid)
+        self.events = []
+        self.item_ids = set()
+
+    def _record(self, method: str, **kwargs: Any) -> None:
+        self.events.append(ReportEvent(method, kwargs))
+
+    def replay(self, client: RP, on_error: Optional[Callable[[ReportEvent], None]] = None) -> None:
+        """Send recorded calls with the given client.
+
+        Recorded Test Item UUIDs are passed to the client, if the client returns different ones, they are used for
+        the following calls.
+
+        :param client:   client to send calls with
+        :param on_error: handler of a failed call, it's called in the `except` block and the following calls are
+                         still sent, errors are raised if None
+        """
+        item_ids = {}
+        for event in self.events:
+            kwargs = dict(event.kwargs)
+            for key in ("parent_item_id", "item_id", "item_uuid"):
+                if kwargs.get(key) in item_ids:
+                    kwargs[key] = item_ids[kwargs[key]]
+            recorded_id = kwargs.get("uuid")
+            try:
+                result = getattr(client, event.method)(**kwargs)
+            except Exception:  # noqa
+                if on_error is None:
+                    raise
+                on_error(event)
+                continue
+            if recorded_id:
+                item_ids[recorded_id] = result
+        self.events = []
+
+    @property
+    def endpoint(self) -> str:
+        """Return empty string, since there is no server."""
+        return ""
+
+    @property
+    def project(self) -> str:
+        """Return empty string, since there is no server."""
+        return ""
+
+    def start_launch(self, name: str, start_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Return current Launch UUID, launches are never recorded."""
+        return self._launch_uuid
+
+    def start_test_item(
+        self, name: str, start_time: Union[str, datetime], item_type: str, **kwargs: Any
+    ) -> Optional[str]:
+        """Record Test Item start."""
+        item_uuid = super().start_test_item(name, start_time, item_type, **kwargs)
+        self.item_ids.add(item_uuid)
+        return item_uuid
+
+    def finish_launch(self, end_time: Union[str, datetime], **kwargs: Any) -> None:
+        """Do nothing, launches are never recorded."""
+
+    def clone(self) -> "RecordingClient":
+        """Create a new empty recorder for the same launch."""
+        return RecordingClient(self._launch_uuid)
+
+    def close(self) -> None:
+        """Drop recorded calls."""
+        self.events = []
+
+
+class CollapsedOutline(object):
+    """State of the Scenario Outline which is currently reported in collapsed mode."""
+
+    outline: ScenarioOutline
+    item_id: Optional[str]
+    passed_rows: dict[tuple[str, ...], list[Sequence[str]]]
+    passed: int
+    skipped: int
+    failed: int
+
+    def __init__(self, outline: ScenarioOutline, item_id: Optional[str]) -> None:
+        """Initialize instance attributes.
+
+        :param outline: reported Scenario Outline
+        :param item_id: UUID of the parent item of the outline rows
+        """
+        self.outline = outline
+        self.item_id = item_id
+        self.passed_rows = {}
+        self.passed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def add_row(self, headings: Sequence[str], cells: Sequence[str], status: str) -> bool:
+        """Count the finished row.
+
+        :param headings: row headings
+        :param cells:    row values
+        :param status:   ReportPortal status of the row
+        :return: True if the row should be reported as a separate item
+        """
+        if status == "PASSED":
+            # Examples blocks of one outline may have different columns
+            self.passed_rows.setdefault(tuple(headings), []).append(cells)
+            self.passed += 1
+            return False
+        if status == "SKIPPED":
+            self.skipped += 1
+            return False
+        self.failed += 1
+        return True
+
+    @property
+    def status(self) -> str:
+        """Return aggregated status of the outline rows."""
+        if self.failed:
+            return "FAILED"
+        return "PASSED" if self.passed or not self.skipped else "SKIPPED"
+
+    def summary(self) -> str:
+        """Return text with row counts and parameters of passed rows."""
+        text = f"Passed rows: {self.passed}, failed rows: {self.failed}, skipped rows: {self.skipped}"
+        for headings, rows in self.passed_rows.items():
+            text += "\n\n" + markdown_table(headings, rows)
+        return text
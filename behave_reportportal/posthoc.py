@@ -0,0 +1,208 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Post-hoc reporting of whole features.
+
+Reporting calls of a feature are recorded in memory while the feature runs. When the feature is finished, start and end
+times of its items are reconstructed from Behave measurements: the feature start time and step durations. Times of
+logs and of items which are not measured by Behave, like cleanup functions, are moved into the reconstructed times of
+their items. Then the calls are sent from a background thread while the next feature runs.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from behave.model import Feature, Scenario, ScenarioOutline, Step
+from reportportal_client import RP
+
+from behave_reportportal.attachments import FileContent
+from behave_reportportal.dispatch import ReportEvent
+from behave_reportportal.outlines import RecordingClient
+
+logger = logging.getLogger(__name__)
+
+Element = Union[Feature, ScenarioOutline, Scenario, Step]
+
+
+def _to_timestamp(seconds: float) -> str:
+    return str(int(seconds * 1000))
+
+
+def _to_seconds(time: Union[str, datetime]) -> Optional[float]:
+    if isinstance(time, datetime):
+        return time.timestamp()
+    try:
+        return int(time) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def _clamp(time: Union[str, datetime], window: tuple[float, float]) -> float:
+    seconds = _to_seconds(time)
+    if seconds is None:
+        return window[0]
+    return min(max(seconds, window[0]), window[1])
+
+
+def measure(feature: Feature, end_time: Optional[float] = None) -> dict[int, tuple[float, float]]:
+    """Reconstruct start and end times of feature elements from Behave measurements.
+
+    Behave measures only step execution, so elements are placed one after another starting from the feature start.
+    Hooks time is not measured for scenarios, the feature ends on its Behave end time or on the given end time if
+    they are later than its last step, so the feature includes its hooks and cleanup functions.
+
+    :param feature:  finished Behave feature
+    :param end_time: real end time of the feature in seconds, if it's finished before Behave measures it
+    :return: start and end times in seconds by element `id()`
+    """
+    time = feature.run_starttime
+    times = {}
+    for scenario in feature.walk_scenarios():
+        start = time
+        for step in scenario.all_steps:
+            times[id(step)] = (time, time + step.duration)
+            time += step.duration
+        times[id(scenario)] = (start, time)
+        parent = scenario.parent if isinstance(scenario.parent, ScenarioOutline) else None
+        if parent is not None:
+            times[id(parent)] = (times.get(id(parent), (start,))[0], time)
+    times[id(feature)] = (feature.run_starttime, max(time, feature.run_endtime or 0, end_time or 0))
+    return times
+
+
+class FeatureRecorder(RecordingClient):
+    """Recorder of reporting calls of one feature, which knows Behave elements of recorded items."""
+
+    feature: Feature
+    elements: dict[str, Element]
+
+    def __init__(self, feature: Feature, launch_uuid: Optional[str] = None) -> None:
+        """Initialize instance attributes.
+
+        :param feature:     Behave feature
+        :param launch_uuid: UUID of the launch the recorded items belong to
+        """
+        super().__init__(launch_uuid)
+        self.feature = feature
+        self.elements = {}
+
+    def log(
+        self,
+        time: Union[str, datetime],
+        message: str,
+        level: Optional[Union[int, str]] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[Any] = None,
+    ) -> None:
+        """Record Log message, attachment files are read at once, since they may be removed until replay."""
+        if attachment and isinstance(attachment.get("data"), FileContent):
+            content = attachment["data"]
+            attachment = dict(attachment, data=content.read())
+            content.close()
+        super().log(time, message, level=level, attachment=attachment, item_id=item_id)
+
+    def bind(self, item_id: Optional[str], element: Element) -> None:
+        """Remember the Behave element of the recorded item.
+
+        :param item_id: recorded Test Item UUID
+        :param element: Behave element
+        """
+        if item_id in self.item_ids:
+            self.elements[item_id] = element
+
+    def _measure(self) -> dict[str, tuple[float, float]]:
+        feature_end = None
+        for event in self.events:
+            if event.method == "finish_test_item" and self.elements.get(event.kwargs["item_id"]) is self.feature:
+                feature_end = _to_seconds(event.kwargs["end_time"])
+        times = measure(self.feature, feature_end)
+        return {item_id: times[id(element)] for item_id, element in self.elements.items() if id(element) in times}
+
+    def retime(self) -> None:
+        """Replace hook times of bound items with the times measured by Behave.
+
+        Other items and logs are moved into the times of their parent items: items start and finish not earlier
+        than their parent starts and not later than it finishes.
+        """
+        if not self.feature.run_starttime:
+            return
+        measured = self._measure()
+        windows = dict(measured)
+        for event in self.events:
+            kwargs = event.kwargs
+            if event.method == "start_test_item":
+                item_id = kwargs["uuid"]
+                parent_window = windows.get(kwargs.get("parent_item_id"))
+                if item_id not in measured and parent_window:
+                    windows[item_id] = (_clamp(kwargs["start_time"], parent_window), parent_window[1])
+                if item_id in windows:
+                    kwargs["start_time"] = _to_timestamp(windows[item_id][0])
+            elif event.method == "finish_test_item":
+                item_id = kwargs["item_id"]
+                if item_id in measured:
+                    kwargs["end_time"] = _to_timestamp(measured[item_id][1])
+                elif item_id in windows:
+                    kwargs["end_time"] = _to_timestamp(_clamp(kwargs["end_time"], windows[item_id]))
+            elif event.method == "log" and kwargs.get("item_id") in windows:
+                kwargs["time"] = _to_timestamp(_clamp(kwargs["time"], windows[kwargs["item_id"]]))
+
+
+class PostHocReporter(object):
+    """Sends recorded features in order from a background thread."""
+
+    _executor: ThreadPoolExecutor
+    _client: Optional[RP]
+    recorder: Optional[FeatureRecorder]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rp-post-hoc")
+        self._client = None
+        self.recorder = None
+
+    def start(self, client: RP, feature: Feature, launch_uuid: Optional[str]) -> FeatureRecorder:
+        """Start recording of the feature.
+
+        :param client:      client to send recorded calls with
+        :param feature:     Behave feature
+        :param launch_uuid: UUID of the launch
+        :return: recorder to report the feature with
+        """
+        self._client = client
+        self.recorder = FeatureRecorder(feature, launch_uuid)
+        return self.recorder
+
+    def _send(self, recorder: FeatureRecorder, client: RP) -> None:
+        def on_error(event: ReportEvent) -> None:
+            # the following calls are still sent, so started items are finished
+            logger.exception("Unable to report '%s' call of feature '%s'", event.method, recorder.feature.name)
+
+        recorder.replay(client, on_error)
+
+    def submit(self) -> Optional[RP]:
+        """Stop recording of the current feature and schedule sending of its calls.
+
+        :return: the client to report with outside of features
+        """
+        recorder, self.recorder = self.recorder, None
+        client, self._client = self._client, None
+        recorder.retime()
+        self._executor.submit(self._send, recorder, client)
+        return client
+
+    def close(self) -> None:
+        """Wait until all submitted features are sent."""
+        self._executor.shutdown(wait=True)
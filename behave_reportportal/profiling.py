@@ -0,0 +1,282 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Self-profiling of the agent: latency of Behave hooks and ReportPortal client calls."""
+
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Iterator, Optional
+
+from reportportal_client import RP
+
+from behave_reportportal.clients import DelegatingClient
+
+# each power of two is split into 2 ** _SUB_BUCKET_BITS buckets, which gives 25% resolution
+_SUB_BUCKET_BITS = 2
+_EXACT_LIMIT = 1 << (_SUB_BUCKET_BITS + 1)
+
+
+def _bucket(value: int) -> int:
+    if value < _EXACT_LIMIT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift << _SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_limit(bucket: int) -> int:
+    if bucket < _EXACT_LIMIT:
+        return bucket
+    shift = (bucket >> _SUB_BUCKET_BITS) - 1
+    mantissa = (bucket & ((1 << _SUB_BUCKET_BITS) - 1)) | (1 << _SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram(object):
+    """Histogram of latencies in nanoseconds with logarithmic buckets.
+
+    Recording is a couple of integer operations and a dict update, percentiles are approximated with the upper bound of
+    the bucket, so they are never less than the real value and never more than 25% above it. Latencies can be recorded
+    from several threads.
+    """
+
+    __slots__ = ("_buckets", "_lock", "count", "total", "max")
+
+    _buckets: dict[int, int]
+    _lock: threading.Lock
+    count: int
+    total: int
+    max: int
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: int) -> None:
+        """Record a latency.
+
+        :param value: latency in nanoseconds
+        """
+        bucket = _bucket(value)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """Return approximate latency percentile in nanoseconds.
+
+        :param percent: percentile to calculate, from 0 to 100
+        :return: latency which is not exceeded by the given percent of recorded values
+        """
+        if not self.count:
+            return 0
+        rank = self.count * percent / 100
+        seen = 0
+        with self._lock:
+            buckets = sorted(self._buckets.items())
+        for bucket, count in buckets:
+            seen += count
+            if seen >= rank:
+                return min(_bucket_limit(bucket), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Return count, total in milliseconds and p50/p95/p99/max in microseconds."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total / 1e6, 3),
+            "p50_us": round(self.percentile(50) / 1e3, 1),
+            "p95_us": round(self.percentile(95) / 1e3, 1),
+            "p99_us": round(self.percentile(99) / 1e3, 1),
+            "max_us": round(self.max / 1e3, 1),
+        }
+
+
+class Profiler(object):
+    """Collector of the agent latencies.
+
+    Time spent inside ReportPortal client calls is accumulated separately, so each hook duration is split into the
+    agent CPU time and the time the hook waited on the client. Launch totals are counted for the outermost hooks only,
+    since some hooks call other hooks. Client calls can be made from several threads, e.g. by the upload pool, so
+    client time and hook depth are counted per thread and a hook is charged only for the calls of its own thread.
+    """
+
+    hooks: dict[str, LatencyHistogram]
+    agent: dict[str, LatencyHistogram]
+    waiting: dict[str, LatencyHistogram]
+    client: dict[str, LatencyHistogram]
+    client_ns: int
+    agent_total_ns: int
+    waiting_total_ns: int
+    _lock: threading.Lock
+    _thread: threading.local
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self.hooks = {}
+        self.agent = {}
+        self.waiting = {}
+        self.client = {}
+        self.client_ns = 0
+        self.agent_total_ns = 0
+        self.waiting_total_ns = 0
+        self._lock = threading.Lock()
+        self._thread = threading.local()
+
+    def _thread_state(self) -> threading.local:
+        state = self._thread
+        if not hasattr(state, "client_ns"):
+            state.client_ns = 0
+            state.depth = 0
+        return state
+
+    @staticmethod
+    def _histogram(histograms: dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        """Return the named histogram, creating it if needed, should be called under the lock."""
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram()
+        return histogram
+
+    def _items(self, histograms: dict[str, LatencyHistogram]) -> list[tuple[str, LatencyHistogram]]:
+        with self._lock:
+            return list(histograms.items())
+
+    @contextmanager
+    def hook(self, name: str) -> Iterator[None]:
+        """Measure duration of the hook executed in the context.
+
+        :param name: hook name
+        """
+        mark = self.enter_hook()
+        try:
+            yield
+        finally:
+            self.exit_hook(name, mark)
+
+    def enter_hook(self) -> tuple[int, int]:
+        """Mark the start of a hook.
+
+        :return: start time and client time counter value, which should be passed to `exit_hook`
+        """
+        state = self._thread_state()
+        state.depth += 1
+        return perf_counter_ns(), state.client_ns
+
+    def exit_hook(self, name: str, mark: tuple[int, int]) -> None:
+        """Record duration of a hook.
+
+        :param name: hook name
+        :param mark: value returned by `enter_hook`
+        """
+        duration = perf_counter_ns() - mark[0]
+        state = self._thread_state()
+        waiting = state.client_ns - mark[1]
+        state.depth -= 1
+        with self._lock:
+            histograms = [self._histogram(h, name) for h in (self.hooks, self.agent, self.waiting)]
+            if not state.depth:
+                self.agent_total_ns += duration - waiting
+                self.waiting_total_ns += waiting
+        for histogram, value in zip(histograms, (duration, duration - waiting, waiting)):
+            histogram.add(value)
+
+    def record_client_call(self, name: str, duration: int) -> None:
+        """Record duration of a ReportPortal client call.
+
+        :param name:     client method name
+        :param duration: call duration in nanoseconds
+        """
+        self._thread_state().client_ns += duration
+        with self._lock:
+            self.client_ns += duration
+            histogram = self._histogram(self.client, name)
+        histogram.add(duration)
+
+    def summary(self) -> dict[str, Any]:
+        """Return all collected measurements."""
+        return {
+            "agent_cpu_ms": round(self.agent_total_ns / 1e6, 3),
+            "client_wait_ms": round(self.waiting_total_ns / 1e6, 3),
+            "hooks": {name: h.summary() for name, h in self._items(self.hooks)},
+            "hooks_agent_cpu": {name: h.summary() for name, h in self._items(self.agent)},
+            "hooks_client_wait": {name: h.summary() for name, h in self._items(self.waiting)},
+            "client_calls": {name: h.summary() for name, h in self._items(self.client)},
+        }
+
+    def format_summary(self) -> str:
+        """Return human-readable summary of collected measurements."""
+        lines = [
+            f"Agent profile: agent CPU {self.agent_total_ns / 1e6:.1f} ms, "
+            f"waiting on client {self.waiting_total_ns / 1e6:.1f} ms",
+            "",
+            f"{'':<24}{'count':>8}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'max µs':>10}"
+            f"{'agent ms':>10}{'wait ms':>10}",
+        ]
+        for name, histogram in sorted(self._items(self.hooks)):
+            s = histogram.summary()
+            lines.append(
+                f"{name:<24}{s['count']:>8}{s['p50_us']:>10}{s['p95_us']:>10}{s['p99_us']:>10}{s['max_us']:>10}"
+                f"{self.agent[name].total / 1e6:>10.1f}{self.waiting[name].total / 1e6:>10.1f}"
+            )
+        for name, histogram in sorted(self._items(self.client)):
+            s = histogram.summary()
+            lines.append(
+                f"{'client.' + name:<24}{s['count']:>8}{s['p50_us']:>10}{s['p95_us']:>10}{s['p99_us']:>10}"
+                f"{s['max_us']:>10}{'':>10}{s['total_ms']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def attributes(self) -> list[dict[str, str]]:
+        """Return launch attributes with the agent CPU and the client wait totals."""
+        return [
+            {"key": "agent_cpu_ms", "value": str(round(self.agent_total_ns / 1e6))},
+            {"key": "client_wait_ms", "value": str(round(self.waiting_total_ns / 1e6))},
+        ]
+
+
+class ProfilingClient(DelegatingClient):
+    """ReportPortal client wrapper which measures duration of reporting calls."""
+
+    _profiler: Profiler
+
+    def __init__(self, client: RP, profiler: Profiler) -> None:
+        """Initialize instance attributes.
+
+        :param client:   client to wrap
+        :param profiler: collector of measurements
+        """
+        super().__init__(client)
+        self._profiler = profiler
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            return super()._call(method, **kwargs)
+        finally:
+            self._profiler.record_client_call(method, perf_counter_ns() - start)
+
+    def current_item(self) -> Optional[str]:
+        """Return the last started and not finished Item UUID."""
+        return self._client.current_item()
+
+    def clone(self) -> "ProfilingClient":
+        """Clone the wrapped client, the clone reports to the same profiler."""
+        return ProfilingClient(self._client.clone(), self._profiler)
@@ -0,0 +1,111 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Rendering of step arguments and outline rows into Markdown."""
+
+import unicodedata
+from typing import Any, NamedTuple, Optional, Sequence
+
+from behave.model import Step
+
+
+def _text_width(text: str) -> int:
+    """Return the number of terminal columns the text takes."""
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+    return width
+
+
+def _center(text: str, width: int) -> str:
+    # the same split of padding as str.center does, but by display width
+    padding = width - _text_width(text)
+    left = padding // 2 + (padding & width & 1)
+    return " " * left + text + " " * (padding - left)
+
+
+def markdown_table(headings: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
+    """Render a table in Markdown with centered columns.
+
+    :param headings: column names
+    :param rows:     table rows, lists of cell values
+    :return: rendered table
+    """
+    widths = [_text_width(heading) for heading in headings]
+    for row in rows:
+        for index, cell in enumerate(row):
+            widths[index] = max(widths[index], _text_width(cell), 3)
+    lines = [
+        "| " + " | ".join(_center(heading, width) for heading, width in zip(headings, widths)) + " |",
+        "|" + "|".join(" :" + "-" * (width - 2) + ": " if width > 1 else " : " for width in widths) + "|",
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(_center(str(cell), width) for cell, width in zip(row, widths)) + " |")
+    return "\n".join(lines)
+
+
+def step_content(step: Step) -> str:
+    """Render step doc string and table.
+
+    :param step: Behave step
+    :return: rendered content or empty string if the step has no arguments
+    """
+    content = ""
+    if step.text:
+        content += f"```\n{step.text}\n```\n"
+    if step.table:
+        content += markdown_table(step.table.headings, [row.cells for row in step.table.rows])
+    return content
+
+
+class _RenderedStep(NamedTuple):
+    text: Optional[str]
+    table: Any
+    content: str
+
+
+class StepContentCache(object):
+    """Rendered step arguments by step location.
+
+    Background steps and steps of shared step definitions are the same objects for every scenario, so they are
+    rendered once. Cached content is reused only if the step arguments are the same objects as on rendering, outline
+    rows have their own arguments and are rendered again.
+    """
+
+    _entries: dict[Any, _RenderedStep]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self._entries = {}
+
+    def get(self, step: Step) -> str:
+        """Return rendered step content, render it if the step was not rendered before.
+
+        :param step: Behave step
+        :return: rendered content
+        """
+        location = step.location
+        key = (location.filename, location.line) if location else id(step)
+        entry = self._entries.get(key)
+        if entry is None or entry.text is not step.text or entry.table is not step.table:
+            entry = _RenderedStep(step.text, step.table, step_content(step))
+            self._entries[key] = entry
+        return entry.content
+
+    def clear(self) -> None:
+        """Forget all rendered steps."""
+        self._entries.clear()
@@ -0,0 +1,310 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Upload of recorded event journals to ReportPortal.
+
+Usage::
+
+    behave-rp-replay [-c behave.ini] [-w 4] [-D name=value ...] rp_launch.journal
+
+Each top-level item (feature) with all its descendants and logs is independent, so they are uploaded concurrently
+once the launch is started. Progress is stored in the `<journal>.replay` file, an interrupted upload started again
+skips already reported items.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+from reportportal_client import RP, ClientType
+
+from behave_reportportal.attachments import FileContent
+from behave_reportportal.behave_agent import create_rp_service
+from behave_reportportal.config import Config, load_config
+from behave_reportportal.dispatch import ReportEvent
+from behave_reportportal.journal import attachments_dir, checkpoint_path, read_journal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+LAUNCH_GROUP = ""
+
+
+class ReplayError(Exception):
+    """Journal could not be uploaded to ReportPortal."""
+
+
+class Checkpoint(object):
+    """Append-only record of replayed journal events.
+
+    Each line is a JSON object: either `{"launch_uuid": ...}` with UUID of the launch started on the server or
+    `{"done": [...]}` with numbers of replayed journal events.
+    """
+
+    _path: str
+    _lock: threading.Lock
+    launch_uuid: Optional[str]
+    done: set[int]
+
+    def __init__(self, path: str) -> None:
+        """Load already stored progress.
+
+        :param path: path to the progress file
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self.launch_uuid = None
+        self.done = set()
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.launch_uuid = record.get("launch_uuid", self.launch_uuid)
+                self.done.update(record.get("done", []))
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def save_launch(self, launch_uuid: str) -> None:
+        """Store UUID of the started launch."""
+        self.launch_uuid = launch_uuid
+        self._append({"launch_uuid": launch_uuid})
+
+    def mark_done(self, *numbers: int) -> None:
+        """Store numbers of replayed events."""
+        if numbers:
+            self.done.update(numbers)
+            self._append({"done": list(numbers)})
+
+
+def first_launch(events: Sequence[ReportEvent]) -> list[ReportEvent]:
+    """Return events of the first launch recorded in the journal.
+
+    Events after the first launch finish or the second launch start belong to another launch and are dropped.
+
+    :param events: journal events
+    :return: events of the first launch
+    """
+    result = []
+    started = False
+    for event in events:
+        if event.method == "start_launch":
+            if started:
+                break
+            started = True
+        result.append(event)
+        if event.method == "finish_launch":
+            break
+    if len(result) < len(events):
+        logger.warning("The journal contains several launches, only the first one is uploaded")
+    return result
+
+
+def group_events(events: Sequence[ReportEvent]) -> "OrderedDict[str, list[tuple[int, ReportEvent]]]":
+    """Split test item events by their top-level item.
+
+    Launch events and launch logs are put into the group with the empty key.
+
+    :param events: journal events
+    :return: events with their numbers grouped by the UUID of the top-level item
+    """
+    roots: dict[str, str] = {}
+    groups: OrderedDict[str, list[tuple[int, ReportEvent]]] = OrderedDict()
+    groups[LAUNCH_GROUP] = []
+    for number, event in enumerate(events):
+        kwargs = event.kwargs
+        if event.method == "start_test_item":
+            parent = kwargs.get("parent_item_id")
+            root = roots.get(parent, parent) if parent else kwargs["uuid"]
+            roots[kwargs["uuid"]] = root
+        else:
+            item_id = kwargs.get("item_id") or kwargs.get("item_uuid")
+            root = roots.get(item_id, LAUNCH_GROUP) if item_id else LAUNCH_GROUP
+        groups.setdefault(root, []).append((number, event))
+    return groups
+
+
+class JournalReplay(object):
+    """Upload of a recorded journal with a pool of workers."""
+
+    _path: str
+    _cfg: Config
+    _workers: int
+    _client_factory: Callable[[Config], Optional[RP]]
+    _checkpoint: Checkpoint
+
+    def __init__(
+        self,
+        path: str,
+        cfg: Config,
+        workers: int = DEFAULT_WORKERS,
+        client_factory: Callable[[Config], Optional[RP]] = create_rp_service,
+    ) -> None:
+        """Initialize instance attributes.
+
+        :param path:           path to the journal file
+        :param cfg:            agent config with ReportPortal connection parameters
+        :param workers:        number of concurrently uploaded top-level items
+        :param client_factory: function which creates ReportPortal client by config
+        """
+        self._path = path
+        self._cfg = cfg
+        self._cfg.journal_file = None
+        self._cfg.background_dispatch = False
+        self._cfg.client_type = ClientType.SYNC
+        self._workers = workers
+        self._client_factory = client_factory
+        self._checkpoint = Checkpoint(checkpoint_path(path))
+
+    def _create_client(self) -> RP:
+        if self._checkpoint.launch_uuid:
+            self._cfg.launch_uuid = self._checkpoint.launch_uuid
+        client = self._client_factory(self._cfg)
+        if client is None:
+            raise ReplayError(
+                "Unable to create ReportPortal client, check that reporting is enabled and 'endpoint', 'project' and "
+                "'api_key' parameters are set"
+            )
+        return client
+
+    def _is_started(self, client: RP, event: ReportEvent) -> bool:
+        # an item start could be sent but not stored in the checkpoint if the previous upload was interrupted
+        return event.method == "start_test_item" and client.get_item_id_by_uuid(event.kwargs["uuid"]) is not None
+
+    def _attachment(self, attachment: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+        if not attachment:
+            return None
+        file_path = os.path.join(attachments_dir(self._path), attachment["file"])
+        return {"name": attachment["name"], "data": FileContent(open(file_path, "rb")), "mime": attachment["mime"]}
+
+    def _replay_group(self, events: list[tuple[int, ReportEvent]]) -> None:
+        client = self._create_client()
+        logs = []
+        try:
+            for number, event in events:
+                if number in self._checkpoint.done:
+                    continue
+                kwargs = dict(event.kwargs)
+                if event.method == "log":
+                    kwargs["attachment"] = self._attachment(kwargs.get("attachment"))
+                    client.log(**kwargs)
+                    logs.append(number)
+                    continue
+                if getattr(client, event.method)(**kwargs) is None and not self._is_started(client, event):
+                    raise ReplayError(f"ReportPortal did not accept '{event.method}' event #{number}")
+                self._checkpoint.mark_done(number)
+        finally:
+            client.close()
+            # logs are sent in batches, they are surely delivered only after the client is closed
+            self._checkpoint.mark_done(*logs)
+
+    def _start_launch(self, events: list[tuple[int, ReportEvent]]) -> None:
+        if self._checkpoint.launch_uuid:
+            return
+        start = next((e for _, e in events if e.method == "start_launch"), None)
+        if not start:
+            if not self._cfg.launch_uuid:
+                raise ReplayError("The journal has no launch start, 'launch_uuid' parameter is required")
+            self._checkpoint.save_launch(self._cfg.launch_uuid)
+            return
+        client = self._create_client()
+        kwargs = dict(start.kwargs)
+        kwargs.pop("uuid", None)
+        launch_uuid = client.start_launch(**kwargs)
+        client.close()
+        if not launch_uuid:
+            raise ReplayError("ReportPortal did not accept launch start")
+        self._checkpoint.save_launch(launch_uuid)
+
+    def _replay_launch_events(self, events: list[tuple[int, ReportEvent]]) -> None:
+        client = self._create_client()
+        replayed = []
+        try:
+            for number, event in events:
+                if number in self._checkpoint.done or event.method == "start_launch":
+                    continue
+                kwargs = dict(event.kwargs)
+                if event.method == "log":
+                    kwargs["attachment"] = self._attachment(kwargs.get("attachment"))
+                elif event.method == "finish_launch":
+                    # the client joins the launch by its UUID, so it should be allowed to finish it explicitly
+                    client.use_own_launch = True
+                getattr(client, event.method)(**kwargs)
+                replayed.append(number)
+        finally:
+            client.close()
+            self._checkpoint.mark_done(*replayed)
+
+    def run(self) -> bool:
+        """Upload the journal.
+
+        :return: True if all events were uploaded
+        """
+        groups = group_events(first_launch(list(read_journal(self._path))))
+        launch_events = groups.pop(LAUNCH_GROUP)
+        self._start_launch(launch_events)
+        succeeded = True
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = [executor.submit(self._replay_group, events) for events in groups.values()]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:  # noqa
+                    logger.exception("Unable to upload journal events")
+                    succeeded = False
+        if not succeeded:
+            return False
+        # launch logs and launch finish go last to not finish the launch before items are reported
+        self._replay_launch_events(launch_events)
+        return True
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="behave-rp-replay", description="Upload a recorded journal to ReportPortal.")
+    parser.add_argument("journal", help="path to the journal file")
+    parser.add_argument("-c", "--config", help="path to the config file, 'behave.ini' by default")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="number of upload workers")
+    parser.add_argument(
+        "-D", dest="define", action="append", default=[], metavar="NAME=VALUE", help="override a config parameter"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run journal upload from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    overrides = dict(d.split("=", 1) for d in args.define if "=" in d)
+    replay = JournalReplay(args.journal, load_config(args.config, overrides), args.workers)
+    try:
+        return 0 if replay.run() else 1
+    except ReplayError as exc:
+        logger.error(exc)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+r"""Parsing of Behave tags which have a special meaning for the agent.
+
+All special tags share one grammar: `name(argument, argument, ...)`. Arguments may contain balanced parentheses and
+characters escaped with a backslash, e.g. `attribute(key:value\, with comma, call(a, b))` has two arguments:
+`key:value, with comma` and `call(a, b)`. A special tag with unbalanced parentheses is ignored.
+
+Parsed results are cached by the tag tuple, since features and scenarios, and especially scenario outline rows, share
+the same tag sets.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
+
+from reportportal_client.helpers import gen_attributes
+
+ATTRIBUTE_TAG = "attribute"
+TEST_CASE_ID_TAG = "test_case_id"
+FIXTURE_TAG_PREFIX = "fixture."
+SKIP_TAG = "skip"
+TAG_CACHE_SIZE = 4096
+
+
+class ParsedTags(NamedTuple):
+    """Meaning of an item tags for the agent."""
+
+    plain: tuple[str, ...]
+    attributes: tuple[str, ...]
+    payload: tuple[dict[str, str], ...]
+    fixtures: tuple[str, ...]
+    test_case_id: Optional[str]
+    skip: bool
+
+
+EMPTY_TAGS = ParsedTags((), (), (), (), None, False)
+
+_ESCAPED = re.compile(r"\\(.)")
+
+
+def _split_tag(tag: str) -> tuple[str, Optional[list[str]]]:
+    """Split the tag into its name and arguments.
+
+    :param tag: tag text
+    :return: tag name and list of arguments, arguments are None if the tag has no parentheses or they are unbalanced
+    """
+    start = tag.find("(")
+    if start == -1:
+        return tag.split(")", 1)[0], None
+    arguments = []
+    current = []
+    depth = 0
+    escaped = False
+    for position in range(start + 1, len(tag)):
+        char = tag[position]
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "(":
+            depth += 1
+            current.append(char)
+        elif char == ")" and depth:
+            depth -= 1
+            current.append(char)
+        elif char == ")":
+            if position != len(tag) - 1:
+                return tag[:start], None
+            arguments.append("".join(current).strip())
+            return tag[:start], [a for a in arguments if a]
+        elif char == "," and not depth:
+            arguments.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    return tag[:start], None
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def parse_tags(tags: tuple[str, ...]) -> ParsedTags:
+    """Parse item tags.
+
+    :param tags: item tags
+    :return: plain tags, attributes, fixtures, Test Case ID and skip flag
+    """
+    if not tags:
+        return EMPTY_TAGS
+    plain, attributes, fixtures = [], [], []
+    test_case_id = None
+    for tag in tags:
+        if tag.startswith(FIXTURE_TAG_PREFIX):
+            fixtures.append(tag[len(FIXTURE_TAG_PREFIX) :])
+            continue
+        name, arguments = _split_tag(tag)
+        if name == ATTRIBUTE_TAG:
+            attributes.extend(arguments or [])
+        elif name == TEST_CASE_ID_TAG:
+            if test_case_id is None and arguments:
+                test_case_id = _ESCAPED.sub(r"\1", tag[tag.find("(") + 1 : -1]).strip()
+        else:
+            plain.append(str(tag))
+    return ParsedTags(
+        tuple(plain),
+        tuple(attributes),
+        tuple(gen_attributes(plain + attributes)),
+        tuple(fixtures),
+        test_case_id,
+        SKIP_TAG in plain,
+    )
+
+
+def get_parsed_tags(tags: Optional[Sequence[str]]) -> ParsedTags:
+    """Parse tags of a Behave item, which may be None or a list.
+
+    :param tags: item tags
+    :return: parsed tags
+    """
+    return parse_tags(tuple(tags)) if tags else EMPTY_TAGS
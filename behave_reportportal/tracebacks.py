@@ -0,0 +1,109 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Formatting of exception tracebacks for logs.
+
+Compact tracebacks don't have frames of Behave and of the agent, have limited depth and length. Formatted text is
+cached on the exception object, since the same exception may be logged for a step, for its scenario and for several
+outline rows.
+"""
+
+import os
+import traceback
+from types import TracebackType
+from typing import Optional
+
+import behave
+
+import behave_reportportal
+
+DEFAULT_TRACEBACK_MAX_DEPTH = 10
+DEFAULT_TRACEBACK_MAX_LENGTH = 8 * 1024
+TRACEBACK_HEADER = "Traceback (most recent call last):"
+
+_CACHE_ATTRIBUTE = "_rp_formatted_traceback"
+_INTERNAL_PATHS = tuple(
+    os.path.dirname(os.path.abspath(package.__file__)) + os.sep for package in (behave, behave_reportportal)
+)
+_TRUNCATION_MARK = "\n...\n"
+
+
+def is_internal_frame(frame: traceback.FrameSummary) -> bool:
+    """Return True if the frame belongs to Behave or to the agent."""
+    return os.path.abspath(frame.filename).startswith(_INTERNAL_PATHS)
+
+
+def _compact(exception: traceback.TracebackException, max_depth: int) -> None:
+    """Remove internal frames and frames over the depth limit from the exception and its chain, in place."""
+    seen = set()
+    while exception is not None and id(exception) not in seen:
+        seen.add(id(exception))
+        frames = [frame for frame in exception.stack if not is_internal_frame(frame)]
+        # the innermost frames are closer to the error
+        exception.stack = traceback.StackSummary.from_list(frames[-max_depth:] if max_depth > 0 else [])
+        exception = exception.__cause__ or (None if exception.__suppress_context__ else exception.__context__)
+
+
+def _truncate(text: str, max_length: int) -> str:
+    """Cut the middle of the text, the beginning and the exception message at the end are kept."""
+    if max_length <= 0 or len(text) <= max_length:
+        return text
+    head = max(max_length // 4, 0)
+    tail = max(max_length - head - len(_TRUNCATION_MARK), 0)
+    return text[:head] + _TRUNCATION_MARK + text[len(text) - tail :]
+
+
+def format_traceback(
+    exception: BaseException,
+    exc_traceback: Optional[TracebackType],
+    compact: bool = False,
+    max_depth: int = DEFAULT_TRACEBACK_MAX_DEPTH,
+    max_length: int = DEFAULT_TRACEBACK_MAX_LENGTH,
+) -> str:
+    """Format the exception with its traceback.
+
+    :param exception:     exception to format
+    :param exc_traceback: traceback of the exception
+    :param compact:       remove internal frames and limit depth and length
+    :param max_depth:     maximum number of frames per exception in compact mode
+    :param max_length:    maximum text length in compact mode
+    :return: formatted text
+    """
+    key = (exc_traceback, compact, max_depth, max_length)
+    cached = getattr(exception, _CACHE_ATTRIBUTE, None)
+    if cached and cached[0] == key:
+        return cached[1]
+    if compact:
+        formatted = traceback.TracebackException(type(exception), exception, exc_traceback)
+        _compact(formatted, max_depth)
+        text = _truncate("".join(formatted.format()), max_length)
+    else:
+        text = "".join(traceback.format_exception(type(exception), exception, exc_traceback))
+    try:
+        setattr(exception, _CACHE_ATTRIBUTE, (key, text))
+    except (AttributeError, TypeError):
+        pass
+    return text
+
+
+def strip_traceback(error_message: str) -> str:
+    """Remove traceback text, which Behave adds to error messages of some failures.
+
+    :param error_message: Behave error message
+    :return: the message without traceback
+    """
+    position = error_message.find(TRACEBACK_HEADER)
+    if position == -1:
+        return error_message
+    return error_message[:position].rstrip()
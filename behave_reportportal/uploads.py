@@ -0,0 +1,88 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""Deferred upload of log attachments."""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 4
+DEFAULT_UPLOAD_TIMEOUT = 300.0
+
+
+class UploadPool(object):
+    """Thread pool which reads, prepares and posts log attachments while tests go on.
+
+    Uploads are independent of each other, so they are executed concurrently and in any order. Failures are logged and
+    never reach the test thread.
+    """
+
+    _executor: ThreadPoolExecutor
+    _pending: set["Future[Any]"]
+    _lock: threading.Lock
+
+    def __init__(self, workers: int = DEFAULT_UPLOAD_WORKERS) -> None:
+        """Initialize instance attributes.
+
+        :param workers: number of worker threads
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rp-uploader")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return func(*args)
+        except Exception:  # noqa
+            logger.exception("Unable to upload log attachment")
+            return None
+
+    def _done(self, future: "Future[Any]") -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> "Future[Any]":
+        """Schedule the upload.
+
+        :param func: function which posts the attachment
+        :param args: function arguments
+        :return: future of the function result
+        """
+        future = self._executor.submit(self._run, func, *args)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Return number of unfinished uploads."""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, timeout: Optional[float] = None) -> int:
+        """Wait for scheduled uploads and stop worker threads, uploads which did not start in time are cancelled.
+
+        :param timeout: maximum time in seconds to wait, unlimited if None
+        :return: number of uploads which did not finish
+        """
+        with self._lock:
+            pending = list(self._pending)
+        not_done = wait(pending, timeout).not_done if pending else set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return len(not_done)
@@ -43,6 +43,7 @@ setup(
     package_data={"behave_reportportal": ["py.typed"]},
     python_requires=">=3.8",
     install_requires=read_file("requirements.txt").splitlines(),
+    entry_points={"console_scripts": ["behave-rp-replay=behave_reportportal.replay:main"]},
     keywords=["testing", "reporting", "reportportal", "behave"],
     license="Apache 2.0",
     license_files=["LICENSE"],
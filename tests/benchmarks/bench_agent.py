@@ -0,0 +1,362 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""Benchmark of the agent overhead per Behave hook.
+
+The agent is driven through synthetic launches against an in-memory client, so only the agent code is measured.
+
+Usage::
+
+    python -m tests.benchmarks.bench_agent [--features 5] [--scenarios 20] [--steps 6] [--save] [--threshold 1.5]
+
+Results are compared with `baseline.json` next to this file, hooks which became slower than the baseline by more than
+the threshold factor are reported and make the exit code non-zero. Run with `--save` to update the baseline; the
+numbers are machine-dependent, so compare results taken on the same machine only.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter_ns
+from types import SimpleNamespace
+from typing import Any, Callable, Optional, Sequence
+
+from behave.model import Feature, Scenario
+from behave.model_core import Status
+from behave.parser import parse_feature
+
+from behave_reportportal.behave_agent import BehaveAgent
+from behave_reportportal.config import Config, LogLayout
+from behave_reportportal.utils import Singleton
+from tests.benchmarks.stub import StubRP
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 1.5
+HOT_PATH_ITERATIONS = 2000
+
+SCENARIO_TEMPLATE = """
+  @attribute(scope:benchmark,slow) @fixture.browser @test_case_id(TC-{index}) @smoke
+  Scenario: Scenario {index}
+    Given a step with a doc string
+      \"\"\"
+      Lorem ipsum dolor sit amet, consectetur adipiscing elit,
+      sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.
+      \"\"\"
+    When a step with a table
+      | name  | value | description      |
+      | first | 1     | the first value  |
+      | other | 2     | the second value |
+      | last  | 3     | the last value   |
+"""
+
+OUTLINE_TEMPLATE = """
+  @attribute(kind:outline)
+  Scenario Outline: Outline {index}
+    Given a user <user> with role <role>
+    Then the user <user> can see <page>
+
+    Examples:
+      | user  | role  | page     |
+      | alice | admin | settings |
+      | bob   | user  | profile  |
+"""
+
+
+class HookStats(object):
+    """Collected measurements of a single hook."""
+
+    durations: list[int]
+    allocations: list[int]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self.durations = []
+        self.allocations = []
+
+    def summary(self) -> dict[str, float]:
+        """Return calls number, mean and 95th percentile time in µs and mean peak allocation in bytes."""
+        durations = sorted(self.durations)
+        return {
+            "calls": len(durations),
+            "mean_us": statistics.fmean(durations) / 1000 if durations else 0.0,
+            "p95_us": durations[int(len(durations) * 0.95)] / 1000 if durations else 0.0,
+            "alloc_bytes": statistics.fmean(self.allocations) if self.allocations else 0.0,
+        }
+
+
+def build_feature_text(index: int, scenarios: int, steps: int) -> str:
+    """Generate text of a synthetic feature.
+
+    :param index:     feature number
+    :param scenarios: number of plain scenarios, every fourth scenario is replaced with an outline
+    :param steps:     number of plain steps added to each scenario after the steps with a doc string and a table
+    :return: feature text
+    """
+    lines = [
+        f"@attribute(feature:{index}) @fixture.database",
+        f"Feature: Benchmark feature {index}",
+        "  A synthetic feature to measure the agent overhead.",
+        "",
+        "  Background:",
+        "    Given a clean environment",
+    ]
+    for i in range(scenarios):
+        if i % 4 == 3:
+            lines.append(OUTLINE_TEMPLATE.format(index=i))
+            continue
+        lines.append(SCENARIO_TEMPLATE.format(index=i))
+        lines.extend(f"    Then plain step number {n}" for n in range(steps))
+    return "\n".join(lines)
+
+
+def build_features(count: int, scenarios: int, steps: int) -> list[Feature]:
+    """Parse synthetic features."""
+    return [
+        parse_feature(build_feature_text(i, scenarios, steps), filename=f"features/benchmark_{i}.feature")
+        for i in range(count)
+    ]
+
+
+def _raise_nested(depth: int) -> None:
+    if depth:
+        _raise_nested(depth - 1)
+    raise AssertionError("Expected 'actual value' to be equal to 'expected value'")
+
+
+def _fail(step: Any) -> None:
+    try:
+        _raise_nested(5)
+    except AssertionError as exc:
+        step.store_exception_context(exc)
+        step.error_message = f"Assertion Failed: {exc}"
+    step.set_status(Status.failed)
+
+
+def close_browser() -> None:
+    """Imitate a cleanup function registered by a fixture."""
+
+
+def drop_database() -> None:
+    """Imitate a cleanup function registered by a fixture."""
+
+
+class AgentBenchmark(object):
+    """Run synthetic launches through the agent and collect per-hook measurements."""
+
+    _layout: LogLayout
+    _args: argparse.Namespace
+    _attachment: str
+    _agent: Optional[BehaveAgent]
+    stats: dict[str, HookStats]
+    hooks: int
+    elapsed_ns: int
+
+    def __init__(self, layout: LogLayout, args: argparse.Namespace, attachment: str) -> None:
+        """Initialize instance attributes.
+
+        :param layout:     log layout to benchmark
+        :param args:       parsed command line arguments
+        :param attachment: path to a file which is attached to step logs
+        """
+        self._layout = layout
+        self._args = args
+        self._attachment = attachment
+        self._agent = None
+        self.stats = {}
+        self.hooks = 0
+        self.elapsed_ns = 0
+
+    def _create_agent(self) -> BehaveAgent:
+        Singleton._instances = {}
+        cfg = Config(endpoint="stub", api_key="stub", project="stub", launch_name="benchmark", log_layout=self._layout)
+        return BehaveAgent(cfg, StubRP())
+
+    def _call(self, hook: str, func: Callable, *args: Any, trace: bool) -> None:
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func(*args)
+            self.stats.setdefault(hook, HookStats()).allocations.append(tracemalloc.get_traced_memory()[1] - before)
+            return
+        start = perf_counter_ns()
+        func(*args)
+        elapsed = perf_counter_ns() - start
+        self.stats.setdefault(hook, HookStats()).durations.append(elapsed)
+        self.elapsed_ns += elapsed
+        self.hooks += 1
+
+    def _run_scenario(self, context: SimpleNamespace, scenario: Scenario, failed: bool, trace: bool) -> None:
+        agent = self._agent
+        context.active_outline = getattr(scenario, "_row", None)
+        self._call("start_scenario", agent.start_scenario, context, scenario, trace=trace)
+        steps = list(scenario.all_steps)
+        fail_at = len(steps) // 2 if failed else None
+        for number, step in enumerate(steps):
+            if fail_at is not None and number > fail_at:
+                step.set_status(Status.skipped)
+                continue
+            self._call("start_step", agent.start_step, context, step, trace=trace)
+            if number == fail_at:
+                _fail(step)
+            else:
+                step.set_status(Status.passed)
+            if self._args.attach_every and number % self._args.attach_every == 0:
+                self._call("post_log", agent.post_log, "Screenshot", "INFO", None, self._attachment, trace=trace)
+            self._call("finish_step", agent.finish_step, context, step, trace=trace)
+        self._call("finish_scenario", agent.finish_scenario, context, scenario, trace=trace)
+        context.active_outline = None
+
+    def run(self, trace: bool = False) -> None:
+        """Run a whole synthetic launch.
+
+        :param trace: measure allocations instead of time
+        """
+        self._agent = self._create_agent()
+        features = build_features(self._args.features, self._args.scenarios, self._args.steps)
+        scenario_layer = {"@layer": "scenario", "@cleanups": [close_browser]}
+        feature_layer = {"@layer": "feature", "@cleanups": [drop_database]}
+        context = SimpleNamespace(active_outline=None, _stack=[scenario_layer, feature_layer])
+        self._call("start_launch", self._agent.start_launch, context, trace=trace)
+        scenario_number = 0
+        for feature in features:
+            self._call("start_feature", self._agent.start_feature, context, feature, trace=trace)
+            for scenario in feature.walk_scenarios():
+                failed = bool(self._args.fail_every) and scenario_number % self._args.fail_every == 0
+                self._run_scenario(context, scenario, failed, trace)
+                scenario_number += 1
+            self._call("finish_feature", self._agent.finish_feature, context, feature, trace=trace)
+        self._call("finish_launch", self._agent.finish_launch, context, trace=trace)
+
+    def hot_paths(self) -> dict[str, float]:
+        """Measure mean time of the agent hot paths in µs."""
+        agent = self._create_agent()
+        feature = build_features(1, 4, 1)[0]
+        scenario = feature.scenarios[0]
+        table_step = next(s for s in scenario.steps if s.table)
+        failed_step = scenario.steps[-1]
+        _fail(failed_step)
+        cases = {
+            "_build_step_content": lambda: agent._build_step_content(table_step),
+            "_attributes": lambda: agent._attributes(scenario),
+            "_log_exception": lambda: agent._log_exception("Step failed", failed_step, "item"),
+        }
+        return {name: _measure(func, HOT_PATH_ITERATIONS) for name, func in cases.items()}
+
+
+def _measure(func: Callable[[], Any], iterations: int) -> float:
+    start = perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (perf_counter_ns() - start) / iterations / 1000
+
+
+def run_layout(layout: LogLayout, args: argparse.Namespace, attachment: str) -> dict[str, Any]:
+    """Benchmark the given log layout.
+
+    :return: per-hook summaries, hot path timings and throughput in hooks per second
+    """
+    benchmark = AgentBenchmark(layout, args, attachment)
+    benchmark.run()  # warm-up, measurements are dropped below
+    benchmark.stats, benchmark.hooks, benchmark.elapsed_ns = {}, 0, 0
+    for _ in range(args.rounds):
+        benchmark.run()
+    tracemalloc.start()
+    try:
+        benchmark.run(trace=True)
+    finally:
+        tracemalloc.stop()
+    return {
+        "hooks": {name: stats.summary() for name, stats in benchmark.stats.items()},
+        "hot_paths": benchmark.hot_paths(),
+        "throughput": benchmark.hooks / (benchmark.elapsed_ns / 1e9) if benchmark.elapsed_ns else 0.0,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return descriptions of measurements which are slower than the baseline by more than the threshold factor."""
+    regressions = []
+    for layout, result in results.items():
+        base = baseline.get(layout)
+        if not base:
+            continue
+        timings = {f"hook {name}": stats["mean_us"] for name, stats in result["hooks"].items()}
+        timings.update({f"hot path {name}": value for name, value in result["hot_paths"].items()})
+        base_timings = {f"hook {name}": stats["mean_us"] for name, stats in base["hooks"].items()}
+        base_timings.update({f"hot path {name}": value for name, value in base["hot_paths"].items()})
+        for name, value in timings.items():
+            base_value = base_timings.get(name)
+            if base_value and value > base_value * threshold:
+                regressions.append(f"{layout}: {name} {value:.1f} µs, baseline {base_value:.1f} µs")
+    return regressions
+
+
+def print_results(results: dict[str, Any]) -> None:
+    """Print results as tables."""
+    for layout, result in results.items():
+        print(f"\n{layout} layout, {result['throughput']:.0f} hooks/s")
+        print(f"  {'hook':<20}{'calls':>8}{'mean µs':>12}{'p95 µs':>12}{'alloc KiB':>12}")
+        for name, stats in result["hooks"].items():
+            print(
+                f"  {name:<20}{stats['calls']:>8}{stats['mean_us']:>12.1f}{stats['p95_us']:>12.1f}"
+                f"{stats['alloc_bytes'] / 1024:>12.1f}"
+            )
+        for name, value in result["hot_paths"].items():
+            print(f"  {name:<28}{value:>12.1f}")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure the agent overhead per Behave hook.")
+    parser.add_argument("--features", type=int, default=5, help="number of features in a launch")
+    parser.add_argument("--scenarios", type=int, default=20, help="number of scenarios in a feature")
+    parser.add_argument("--steps", type=int, default=6, help="number of plain steps in a scenario")
+    parser.add_argument("--fail-every", type=int, default=5, help="fail every N-th scenario, 0 to disable")
+    parser.add_argument("--attach-every", type=int, default=4, help="attach a file to every N-th step, 0 to disable")
+    parser.add_argument("--rounds", type=int, default=3, help="number of measured launches")
+    parser.add_argument("--layout", action="append", choices=[layout.name for layout in LogLayout])
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="path to the baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown factor")
+    parser.add_argument("--save", action="store_true", help="store results as the new baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    layouts = [LogLayout[name] for name in args.layout] if args.layout else list(LogLayout)
+    with tempfile.NamedTemporaryFile(suffix=".png") as attachment:
+        attachment.write(os.urandom(64 * 1024))
+        attachment.flush()
+        results = {layout.name: run_layout(layout, args, attachment.name) for layout in layouts}
+    Singleton._instances = {}
+    print_results(results)
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""In-memory ReportPortal client which only counts calls."""
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from reportportal_client import RP
+from reportportal_client.steps import StepReporter
+
+
+class StubRP(RP):
+    """ReportPortal client which does no I/O, so the benchmark measures the agent code only."""
+
+    calls: Counter
+    log_bytes: int
+    _item_counter: int
+    _item_stack: list[str]
+
+    def __init__(self) -> None:
+        """Initialize instance attributes."""
+        self.calls = Counter()
+        self.log_bytes = 0
+        self._item_counter = 0
+        self._item_stack = []
+
+    @property
+    def launch_uuid(self) -> Optional[str]:
+        """Return current Launch UUID."""
+        return "launch"
+
+    @property
+    def endpoint(self) -> str:
+        """Return fake endpoint."""
+        return "stub://"
+
+    @property
+    def project(self) -> str:
+        """Return fake Project name."""
+        return "stub"
+
+    @property
+    def step_reporter(self) -> StepReporter:
+        """Return StepReporter object for the current launch."""
+        return StepReporter(self)
+
+    def use_microseconds(self) -> Optional[bool]:
+        """Return None, since there is no server to check."""
+        return None
+
+    def _convert_time(self, time: Union[str, datetime]) -> str:
+        return str(time)
+
+    def start_launch(self, name: str, start_time: Union[str, datetime], **kwargs: Any) -> Optional[str]:
+        """Count Launch start."""
+        self.calls["start_launch"] += 1
+        return "launch"
+
+    def start_test_item(
+        self, name: str, start_time: Union[str, datetime], item_type: str, **kwargs: Any
+    ) -> Optional[str]:
+        """Count Test Item start and return a sequential Item ID."""
+        self.calls["start_test_item"] += 1
+        self._item_counter += 1
+        item_id = kwargs.get("uuid") or f"item-{self._item_counter}"
+        self._item_stack.append(item_id)
+        return item_id
+
+    def finish_test_item(self, item_id: str, end_time: Union[str, datetime], **kwargs: Any) -> None:
+        """Count Test Item finish."""
+        self.calls["finish_test_item"] += 1
+        if self._item_stack and self._item_stack[-1] == item_id:
+            self._item_stack.pop()
+
+    def finish_launch(self, end_time: Union[str, datetime], **kwargs: Any) -> None:
+        """Count Launch finish."""
+        self.calls["finish_launch"] += 1
+
+    def update_test_item(self, item_uuid: Optional[str], **kwargs: Any) -> None:
+        """Count Test Item update."""
+        self.calls["update_test_item"] += 1
+
+    def log(
+        self,
+        time: Union[str, datetime],
+        message: str,
+        level: Optional[Union[int, str]] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[Any] = None,
+    ) -> None:
+        """Count Log message and its size."""
+        self.calls["log"] += 1
+        self.log_bytes += len(message or "")
+        if attachment:
+            self.log_bytes += len(attachment["data"])
+
+    def get_launch_info(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_item_id_by_uuid(self, item_uuid: str) -> Optional[str]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_launch_ui_id(self) -> Optional[int]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_launch_ui_url(self) -> Optional[str]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_project_settings(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def get_api_info(self) -> Optional[dict]:
+        """Return None, since there is no server to ask."""
+        return None
+
+    def current_item(self) -> Optional[str]:
+        """Return the last started and not finished Item ID."""
+        return self._item_stack[-1] if self._item_stack else None
+
+    def clone(self) -> "StubRP":
+        """Create a new empty stub."""
+        return StubRP()
+
+    def close(self) -> None:
+        """Do nothing, since there are no resources."""
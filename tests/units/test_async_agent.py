@@ -0,0 +1,172 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+from behave.model_core import Status
+from behave.parser import parse_feature
+from reportportal_client import ClientType, RPClient
+
+from behave_reportportal.async_agent import AsyncBehaveAgent, resolve
+from behave_reportportal.config import Config, LogLayout
+
+
+@pytest.fixture()
+def config():
+    return Config(endpoint="endpoint", api_key="api_key", project="project", background_dispatch="True")
+
+
+@pytest.fixture()
+def client_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def client_task(loop, value):
+    # a task of the client event loop, as the ASYNC_THREAD client returns
+    async def request():
+        await asyncio.sleep(0.01)
+        return value
+
+    async def create_task():
+        return loop.create_task(request())
+
+    return asyncio.run_coroutine_threadsafe(create_task(), loop).result()
+
+
+@mock.patch("behave_reportportal.behave_agent.create_rp_service")
+def test_async_thread_client_is_used(mock_create, config):
+    AsyncBehaveAgent(config)
+    assert config.client_type is ClientType.ASYNC_THREAD
+    assert config.background_dispatch is False
+    mock_create.assert_called_once_with(config)
+
+
+def test_post_log_sync_client(config):
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.log.return_value = ("log_id",)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    agent._log_item_id = "step_id"
+    assert asyncio.run(agent.post_log("message")) == ("log_id",)
+    mock_rps.log.assert_called_once_with(
+        time=mock.ANY, message="message", level="INFO", attachment=None, item_id="step_id"
+    )
+
+
+def test_post_log_lazy_message(config):
+    config.log_level = "INFO"
+    mock_rps = mock.create_autospec(RPClient)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    asyncio.run(agent.post_log(lambda: 1 / 0, level="DEBUG"))
+    asyncio.run(agent.post_log("status: %s", args=(200,)))
+    assert mock_rps.log.call_args.kwargs["message"] == "status: 200"
+
+
+def test_post_log_with_attachment(config, tmp_path):
+    file = tmp_path / "screenshot.png"
+    file.write_bytes(b"image")
+    mock_rps = mock.create_autospec(RPClient)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    asyncio.run(agent.post_launch_log("message", file_to_attach=str(file)))
+    attachment = mock_rps.log.call_args.kwargs["attachment"]
+    assert attachment["name"] == "screenshot.png"
+    assert attachment["mime"] == "image/png"
+    assert mock_rps.log.call_args.kwargs["item_id"] is None
+
+
+def test_post_log_with_deferred_upload(config, tmp_path):
+    config.upload_workers = 2
+    file = tmp_path / "screenshot.png"
+    file.write_bytes(b"image")
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.log.return_value = ("log_id",)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    assert asyncio.run(agent.post_log("message", file_to_attach=str(file))) == ("log_id",)
+
+
+def test_nested_step_content(config):
+    config.log_layout = LogLayout.NESTED
+    feature = parse_feature(
+        "Feature: feature\n"
+        "  Scenario: scenario\n"
+        "    Given a step\n"
+        "      | a |\n"
+        "      | 1 |\n"
+        "    And a skipped step\n"
+        "      | b |\n"
+        "      | 2 |\n"
+    )
+    scenario = feature.scenarios[0]
+    step, skipped = scenario.steps
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.side_effect = lambda **kwargs: kwargs["name"]
+    mock_context = mock.Mock(_stack=[], active_outline=None)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    agent.start_scenario(mock_context, scenario)
+    agent.start_step(mock_context, step)
+    step.set_status(Status.failed)
+    agent.finish_step(mock_context, step)
+    skipped.set_status(Status.skipped)
+    agent.finish_scenario(mock_context, scenario)
+    logged = [(c.kwargs["item_id"], c.kwargs["message"]) for c in mock_rps.log.call_args_list]
+    assert ("[Given]: a step", "|  a  |\n| :-: |\n|  1  |") in logged
+    # skipped steps are reported on the scenario finish with their content too
+    assert ("[And]: a skipped step", "|  b  |\n| :-: |\n|  2  |") in logged
+
+
+def test_disabled_agent(config):
+    config.enabled = False
+    agent = AsyncBehaveAgent(config)
+    assert asyncio.run(agent.post_log("message")) is None
+    assert asyncio.run(agent.get_item_id()) is None
+
+
+def test_resolve_task_of_client_loop(client_loop):
+    task = client_task(client_loop, "item_id")
+
+    async def step():
+        # other coroutines of the step run while the request is in progress
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.ensure_future(tick())
+        result = await resolve(task)
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(step())
+    assert result == "item_id"
+    assert ticks > 0
+
+
+def test_get_item_id(config, client_loop):
+    mock_rps = mock.create_autospec(RPClient)
+    agent = AsyncBehaveAgent(config, mock_rps)
+    agent._log_item_id = client_task(client_loop, "scenario_id")
+    agent._launch_id = "launch_id"
+    assert asyncio.run(agent.get_item_id()) == "scenario_id"
+    assert asyncio.run(agent.get_launch_id()) == "launch_id"
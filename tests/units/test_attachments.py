@@ -0,0 +1,99 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import gzip
+import hashlib
+import os
+
+import pytest
+
+from behave_reportportal.attachments import (
+    AttachmentIndex,
+    FileChangedError,
+    FileContent,
+    UploadedAttachment,
+    compress,
+    is_text,
+)
+
+
+def test_file_content(tmp_path):
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(b"0123456789")
+    content = FileContent(open(file_path, "rb"))
+    assert len(content) == 10
+    assert content.digest() == hashlib.sha256(b"0123456789").hexdigest()
+    assert content.read() == b"0123456789"
+    assert content.read() == b"0123456789"
+    content.close()
+
+
+def test_file_content_reopened_after_close(tmp_path):
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(b"0123456789")
+    file = open(file_path, "rb")
+    content = FileContent(file)
+    content.close()
+    assert file.closed
+    assert content.read() == b"0123456789"
+    assert b"".join(content.chunks()) == b"0123456789"
+    content.close()
+
+
+def test_file_content_overwritten(tmp_path):
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(b"0123456789")
+    content = FileContent(open(file_path, "rb"))
+    file_path.write_bytes(b"changed")
+    with pytest.raises(FileChangedError):
+        content.read()
+    content.close()
+
+
+def test_file_content_replaced_after_close(tmp_path):
+    file_path = tmp_path / "file.bin"
+    file_path.write_bytes(b"0123456789")
+    content = FileContent(open(file_path, "rb"))
+    content.close()
+    new_path = tmp_path / "new.bin"
+    new_path.write_bytes(b"0123456789")
+    os.replace(new_path, file_path)
+    with pytest.raises(FileChangedError):
+        content.read()
+
+
+def test_attachment_index_lru():
+    index = AttachmentIndex(2)
+    index.put("a", "a.txt", "item_a")
+    index.put("b", "b.txt", "item_b")
+    assert index.get("a") == UploadedAttachment("a.txt", "item_a")
+    index.put("c", "c.txt", None)
+    assert index.get("b") is None
+    assert index.get("a") is not None
+    assert index.get("c") == UploadedAttachment("c.txt", None)
+    index.clear()
+    assert index.get("a") is None
+
+
+def test_is_text():
+    assert is_text("response.json", "application/json")
+    assert is_text("page.html", "text/html")
+    assert is_text("network.har", "application/octet-stream")
+    assert not is_text("image.png", "image/png")
+
+
+def test_compress():
+    attachment = compress("response.json", b'{"a": 1}' * 100)
+    assert attachment["name"] == "response.json.gz"
+    assert attachment["mime"] == "application/gzip"
+    assert gzip.decompress(attachment["data"]) == b'{"a": 1}' * 100
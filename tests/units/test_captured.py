@@ -0,0 +1,84 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+from unittest import mock
+
+from behave.capture import Captured, ManyCaptured
+from behave.parser import parse_feature
+
+from behave_reportportal.captured import RingBuffer, collect_output, format_output
+
+
+def make_step(name, stdout="", stderr="", log="", error_message=None):
+    step = mock.Mock(keyword="Given", error_message=error_message)
+    step.name = name
+    step.captured = ManyCaptured([Captured(stdout=stdout, stderr=stderr, log=log, name="step")])
+    return step
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(10)
+    assert not buffer
+    buffer.add("12345")
+    buffer.add("67890")
+    assert buffer.text() == "1234567890"
+    buffer.add("abc")
+    assert buffer.text() == "... 3 characters skipped ...\n4567890abc"
+    buffer.add("a long text")
+    assert buffer.text() == "... 14 characters skipped ...\n long text"
+
+
+def test_ring_buffer_unlimited():
+    buffer = RingBuffer()
+    buffer.add("x" * 100000)
+    assert buffer.text() == "x" * 100000
+
+
+def test_collect_output():
+    scenario = mock.Mock()
+    scenario.all_steps = [
+        make_step("first", stdout="out 1\n", log="INFO:app:started"),
+        make_step("second"),
+        make_step("third", stdout="out 3", stderr="ERROR: boom", error_message="ERROR: boom"),
+    ]
+    output = collect_output(scenario, None)
+    assert output == {
+        "stdout": "[Given]: first\nout 1\n[Given]: third\nout 3\n",
+        "log": "[Given]: first\nINFO:app:started\n",
+    }
+    assert format_output(output).startswith("Captured stdout:\n[Given]: first\n")
+    assert "\nCaptured log:\n[Given]: first\nINFO:app:started\n" in format_output(output)
+
+
+def test_collect_output_limited():
+    scenario = mock.Mock()
+    scenario.all_steps = [make_step("first", stdout="a" * 100), make_step("second", stdout="b" * 10)]
+    output = collect_output(scenario, 30)
+    assert output["stdout"].endswith("\n[Given]: second\n" + "b" * 10 + "\n")
+    assert output["stdout"].startswith("... 113 characters skipped ...\naa\n[Given]: second")
+
+
+def test_collect_output_background():
+    feature = parse_feature(
+        "Feature: feature\n"
+        "  Background:\n"
+        "    Given a background step\n"
+        "  Scenario: scenario\n"
+        "    When a step\n"
+    )
+    scenario = feature.scenarios[0]
+    background_step, step = scenario.all_steps
+    background_step.captured.add_captured(Captured(stdout="bg out", name="step"))
+    step.captured.add_captured(Captured(stdout="out", name="step"))
+    assert collect_output(scenario, None) == {"stdout": "[Given]: a background step\nbg out\n[When]: a step\nout\n"}
@@ -0,0 +1,74 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+from unittest import mock
+
+import pytest
+from reportportal_client import RPClient
+
+from behave_reportportal.clients import DelegatingClient, LocalClient
+
+
+class WrappingClient(DelegatingClient):
+    def clone(self):
+        return WrappingClient(self._client.clone())
+
+
+class MemoryClient(LocalClient):
+    def __init__(self):
+        super().__init__("launch_uuid")
+        self.events = []
+
+    def _record(self, method, **kwargs):
+        self.events.append((method, kwargs))
+
+    endpoint = project = ""
+    start_launch = finish_launch = clone = close = None
+
+
+def test_delegating_client_passes_calls():
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.launch_uuid = "launch_uuid"
+    mock_rps.start_test_item.return_value = "item_id"
+    client = WrappingClient(mock_rps)
+    assert client.launch_uuid == "launch_uuid"
+    assert client.start_test_item(name="name", start_time="123", item_type="STEP", uuid="uuid") == "item_id"
+    client.log(time="123", message="message")
+    client.get_item_id_by_uuid("uuid")
+    client.close()
+    mock_rps.start_test_item.assert_called_once_with(name="name", start_time="123", item_type="STEP", uuid="uuid")
+    mock_rps.log.assert_called_once_with(time="123", message="message", level=None, attachment=None, item_id=None)
+    mock_rps.get_item_id_by_uuid.assert_called_once_with(item_uuid="uuid")
+    mock_rps.close.assert_called_once()
+
+
+def test_local_client_records_calls():
+    client = MemoryClient()
+    item_id = client.start_test_item(name="name", start_time="123", item_type="STEP")
+    assert client.current_item() == item_id
+    client.log(time="124", message="message", item_id=item_id)
+    client.finish_test_item(item_id=item_id, end_time="125", status="PASSED")
+    assert client.current_item() is None
+    assert client.launch_uuid == "launch_uuid"
+    assert client.get_item_id_by_uuid(item_id) is None
+    assert [e[0] for e in client.events] == ["start_test_item", "log", "finish_test_item"]
+    assert client.events[0][1]["uuid"] == item_id
+
+
+def test_local_client_requires_record():
+    class NoRecordClient(MemoryClient):
+        _record = LocalClient._record
+
+    with pytest.raises(TypeError):
+        NoRecordClient()
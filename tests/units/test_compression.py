@@ -0,0 +1,65 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import gzip
+from unittest import mock
+
+from reportportal_client import RPClient
+from reportportal_client.aio import ThreadedRPClient
+from requests import Request
+from requests.adapters import HTTPAdapter
+
+from behave_reportportal.compression import GzipLogAdapter, enable_log_compression
+
+
+def _prepare(url, body):
+    return Request("POST", url, data=body).prepare()
+
+
+@mock.patch.object(HTTPAdapter, "send")
+def test_gzip_log_adapter(mock_send):
+    adapter = GzipLogAdapter(min_size=10)
+    request = _prepare("http://rp/api/v2/project/log", b"x" * 100)
+    adapter.send(request)
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Length"] == str(len(request.body))
+    assert gzip.decompress(request.body) == b"x" * 100
+    mock_send.assert_called_once_with(request)
+
+
+@mock.patch.object(HTTPAdapter, "send")
+def test_gzip_log_adapter_skips_other_requests(mock_send):
+    adapter = GzipLogAdapter(min_size=10)
+    small = _prepare("http://rp/api/v2/project/log", b"x")
+    item = _prepare("http://rp/api/v2/project/item", b"x" * 100)
+    adapter.send(small)
+    adapter.send(item)
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in item.headers
+    assert item.body == b"x" * 100
+
+
+def test_enable_log_compression():
+    client = RPClient("http://rp", "project", api_key="api_key", retries=3)
+    assert enable_log_compression(client, 10)
+    # noinspection PyProtectedMember
+    adapter = client.session._client.get_adapter("http://rp/api/v2/project/log")
+    assert isinstance(adapter, GzipLogAdapter)
+    assert adapter.min_size == 10
+    assert adapter.max_retries.total == 3
+
+
+def test_enable_log_compression_unsupported_client():
+    client = ThreadedRPClient("http://rp", "project", api_key="api_key")
+    assert not enable_log_compression(client)
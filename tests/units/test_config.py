@@ -20,7 +20,25 @@ from behave.userdata import UserData
 from delayed_assert import assert_expectations, expect
 from reportportal_client import ClientType, OutputType
 
-from behave_reportportal.config import DEFAULT_CFG_FILE, DEFAULT_LAUNCH_NAME, RP_CFG_SECTION, LogLayout, read_config
+from behave_reportportal.captured import DEFAULT_CAPTURE_MAX_SIZE
+from behave_reportportal.config import (
+    DEFAULT_CFG_FILE,
+    DEFAULT_DEDUP_CACHE_SIZE,
+    DEFAULT_DEDUP_MESSAGE,
+    DEFAULT_LAUNCH_NAME,
+    RP_CFG_SECTION,
+    CaptureMode,
+    Config,
+    FixtureReportMode,
+    LogLayout,
+    OutlineMode,
+    SkippedStepsMode,
+    read_config,
+)
+from behave_reportportal.dispatch import DEFAULT_QUEUE_SIZE
+from behave_reportportal.logs import DEFAULT_COALESCED_LOG_SIZE
+from behave_reportportal.tracebacks import DEFAULT_TRACEBACK_MAX_DEPTH, DEFAULT_TRACEBACK_MAX_LENGTH
+from behave_reportportal.uploads import DEFAULT_UPLOAD_TIMEOUT
 
 
 @pytest.mark.parametrize(
@@ -186,6 +204,8 @@ def test_read_config_default_values(mock_cp):
     expect(cfg.launch_uuid_print is False)
     expect(cfg.launch_uuid_print_output is None)
     expect(cfg.client_type is ClientType.SYNC)
+    expect(cfg.background_dispatch is False)
+    expect(cfg.dispatch_queue_size == DEFAULT_QUEUE_SIZE)
     assert_expectations()
 
 
@@ -318,3 +338,193 @@ def test_client_timeouts(mock_cp, connect_value, read_value, expected_result):
 
     cfg = read_config(mock_context)
     assert cfg.http_timeout == expected_result
+
+
+@mock.patch("behave_reportportal.config.ConfigParser", autospec=True)
+def test_background_dispatch(mock_cp):
+    mock_context = mock.Mock()
+    mock_context._config.userdata = UserData.make({"config_file": "some_path"})
+    mock_cp().__getitem__.return_value = {
+        "api_key": "api_key",
+        "endpoint": "endpoint",
+        "project": "project",
+        "background_dispatch": "True",
+        "dispatch_queue_size": "100",
+    }
+
+    cfg = read_config(mock_context)
+    assert cfg.background_dispatch is True
+    assert cfg.dispatch_queue_size == 100
+
+
+@pytest.mark.parametrize("value, expected", [(None, None), ("", None), ("1024", 1024)])
+def test_attachment_max_size(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", attachment_max_size=value)
+    assert cfg.attachment_max_size == expected
+
+
+@pytest.mark.parametrize("value, expected", [(None, False), ("True", True), ("false", False)])
+def test_lazy_attachments(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", lazy_attachments=value)
+    assert cfg.lazy_attachments is expected
+
+
+def test_attachment_deduplication_defaults():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.attachment_deduplication is False
+    assert cfg.attachment_dedup_cache_size == DEFAULT_DEDUP_CACHE_SIZE
+    assert cfg.attachment_dedup_message == DEFAULT_DEDUP_MESSAGE
+
+
+@pytest.mark.parametrize("value,expected", [(None, False), ("False", False), ("True", True)])
+def test_profiling(value, expected):
+    cfg = Config(
+        endpoint="endpoint", api_key="api_key", project="project", profiling=value, profiling_attributes=value
+    )
+    assert cfg.profiling is expected
+    assert cfg.profiling_attributes is expected
+
+
+@pytest.mark.parametrize(
+    "value,expected", [(None, OutlineMode.FULL), ("collapsed", OutlineMode.COLLAPSED), ("xyz", OutlineMode.FULL)]
+)
+def test_outline_mode(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", outline_mode=value)
+    assert cfg.outline_mode is expected
+
+
+def test_coalesce_step_logs():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", coalesce_step_logs="True")
+    assert cfg.coalesce_step_logs is True
+    assert cfg.coalesced_log_size == DEFAULT_COALESCED_LOG_SIZE
+
+
+@pytest.mark.parametrize(
+    "enum,value,expected",
+    [
+        (LogLayout, "nested", LogLayout.NESTED),
+        (OutlineMode, "unknown", OutlineMode.FULL),
+        (SkippedStepsMode, "", SkippedStepsMode.ITEMS),
+        (FixtureReportMode, "Log", FixtureReportMode.LOG),
+        (CaptureMode, None, CaptureMode.OFF),
+    ],
+)
+def test_enum_lookup_by_name(enum, value, expected):
+    assert enum(value) is expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [(None, SkippedStepsMode.ITEMS), ("light", SkippedStepsMode.LIGHT), ("SUMMARY", SkippedStepsMode.SUMMARY)],
+)
+def test_skipped_steps_mode(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", skipped_steps_mode=value)
+    assert cfg.skipped_steps_mode is expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [(None, FixtureReportMode.ITEMS), ("aggregated", FixtureReportMode.AGGREGATED), ("LOG", FixtureReportMode.LOG)],
+)
+def test_fixture_report_mode(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", fixture_report_mode=value)
+    assert cfg.fixture_report_mode is expected
+
+
+def test_traceback_parameters():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.compact_tracebacks is False
+    assert cfg.traceback_max_depth == DEFAULT_TRACEBACK_MAX_DEPTH
+    assert cfg.traceback_max_length == DEFAULT_TRACEBACK_MAX_LENGTH
+    cfg = Config(
+        endpoint="endpoint",
+        api_key="api_key",
+        project="project",
+        compact_tracebacks="True",
+        traceback_max_depth="0",
+        traceback_max_length="1000",
+    )
+    assert cfg.compact_tracebacks is True
+    assert cfg.traceback_max_depth == 0
+    assert cfg.traceback_max_length == 1000
+
+
+@pytest.mark.parametrize("value,expected", [(None, False), ("True", True), ("false", False)])
+def test_failure_deduplication(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", failure_deduplication=value)
+    assert cfg.failure_deduplication is expected
+
+
+def test_log_budget_parameters():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.log_budget_messages is None
+    assert cfg.log_budget_bytes is None
+    assert cfg.launch_log_budget_messages is None
+    assert cfg.launch_log_budget_bytes is None
+    assert cfg.log_budget_period is None
+    assert cfg.log_budget_sampling == 0
+    cfg = Config(
+        endpoint="endpoint",
+        api_key="api_key",
+        project="project",
+        log_budget_messages="100",
+        log_budget_bytes="65536",
+        launch_log_budget_messages="10000",
+        launch_log_budget_bytes="10485760",
+        log_budget_period="1.5",
+        log_budget_sampling="10",
+    )
+    assert cfg.log_budget_messages == 100
+    assert cfg.log_budget_bytes == 65536
+    assert cfg.launch_log_budget_messages == 10000
+    assert cfg.launch_log_budget_bytes == 10485760
+    assert cfg.log_budget_period == 1.5
+    assert cfg.log_budget_sampling == 10
+
+
+@pytest.mark.parametrize("value,expected", [(None, None), ("", None), ("DEBUG", "DEBUG"), (10, 10)])
+def test_log_level(value, expected):
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", log_level=value)
+    assert cfg.log_level == expected
+
+
+def test_capture_parameters():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.capture_output is CaptureMode.OFF
+    assert cfg.capture_max_size == DEFAULT_CAPTURE_MAX_SIZE
+    cfg = Config(
+        endpoint="endpoint", api_key="api_key", project="project", capture_output="attachment", capture_max_size="1024"
+    )
+    assert cfg.capture_output is CaptureMode.ATTACHMENT
+    assert cfg.capture_max_size == 1024
+
+
+def test_compression_parameters():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.attachment_compression_threshold is None
+    assert cfg.log_batch_compression is False
+    cfg = Config(
+        endpoint="endpoint",
+        api_key="api_key",
+        project="project",
+        attachment_compression_threshold="65536",
+        log_batch_compression="True",
+    )
+    assert cfg.attachment_compression_threshold == 65536
+    assert cfg.log_batch_compression is True
+
+
+def test_upload_parameters():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.upload_workers == 0
+    assert cfg.upload_timeout == DEFAULT_UPLOAD_TIMEOUT
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", upload_workers="4", upload_timeout="30")
+    assert cfg.upload_workers == 4
+    assert cfg.upload_timeout == 30.0
+
+
+def test_post_hoc_reporting():
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project")
+    assert cfg.post_hoc_reporting is False
+    cfg = Config(endpoint="endpoint", api_key="api_key", project="project", post_hoc_reporting="True")
+    assert cfg.post_hoc_reporting is True
@@ -0,0 +1,87 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import json
+import os
+from unittest import mock
+
+from behave_reportportal.coordinator import JoinResult, LaunchCoordinator
+
+
+def test_first_process_starts_launch(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    start_launch = mock.Mock(return_value="launch_uuid")
+    first = LaunchCoordinator(state_file).join(start_launch)
+    second = LaunchCoordinator(state_file).join(start_launch)
+    assert first == JoinResult("launch_uuid", True)
+    assert second == JoinResult("launch_uuid", False)
+    start_launch.assert_called_once()
+
+
+def test_last_process_finishes_launch(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    coordinators = [LaunchCoordinator(state_file) for _ in range(3)]
+    for coordinator in coordinators:
+        coordinator.join(lambda: "launch_uuid")
+    assert coordinators[0].leave(failed=False) is None
+    assert coordinators[1].leave(failed=True) is None
+    assert coordinators[2].leave(failed=False) == "FAILED"
+    assert not os.path.exists(state_file)
+
+
+def test_expected_workers(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    first, second = LaunchCoordinator(state_file, workers=2), LaunchCoordinator(state_file, workers=2)
+    first.join(lambda: "launch_uuid")
+    assert first.leave(failed=False) is None
+    assert second.join(lambda: "another_uuid") == JoinResult("launch_uuid", False)
+    assert second.leave(failed=False) == "PASSED"
+    assert not os.path.exists(state_file)
+
+
+def test_failed_launch_start(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    coordinator = LaunchCoordinator(state_file)
+    assert coordinator.join(lambda: None) == JoinResult(None, True)
+    assert not os.path.exists(state_file)
+    assert coordinator.leave(failed=False) is None
+
+
+def test_state_of_another_run_is_replaced(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    LaunchCoordinator(state_file, run_id="first_run").join(lambda: "old_uuid")
+    coordinator = LaunchCoordinator(state_file, run_id="second_run")
+    assert coordinator.join(lambda: "new_uuid") == JoinResult("new_uuid", True)
+    assert coordinator.leave(failed=False) == "PASSED"
+
+
+def test_state_of_crashed_run_is_replaced(tmp_path):
+    state_file = str(tmp_path / "launch.json")
+    LaunchCoordinator(state_file, run_id="run").join(lambda: "old_uuid")
+    coordinator = LaunchCoordinator(state_file, run_id="run")
+    with mock.patch("behave_reportportal.coordinator._is_alive", return_value=False):
+        assert coordinator.join(lambda: "new_uuid") == JoinResult("new_uuid", True)
+    with open(state_file, encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["active"] == 1
+    assert state["pids"] == [os.getpid()]
+
+
+def test_early_process_without_expected_workers(tmp_path):
+    # without the number of workers a process which finishes before others join finishes the launch alone
+    state_file = str(tmp_path / "launch.json")
+    first, second = LaunchCoordinator(state_file), LaunchCoordinator(state_file)
+    first.join(lambda: "first_uuid")
+    assert first.leave(failed=False) == "PASSED"
+    assert second.join(lambda: "second_uuid") == JoinResult("second_uuid", True)
+    assert second.leave(failed=False) == "PASSED"
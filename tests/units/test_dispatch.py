@@ -0,0 +1,80 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import threading
+from unittest import mock
+
+from reportportal_client import RPClient
+
+from behave_reportportal.behave_agent import create_rp_service
+from behave_reportportal.config import Config
+from behave_reportportal.dispatch import BackgroundDispatcher
+
+
+def test_start_test_item_returns_generated_uuid():
+    mock_rps = mock.create_autospec(RPClient)
+    dispatcher = BackgroundDispatcher(mock_rps)
+    item_id = dispatcher.start_test_item(name="name", start_time="123", item_type="STEP")
+    dispatcher.close()
+    assert item_id
+    mock_rps.start_test_item.assert_called_once_with(name="name", start_time="123", item_type="STEP", uuid=item_id)
+    mock_rps.close.assert_called_once()
+
+
+def test_start_test_item_keeps_given_uuid():
+    mock_rps = mock.create_autospec(RPClient)
+    dispatcher = BackgroundDispatcher(mock_rps)
+    item_id = dispatcher.start_test_item(name="name", start_time="123", item_type="STEP", uuid="item_uuid")
+    dispatcher.close()
+    assert item_id == "item_uuid"
+
+
+def test_calls_are_sent_in_order_from_worker_thread():
+    calls = []
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.log.side_effect = lambda **kwargs: calls.append((kwargs["message"], threading.current_thread()))
+    dispatcher = BackgroundDispatcher(mock_rps, queue_size=2)
+    for i in range(10):
+        dispatcher.log(time="123", message=str(i), level="INFO", item_id="item_id")
+    dispatcher.close()
+    assert [c[0] for c in calls] == [str(i) for i in range(10)]
+    assert all(c[1] is not threading.current_thread() for c in calls)
+
+
+def test_failed_call_does_not_stop_worker():
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.finish_test_item.side_effect = ValueError("error")
+    dispatcher = BackgroundDispatcher(mock_rps)
+    dispatcher.finish_test_item(item_id="item_id", end_time="123", status="PASSED")
+    dispatcher.finish_launch(end_time="123")
+    dispatcher.close()
+    mock_rps.finish_launch.assert_called_once_with(end_time="123")
+
+
+def test_synchronous_calls_drain_queue():
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.get_launch_ui_url.side_effect = lambda: str(mock_rps.log.call_count)
+    dispatcher = BackgroundDispatcher(mock_rps)
+    for _ in range(5):
+        dispatcher.log(time="123", message="message")
+    assert dispatcher.get_launch_ui_url() == "5"
+    dispatcher.close()
+
+
+def test_create_rp_service_background_dispatch():
+    rp = create_rp_service(
+        Config(endpoint="A", api_key="B", project="C", background_dispatch="True", dispatch_queue_size="5")
+    )
+    assert isinstance(rp, BackgroundDispatcher)
+    assert isinstance(rp.client, RPClient)
+    rp.close()
@@ -0,0 +1,71 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import sys
+
+from behave_reportportal.failures import FailureIndex, fingerprint, normalize_message
+
+
+def fail(message, error_type=RuntimeError):
+    try:
+        raise error_type(message)
+    except Exception as exc:
+        return exc, sys.exc_info()[2]
+
+
+def fail_elsewhere(message):
+    try:
+        raise RuntimeError(message)
+    except Exception as exc:
+        return exc, sys.exc_info()[2]
+
+
+def test_normalize_message():
+    assert (
+        normalize_message("Timeout 30.5s connecting to 10.0.0.1:8080, session 3f2a6b1c-0c1d-4e5f-8a9b-0123456789ab")
+        == "Timeout <*>s connecting to <*>, session <*>"
+    )
+    assert normalize_message("object at 0x7f3a2b") == "object at <*>"
+
+
+def test_fingerprint():
+    first = fingerprint(*fail("Connection refused after 3 attempts"))
+    assert first == fingerprint(*fail("Connection refused after 5 attempts"))
+    assert first != fingerprint(*fail("Connection reset after 3 attempts"))
+    assert first != fingerprint(*fail("Connection refused after 3 attempts", ValueError))
+    assert first != fingerprint(*fail_elsewhere("Connection refused after 3 attempts"))
+
+
+def test_failure_index():
+    index = FailureIndex()
+    cluster, first = index.add(*fail("Connection refused after 3 attempts"), "item_1")
+    assert first
+    same, first = index.add(*fail("Connection refused after 4 attempts"), "item_2")
+    assert not first
+    assert same is cluster
+    assert cluster.item_id == "item_1"
+    assert cluster.count == 2
+    other, first = index.add(*fail("a | b", ValueError), "item_3")
+    assert first
+    assert len(index) == 2
+
+    summary = index.summary()
+    assert summary.startswith("Failure clusters: 2\n\n")
+    lines = summary.splitlines()
+    assert cluster.fingerprint in lines[4]
+    assert "RuntimeError: Connection refused after 3 attempts" in lines[4]
+    assert "ValueError: a \\| b" in lines[5]
+
+    index.clear()
+    assert len(index) == 0
@@ -0,0 +1,120 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+from unittest import mock
+
+import pytest
+from behave.runner import Context
+
+from behave_reportportal.fixtures import TimedCleanup, instrument_cleanups
+
+
+def run_cleanups(layer):
+    # the same way as Behave does on the layer pop
+    for cleanup in reversed(layer["@cleanups"]):
+        try:
+            cleanup()
+        except Exception:
+            pass
+    layer["@cleanups"] = []
+
+
+def test_instrument_no_cleanups():
+    layer = {"@layer": "scenario"}
+    assert not instrument_cleanups(layer, lambda executed: None)
+    assert "@cleanups" not in layer
+
+
+def test_instrument_cleanups_order_and_errors():
+    calls, reported = [], []
+
+    def close_browser():
+        calls.append("close_browser")
+
+    def drop_database():
+        calls.append("drop_database")
+        raise ValueError("locked")
+
+    layer = {"@layer": "scenario", "@cleanups": [close_browser, drop_database]}
+    assert instrument_cleanups(layer, reported.append)
+    run_cleanups(layer)
+
+    assert calls == ["drop_database", "close_browser"]
+    assert len(reported) == 1
+    executed = reported[0]
+    assert [cleanup.__name__ for cleanup in executed] == ["drop_database", "close_browser"]
+    assert isinstance(executed[0].error, ValueError)
+    assert executed[1].error is None
+    assert all(cleanup.start_time and cleanup.end_time for cleanup in executed)
+    assert executed[0].message.startswith("Execution of 'drop_database' cleanup function: ")
+    assert executed[0].message.endswith(" ms, failed with ValueError: locked")
+
+
+def test_timed_cleanup_reraises():
+    cleanup = TimedCleanup(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        cleanup()
+    assert isinstance(cleanup.error, ZeroDivisionError)
+    assert cleanup.duration >= 0
+
+
+def test_timed_cleanup_not_executed_message():
+    def close_browser():
+        pass
+
+    assert TimedCleanup(close_browser).message == "Execution of 'close_browser' cleanup function"
+
+
+def behave_context():
+    runner = mock.Mock()
+    runner.config.should_capture_hooks.return_value = False
+    context = Context(runner)
+    context.fail_on_cleanup_errors = False
+    return context
+
+
+def test_instrumented_cleanups_are_not_duplicated():
+    def close_browser():
+        pass
+
+    context = behave_context()
+    context._push("scenario")
+    context.add_cleanup(close_browser)
+    instrument_cleanups(context._stack[0], lambda executed: None)
+    context.add_cleanup(close_browser)
+    assert context._stack[0]["@cleanups"][1:] == [close_browser]
+    assert TimedCleanup(close_browser) == TimedCleanup(close_browser)
+    assert hash(TimedCleanup(close_browser)) == hash(close_browser)
+
+
+@pytest.mark.parametrize("handler_layer", ["testrun", "scenario"])
+def test_cleanup_error_handler_gets_original_function(handler_layer):
+    errors, reported = [], []
+
+    def drop_database():
+        raise ValueError("locked")
+
+    context = behave_context()
+    if handler_layer == "testrun":
+        context.on_cleanup_error = lambda ctx, func, exc: errors.append((func, exc))
+    context._push("scenario")
+    if handler_layer == "scenario":
+        context.on_cleanup_error = lambda ctx, func, exc: errors.append((func, exc))
+    context.add_cleanup(drop_database)
+    instrument_cleanups(context._stack[0], reported.append)
+    context._pop()
+    assert len(errors) == 1
+    assert errors[0][0] is drop_database
+    assert isinstance(errors[0][1], ValueError)
+    assert isinstance(reported[0][0].error, ValueError)
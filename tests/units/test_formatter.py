@@ -0,0 +1,104 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+from unittest import mock
+
+import pytest
+from behave.__main__ import main as behave_main
+from reportportal_client import RPClient
+
+FORMATTER = "behave_reportportal.formatter:ReportPortalFormatter"
+
+FEATURE = """Feature: formatter feature
+  Scenario: passed scenario
+    Given a passed step
+    And a passed step
+
+  Scenario: failed scenario
+    Given a failed step
+    And a passed step
+
+  @excluded
+  Scenario: excluded scenario
+    Given a passed step
+"""
+
+STEPS = """from behave import given
+
+
+@given("a passed step")
+def passed(context):
+    pass
+
+
+@given("a failed step")
+def failed(context):
+    assert False, "Failure"
+"""
+
+
+@pytest.fixture()
+def features_dir(tmp_path):
+    (tmp_path / "steps").mkdir()
+    (tmp_path / "steps" / "steps.py").write_text(STEPS)
+    (tmp_path / "formatter.feature").write_text(FEATURE)
+    return tmp_path
+
+
+@mock.patch("behave_reportportal.behave_agent.create_rp_service")
+def test_formatter(mock_create, features_dir):
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.launch_uuid = None
+    mock_rps.start_launch.return_value = "launch_id"
+    mock_rps.start_test_item.side_effect = lambda **kwargs: kwargs["name"]
+    mock_create.return_value = mock_rps
+    output = features_dir / "output.txt"
+    behave_main(
+        [
+            "-f",
+            FORMATTER,
+            "-o",
+            str(output),
+            "-t",
+            "~@excluded",
+            "-D",
+            "endpoint=endpoint",
+            "-D",
+            "project=project",
+            "-D",
+            "api_key=api_key",
+            "-D",
+            "log_layout=STEP",
+            str(features_dir),
+        ]
+    )
+
+    mock_rps.start_launch.assert_called_once()
+    started = [c.kwargs["name"] for c in mock_rps.start_test_item.call_args_list]
+    assert started == [
+        "formatter feature",
+        "passed scenario",
+        "[Given]: a passed step",
+        "[And]: a passed step",
+        "failed scenario",
+        "[Given]: a failed step",
+        # skipped steps are reported by the agent on the scenario finish, as with hooks
+        "[And]: a passed step",
+    ]
+    statuses = {c.kwargs["item_id"]: c.kwargs["status"] for c in mock_rps.finish_test_item.call_args_list}
+    assert statuses["passed scenario"] == "PASSED"
+    assert statuses["failed scenario"] == "FAILED"
+    assert statuses["formatter feature"] == "FAILED"
+    mock_rps.finish_launch.assert_called_once()
+    assert output.read_text() == "formatter feature: FAILED\n"
@@ -0,0 +1,103 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import logging
+from unittest import mock
+
+import pytest
+from reportportal_client import RPClient
+
+from behave_reportportal.behave_agent import BehaveAgent
+from behave_reportportal.config import Config
+from behave_reportportal.handler import rp_level
+
+
+@pytest.fixture()
+def config():
+    return Config(endpoint="endpoint", api_key="api_key", project="project")
+
+
+@pytest.fixture()
+def logger():
+    logger = logging.getLogger("tests.application")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers = []
+
+
+@pytest.mark.parametrize(
+    "levelno,expected",
+    [(5, "TRACE"), (logging.DEBUG, "DEBUG"), (25, "INFO"), (logging.WARNING, "WARN"), (logging.CRITICAL, "ERROR")],
+)
+def test_rp_level(levelno, expected):
+    assert rp_level(levelno) == expected
+
+
+def test_records_bound_to_item_and_flushed_on_finish(config, logger):
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    handler = ba.create_log_handler(level=logging.INFO)
+    handler.setFormatter(logging.Formatter("%(name)s: %(message)s"))
+    logger.addHandler(handler)
+
+    ba._log_item_id = "step_id"
+    logger.debug("filtered")
+    logger.info("request %s", "GET /")
+    ba._log_item_id = "scenario_id"
+    logger.warning("slow response")
+    logging.getLogger("reportportal_client.client").warning("client record")
+    mock_rps.log.assert_not_called()
+
+    ba._flush_log_handlers()
+    calls = mock_rps.log.call_args_list
+    assert [(c.kwargs["message"], c.kwargs["level"], c.kwargs["item_id"]) for c in calls] == [
+        ("tests.application: request GET /", "INFO", "step_id"),
+        ("tests.application: slow response", "WARN", "scenario_id"),
+    ]
+    assert all(c.kwargs["time"].isdigit() for c in calls)
+
+
+def test_flush_on_capacity(config, logger):
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    logger.addHandler(ba.create_log_handler(capacity=2))
+    logger.info("first")
+    mock_rps.log.assert_not_called()
+    logger.info("second")
+    assert mock_rps.log.call_count == 2
+
+
+def test_agent_log_level_applied(config, logger):
+    config.log_level = "WARN"
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    logger.addHandler(ba.create_log_handler())
+    logger.info("info")
+    logger.error("error")
+    ba._flush_log_handlers()
+    mock_rps.log.assert_called_once_with(time=mock.ANY, message="error", level="ERROR", attachment=None, item_id=None)
+
+
+def test_finish_step_flushes_handlers(config, logger):
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    logger.addHandler(ba.create_log_handler())
+    ba._scenario_id = ba._log_item_id = "scenario_id"
+    logger.info("inside step")
+    mock_step = mock.Mock(keyword="Given", text=None, table=None, location=None)
+    mock_step.name = "step"
+    mock_step.status.name = "passed"
+    ba.finish_step(mock.Mock(), mock_step)
+    assert mock_rps.log.call_args_list[0].kwargs["message"] == "inside step"
@@ -0,0 +1,142 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import hashlib
+import os
+
+from behave_reportportal.attachments import FileContent
+from behave_reportportal.behave_agent import create_rp_service
+from behave_reportportal.config import Config
+from behave_reportportal.journal import JournalClient, attachments_dir, checkpoint_path, read_journal
+
+
+def test_record_and_read(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    client = JournalClient(path)
+    launch_uuid = client.start_launch("launch", "1", attributes=[{"value": "a"}])
+    item_uuid = client.start_test_item("feature", "2", "SUITE")
+    client.log("3", "message", level="INFO", item_id=item_uuid)
+    client.finish_test_item(item_uuid, "4", status="PASSED")
+    client.finish_launch("5")
+    client.close()
+
+    events = list(read_journal(path))
+    assert [e.method for e in events] == [
+        "start_launch",
+        "start_test_item",
+        "log",
+        "finish_test_item",
+        "finish_launch",
+    ]
+    assert events[0].kwargs == {
+        "name": "launch",
+        "start_time": "1",
+        "uuid": launch_uuid,
+        "attributes": [{"value": "a"}],
+    }
+    assert events[1].kwargs["uuid"] == item_uuid
+    assert events[2].kwargs == {
+        "time": "3",
+        "message": "message",
+        "level": "INFO",
+        "attachment": None,
+        "item_id": item_uuid,
+    }
+
+
+def test_attachments(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    file_path = tmp_path / "file.txt"
+    file_path.write_bytes(b"file data")
+    client = JournalClient(path)
+    client.log("1", "bytes", attachment={"name": "a.bin", "data": b"bytes data", "mime": "application/octet-stream"})
+    client.log("2", "file", attachment={"name": "file.txt", "data": FileContent(open(file_path, "rb")), "mime": None})
+    client.close()
+
+    attachments = [e.kwargs["attachment"] for e in read_journal(path)]
+    for attachment, data in zip(attachments, (b"bytes data", b"file data")):
+        assert attachment["file"] == hashlib.sha256(data).hexdigest()
+        with open(os.path.join(attachments_dir(path), attachment["file"]), "rb") as f:
+            assert f.read() == data
+    assert attachments[0]["name"] == "a.bin"
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    client = JournalClient(path)
+    client.start_launch("launch", "1")
+    client.close()
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x01\x00{")
+    assert len(list(read_journal(path))) == 1
+
+
+def test_existing_launch_is_not_recorded(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    client = JournalClient(path, launch_uuid="launch_uuid")
+    assert client.start_launch("launch", "1") == "launch_uuid"
+    client.finish_launch("2")
+    client.close()
+    assert list(read_journal(path)) == []
+
+
+def test_new_launch_overwrites_journal(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    for name in ("first", "second"):
+        client = JournalClient(path)
+        client.start_launch(name, "1")
+        client.finish_launch("2")
+        client.close()
+        with open(checkpoint_path(path), "w") as f:
+            f.write('{"done": [0]}\n')
+
+    client = JournalClient(path)
+    assert len(list(read_journal(path))) == 2
+    assert os.path.exists(checkpoint_path(path))
+    launch_uuid = client.start_launch("third", "1")
+    assert not os.path.exists(checkpoint_path(path))
+    client.close()
+    events = list(read_journal(path))
+    assert [e.method for e in events] == ["start_launch"]
+    assert events[0].kwargs["uuid"] == launch_uuid
+
+
+def test_existing_launch_is_appended(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    for time in ("1", "2"):
+        client = JournalClient(path, launch_uuid="launch_uuid")
+        client.log(time, "message")
+        client.close()
+    assert [e.kwargs["time"] for e in read_journal(path)] == ["1", "2"]
+
+
+def test_joining_process_keeps_journal(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    client = JournalClient(path)
+    launch_uuid = client.start_launch("launch", "1")
+    # every coordinated process creates a client before it knows if it joins the launch
+    JournalClient(path).close()
+    joined = JournalClient(path, launch_uuid=launch_uuid)
+    joined.log("2", "message")
+    joined.close()
+    client.finish_launch("3")
+    client.close()
+    assert [e.method for e in read_journal(path)] == ["start_launch", "log", "finish_launch"]
+
+
+def test_create_rp_service_journal(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    rp = create_rp_service(Config(journal_file=path))
+    assert isinstance(rp, JournalClient)
+    assert rp.path == path
+    rp.close()
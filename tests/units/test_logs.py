@@ -0,0 +1,109 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import pytest
+
+from behave_reportportal.logs import CoalescedLog, LogLimiter, TokenBucket, level_rank, render_message
+
+
+def test_coalesced_log_single_entry():
+    log = CoalescedLog()
+    assert not log
+    log.add("first", "1")
+    log.add("second", "2")
+    assert log
+    assert log.flush() == [("1", "first\nsecond")]
+    assert not log
+
+
+def test_coalesced_log_chunks():
+    log = CoalescedLog(max_size=12)
+    for time, message in enumerate(("12345", "12345", "12345", "a long message")):
+        log.add(message, str(time))
+    assert log.flush() == [("0", "12345\n12345"), ("2", "12345"), ("3", "a long message")]
+
+
+@pytest.mark.parametrize("level,expected", [(None, 20), ("debug", 10), ("WARN", 30), (40, 40), ("15", 15)])
+def test_level_rank(level, expected):
+    assert level_rank(level) == expected
+
+
+def test_level_rank_unknown_level():
+    with pytest.warns(RuntimeWarning, match="custom"):
+        assert level_rank("custom") == 20
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(2, period=10, now=0)
+    assert bucket.take(2, now=0)
+    assert not bucket.take(1, now=0)
+    assert bucket.take(1, now=5)
+    assert not bucket.take(1, now=5)
+    assert bucket.take(2, now=100)
+
+
+def test_log_limiter_item_budget():
+    limiter = LogLimiter(item_messages=2)
+    assert [limiter.allow("item", "INFO", 10) for _ in range(4)] == [True, True, False, False]
+    # each level and each item has its own budget, WARN and ERROR are never limited
+    assert limiter.allow("item", "DEBUG", 10)
+    assert limiter.allow("other_item", "INFO", 10)
+    assert all(limiter.allow("item", level, 10) for level in ("WARN", "ERROR", 50))
+    assert limiter.finish_item("item") == "2 log messages (20 bytes) suppressed by the log budget"
+    assert limiter.finish_item("other_item") is None
+    assert limiter.allow("item", "INFO", 10)
+
+
+def test_log_limiter_bytes_and_launch_budget():
+    limiter = LogLimiter(item_bytes=100, launch_messages=3)
+    assert limiter.allow("first", "INFO", 60)
+    assert not limiter.allow("first", "INFO", 60)
+    assert limiter.allow("first", "INFO", 40)
+    assert limiter.allow("second", "INFO", 10)
+    assert not limiter.allow("second", "INFO", 10)
+    assert limiter.finish_item("second") == "1 log messages (10 bytes) suppressed by the log budget"
+
+
+def test_log_limiter_launch_rejection_keeps_item_budget():
+    now = [0.0]
+    limiter = LogLimiter(item_bytes=100, launch_messages=10, period=10, clock=lambda: now[0])
+    assert all(limiter.allow("first", "INFO", 0) for _ in range(10))
+    assert not limiter.allow("second", "INFO", 90)
+    now[0] = 1.0
+    # the launch budget restored one message, the item budget was not spent by the rejected one
+    assert limiter.allow("second", "INFO", 90)
+
+
+def test_log_limiter_period_and_sampling():
+    now = [0.0]
+    limiter = LogLimiter(item_messages=1, period=1, sampling=3, clock=lambda: now[0])
+    assert limiter.allow(None, "INFO", 1)
+    assert [limiter.allow(None, "INFO", 1) for _ in range(6)] == [True, False, False, True, False, False]
+    now[0] = 1.0
+    assert limiter.allow(None, "INFO", 1)
+    assert limiter.finish_item(None) == "4 log messages (4 bytes) suppressed by the log budget"
+
+
+@pytest.mark.parametrize(
+    "message,args,expected",
+    [
+        ("text", None, "text"),
+        ("100%", None, "100%"),
+        ("status: %s, body: %r", (200, "ok"), "status: 200, body: 'ok'"),
+        ("status: %(status)d", {"status": 404}, "status: 404"),
+        (lambda: "built", None, "built"),
+        (lambda: "built %s", ("late",), "built late"),
+    ],
+)
+def test_render_message(message, args, expected):
+    assert render_message(message, args) == expected
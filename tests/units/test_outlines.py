@@ -0,0 +1,59 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+from unittest import mock
+
+from reportportal_client import RPClient
+
+from behave_reportportal.outlines import CollapsedOutline, RecordingClient
+
+
+def test_recording_client_replay():
+    recorder = RecordingClient("launch_uuid")
+    item_id = recorder.start_test_item(name="row", start_time="1", item_type="STEP", parent_item_id="outline")
+    recorder.log(time="2", message="message", level="INFO", item_id=item_id)
+    recorder.finish_test_item(item_id=item_id, end_time="3", status="FAILED")
+    assert recorder.item_ids == {item_id}
+
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "server_id"
+    recorder.replay(mock_rps)
+    mock_rps.start_test_item.assert_called_once_with(
+        name="row", start_time="1", item_type="STEP", parent_item_id="outline", uuid=item_id
+    )
+    mock_rps.log.assert_called_once_with(
+        time="2", message="message", level="INFO", attachment=None, item_id="server_id"
+    )
+    mock_rps.finish_test_item.assert_called_once_with(item_id="server_id", end_time="3", status="FAILED")
+    assert recorder.events == []
+
+
+def test_collapsed_outline_rows():
+    outline = CollapsedOutline(mock.Mock(), "outline_id")
+    assert outline.add_row(["a"], ["1"], "PASSED") is False
+    assert outline.add_row(["a"], ["2"], "SKIPPED") is False
+    assert outline.add_row(["a", "b"], ["3", "4"], "PASSED") is False
+    assert outline.status == "PASSED"
+    assert outline.add_row(["a"], ["5"], "FAILED") is True
+    assert outline.status == "FAILED"
+    assert outline.summary() == (
+        "Passed rows: 2, failed rows: 1, skipped rows: 1\n\n"
+        "|  a  |\n| :-: |\n|  1  |\n\n"
+        "|  a  |  b  |\n| :-: | :-: |\n|  3  |  4  |"
+    )
+
+
+def test_collapsed_outline_all_skipped():
+    outline = CollapsedOutline(mock.Mock(), "outline_id")
+    outline.add_row(["a"], ["1"], "SKIPPED")
+    assert outline.status == "SKIPPED"
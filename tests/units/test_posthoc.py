@@ -0,0 +1,158 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+from unittest import mock
+
+from behave.parser import parse_feature
+
+from behave_reportportal.attachments import FileContent
+from behave_reportportal.posthoc import FeatureRecorder, PostHocReporter, measure
+
+FEATURE = (
+    "Feature: feature\n"
+    "  Background:\n"
+    "    Given a background step\n"
+    "  Scenario: first\n"
+    "    Given a step\n"
+    "  Scenario Outline: outline\n"
+    "    Given a step <a>\n"
+    "    Examples:\n"
+    "      | a |\n"
+    "      | 1 |\n"
+    "      | 2 |\n"
+)
+
+
+def _feature():
+    feature = parse_feature(FEATURE)
+    feature.run_starttime = 100.0
+    for scenario in feature.walk_scenarios():
+        for step in scenario.all_steps:
+            step.duration = 0.5
+    return feature
+
+
+def test_measure():
+    feature = _feature()
+    first, row1, row2 = feature.walk_scenarios()
+    times = measure(feature)
+    assert times[id(feature)] == (100.0, 103.0)
+    assert times[id(first)] == (100.0, 101.0)
+    assert times[id(first.steps[0])] == (100.5, 101.0)
+    assert times[id(row2)] == (102.0, 103.0)
+    assert times[id(row1.parent)] == (101.0, 103.0)
+
+
+def test_measure_feature_end():
+    feature = _feature()
+    assert measure(feature, 104.0)[id(feature)] == (100.0, 104.0)
+    feature.run_endtime = 105.0
+    assert measure(feature, 104.0)[id(feature)] == (100.0, 105.0)
+
+
+def test_feature_recorder_retime():
+    feature = _feature()
+    first = feature.walk_scenarios()[0]
+    recorder = FeatureRecorder(feature, "launch_id")
+    feature_id = recorder.start_test_item(name="feature", start_time="1", item_type="SUITE")
+    scenario_id = recorder.start_test_item(name="first", start_time="2", item_type="STEP", parent_item_id=feature_id)
+    recorder.log(time="3", message="message", item_id=scenario_id)
+    recorder.finish_test_item(item_id=scenario_id, end_time="4")
+    recorder.finish_test_item(item_id=feature_id, end_time="5")
+    recorder.bind(feature_id, feature)
+    recorder.bind(scenario_id, first)
+    recorder.bind("unknown", first)
+    recorder.retime()
+    assert [e.kwargs.get("start_time") or e.kwargs.get("end_time") or e.kwargs["time"] for e in recorder.events] == [
+        "100000",
+        "100000",
+        "100000",
+        "101000",
+        "103000",
+    ]
+    assert "unknown" not in recorder.elements
+
+
+def test_feature_recorder_retime_clamps_unmeasured_items():
+    feature = _feature()
+    first = feature.walk_scenarios()[0]
+    recorder = FeatureRecorder(feature, "launch_id")
+    feature_id = recorder.start_test_item(name="feature", start_time="99000", item_type="SUITE")
+    scenario_id = recorder.start_test_item(
+        name="first", start_time="99500", item_type="STEP", parent_item_id=feature_id
+    )
+    recorder.finish_test_item(item_id=scenario_id, end_time="106000")
+    cleanup_id = recorder.start_test_item(
+        name="cleanup", start_time="106500", item_type="AFTER_TEST", parent_item_id=scenario_id
+    )
+    recorder.log(time="106700", message="cleanup message", item_id=cleanup_id)
+    recorder.finish_test_item(item_id=cleanup_id, end_time="107000")
+    recorder.log(time="107500", message="feature message", item_id=feature_id)
+    recorder.finish_test_item(item_id=feature_id, end_time="108000")
+    recorder.bind(feature_id, feature)
+    recorder.bind(scenario_id, first)
+    recorder.retime()
+    assert [e.kwargs.get("start_time") or e.kwargs.get("end_time") or e.kwargs["time"] for e in recorder.events] == [
+        "100000",
+        "100000",
+        "101000",
+        "101000",
+        "101000",
+        "101000",
+        "107500",
+        "108000",
+    ]
+
+
+def test_post_hoc_reporter():
+    feature = _feature()
+    client = mock.Mock()
+    reporter = PostHocReporter()
+    recorder = reporter.start(client, feature, "launch_id")
+    item_id = recorder.start_test_item(name="feature", start_time="1", item_type="SUITE")
+    recorder.finish_test_item(item_id=item_id, end_time="2")
+    assert reporter.submit() is client
+    assert reporter.recorder is None
+    reporter.close()
+    client.start_test_item.assert_called_once_with(name="feature", start_time="1", item_type="SUITE", uuid=item_id)
+    client.finish_test_item.assert_called_once_with(item_id=client.start_test_item.return_value, end_time="2")
+
+
+def test_post_hoc_reporter_sends_finishes_after_errors():
+    feature = _feature()
+    client = mock.Mock()
+    client.log.side_effect = FileNotFoundError("screenshot.png")
+    reporter = PostHocReporter()
+    recorder = reporter.start(client, feature, "launch_id")
+    item_id = recorder.start_test_item(name="feature", start_time="1", item_type="SUITE")
+    recorder.log(time="1", message="message", item_id=item_id)
+    recorder.finish_test_item(item_id=item_id, end_time="2")
+    reporter.submit()
+    reporter.close()
+    client.log.assert_called_once()
+    client.finish_test_item.assert_called_once_with(item_id=client.start_test_item.return_value, end_time="2")
+
+
+def test_feature_recorder_reads_attachment_files(tmp_path):
+    file_path = tmp_path / "screenshot.png"
+    file_path.write_bytes(b"image")
+    file = open(file_path, "rb")
+    recorder = FeatureRecorder(_feature(), "launch_id")
+    attachment = {"name": "screenshot.png", "data": FileContent(file), "mime": "image/png"}
+    recorder.log(time="1", message="message", attachment=attachment, item_id="item_id")
+    assert file.closed
+    file_path.unlink()
+    client = mock.Mock()
+    recorder.replay(client)
+    assert client.log.call_args.kwargs["attachment"]["data"] == b"image"
@@ -0,0 +1,106 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import threading
+from unittest import mock
+
+import pytest
+from reportportal_client import RPClient
+
+from behave_reportportal.profiling import LatencyHistogram, Profiler, ProfilingClient
+
+
+@pytest.mark.parametrize("value", [0, 1, 7, 8, 9, 100, 1000, 12345, 10**9])
+def test_histogram_percentile_precision(value):
+    histogram = LatencyHistogram()
+    histogram.add(value)
+    histogram.add(value * 2)
+    assert value <= histogram.percentile(50) <= value * 1.25
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.add(value * 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["max_us"] == 1000.0
+    assert 500 <= summary["p50_us"] <= 625
+    assert 950 <= summary["p95_us"] <= 1000
+    assert 990 <= summary["p99_us"] <= 1000
+    assert summary["total_ms"] == 500.5
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().percentile(99) == 0
+
+
+def test_profiler_splits_agent_and_client_time():
+    profiler = Profiler()
+    outer = profiler.enter_hook()
+    inner = profiler.enter_hook()
+    profiler.record_client_call("log", 1000)
+    profiler.exit_hook("post_log", inner)
+    profiler.record_client_call("finish_test_item", 2000)
+    profiler.exit_hook("finish_step", outer)
+    assert profiler.waiting["post_log"].total == 1000
+    assert profiler.waiting["finish_step"].total == 3000
+    assert profiler.waiting_total_ns == 3000
+    assert profiler.agent_total_ns == profiler.hooks["finish_step"].total - 3000
+    assert profiler.client["log"].count == 1
+    assert "finish_step" in profiler.format_summary()
+    assert {a["key"] for a in profiler.attributes()} == {"agent_cpu_ms", "client_wait_ms"}
+
+
+def test_profiler_ignores_client_calls_of_other_threads():
+    profiler = Profiler()
+    with profiler.hook("finish_step"):
+        profiler.record_client_call("finish_test_item", 1000)
+        thread = threading.Thread(target=profiler.record_client_call, args=("log", 10**12))
+        thread.start()
+        thread.join()
+    assert profiler.waiting["finish_step"].total == 1000
+    assert profiler.waiting_total_ns == 1000
+    assert profiler.agent["finish_step"].total >= 0
+    assert profiler.client_ns == 10**12 + 1000
+
+
+def test_profiling_client_delegates_and_measures():
+    profiler = Profiler()
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "item_id"
+    client = ProfilingClient(mock_rps, profiler)
+    assert client.start_test_item(name="name", start_time="123", item_type="STEP") == "item_id"
+    client.close()
+    mock_rps.start_test_item.assert_called_once_with(name="name", start_time="123", item_type="STEP")
+    mock_rps.close.assert_called_once()
+    assert profiler.client["start_test_item"].count == 1
+    assert profiler.client["close"].count == 1
+    assert client.client is mock_rps
+
+
+def test_client_calls_from_several_threads():
+    profiler = Profiler()
+
+    def record():
+        for i in range(1000):
+            profiler.record_client_call(f"call_{i % 10}", i)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(h.count for h in profiler.client.values()) == 8000
+    assert profiler.client_ns == 8 * sum(range(1000))
+    assert profiler.client["call_0"].total == 8 * sum(range(0, 1000, 10))
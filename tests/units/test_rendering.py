@@ -0,0 +1,29 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import pytest
+
+from behave_reportportal.rendering import markdown_table
+
+
+@pytest.mark.parametrize(
+    "headings,rows,expected",
+    [
+        (["h"], [], "| h |\n| : |"),
+        (["h1", "x"], [["ab", "c"]], "|  h1 |  x  |\n| :-: | :-: |\n|  ab |  c  |"),
+        (["h1", "x"], [["abcd", ""]], "|  h1  |  x  |\n| :--: | :-: |\n| abcd |     |"),
+        (["name"], [["界"], ["ü"]], "| name |\n| :--: |\n|  界  |\n|  ü   |"),
+    ],
+)
+def test_markdown_table(headings, rows, expected):
+    assert markdown_table(headings, rows) == expected
@@ -0,0 +1,159 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import threading
+from unittest import mock
+
+import pytest
+from reportportal_client import RPClient
+
+from behave_reportportal.config import Config
+from behave_reportportal.dispatch import ReportEvent
+from behave_reportportal.journal import JournalClient, read_journal, write_event
+from behave_reportportal.replay import (
+    Checkpoint,
+    JournalReplay,
+    ReplayError,
+    checkpoint_path,
+    first_launch,
+    group_events,
+    main,
+)
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    path = str(tmp_path / "launch.journal")
+    client = JournalClient(path)
+    client.start_launch("launch", "1")
+    for feature in ("feature_1", "feature_2"):
+        feature_id = client.start_test_item(feature, "2", "SUITE")
+        scenario_id = client.start_test_item("scenario", "3", "STEP", parent_item_id=feature_id)
+        client.log("4", f"{feature} log", level="INFO", item_id=scenario_id)
+        client.finish_test_item(scenario_id, "5", status="PASSED")
+        client.finish_test_item(feature_id, "6", status="PASSED")
+    client.log("7", "launch log", level="INFO")
+    client.finish_launch("8")
+    client.close()
+    return path
+
+
+class FakeClients(object):
+    def __init__(self, fail_on=None, existing=()):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.fail_on = fail_on
+        self.existing = set(existing)
+
+    def __call__(self, cfg):
+        client = mock.create_autospec(RPClient)
+        client.start_launch.return_value = "server_launch_uuid"
+        client.start_test_item.side_effect = self._record("start_test_item", lambda kw: kw["uuid"])
+        client.finish_test_item.side_effect = self._record("finish_test_item", lambda kw: "OK")
+        client.log.side_effect = self._record("log", lambda kw: None)
+        client.finish_launch.side_effect = self._record("finish_launch", lambda kw: None)
+        client.get_item_id_by_uuid.side_effect = lambda uuid: "item_id" if uuid in self.existing else None
+        return client
+
+    def _record(self, method, result):
+        def call(**kwargs):
+            if self.fail_on and self.fail_on(method, kwargs):
+                return None
+            if method == "start_test_item" and kwargs["uuid"] in self.existing:
+                return None
+            with self.lock:
+                self.calls.append((method, kwargs))
+            return result(kwargs)
+
+        return call
+
+
+def test_group_events(journal):
+    groups = group_events(list(read_journal(journal)))
+    assert len(groups) == 3
+    launch_events = [e.method for _, e in groups[""]]
+    assert launch_events == ["start_launch", "log", "finish_launch"]
+    assert all(len(events) == 5 for key, events in groups.items() if key)
+
+
+def test_replay(journal):
+    clients = FakeClients()
+    assert JournalReplay(journal, Config(), workers=2, client_factory=clients).run()
+    methods = [c[0] for c in clients.calls]
+    assert methods.count("start_test_item") == 4
+    assert methods.count("finish_test_item") == 4
+    assert methods.count("log") == 3
+    assert methods[-1] == "finish_launch"
+    assert Checkpoint(checkpoint_path(journal)).launch_uuid == "server_launch_uuid"
+
+
+def test_replay_resume(journal):
+    failing = FakeClients(fail_on=lambda method, kwargs: method == "finish_test_item" and kwargs["end_time"] == "6")
+    assert not JournalReplay(journal, Config(), workers=2, client_factory=failing).run()
+    assert "finish_launch" not in [c[0] for c in failing.calls]
+
+    clients = FakeClients()
+    assert JournalReplay(journal, Config(), workers=2, client_factory=clients).run()
+    assert [c[0] for c in clients.calls] == ["finish_test_item", "finish_test_item", "log", "finish_launch"]
+
+    clients = FakeClients()
+    assert JournalReplay(journal, Config(), client_factory=clients).run()
+    assert clients.calls == []
+
+
+def test_replay_already_started_item(journal):
+    feature_uuid = list(read_journal(journal))[1].kwargs["uuid"]
+    clients = FakeClients(existing=[feature_uuid])
+    assert JournalReplay(journal, Config(), client_factory=clients).run()
+    methods = [c[0] for c in clients.calls]
+    assert methods.count("start_test_item") == 3
+    assert methods.count("finish_test_item") == 4
+    assert methods[-1] == "finish_launch"
+
+
+def test_first_launch_only(journal):
+    with open(journal, "ab") as f:
+        write_event(f, ReportEvent("start_launch", {"name": "other", "start_time": "9", "uuid": "other_uuid"}))
+        write_event(
+            f, ReportEvent("start_test_item", {"name": "f", "start_time": "9", "item_type": "SUITE", "uuid": "u"})
+        )
+        write_event(f, ReportEvent("finish_launch", {"end_time": "10"}))
+    events = list(read_journal(journal))
+    assert first_launch(events) == events[:-3]
+
+    clients = FakeClients()
+    assert JournalReplay(journal, Config(), client_factory=clients).run()
+    methods = [c[0] for c in clients.calls]
+    assert methods.count("start_test_item") == 4
+    assert methods.count("finish_launch") == 1
+
+
+def test_replay_without_client(journal):
+    with pytest.raises(ReplayError, match="Unable to create ReportPortal client"):
+        JournalReplay(journal, Config(enabled=False), client_factory=lambda cfg: None).run()
+
+
+@mock.patch("behave_reportportal.replay.JournalReplay")
+@mock.patch("behave_reportportal.replay.load_config")
+def test_main(mock_load_config, mock_replay):
+    mock_replay.return_value.run.return_value = True
+    assert main(["-c", "rp.ini", "-w", "2", "-D", "project=test", "launch.journal"]) == 0
+    mock_load_config.assert_called_once_with("rp.ini", {"project": "test"})
+    mock_replay.assert_called_once_with("launch.journal", mock_load_config.return_value, 2)
+
+
+@mock.patch("behave_reportportal.replay.JournalReplay")
+@mock.patch("behave_reportportal.replay.load_config")
+def test_main_replay_error(mock_load_config, mock_replay):
+    mock_replay.return_value.run.side_effect = ReplayError("error")
+    assert main(["launch.journal"]) == 1
@@ -11,20 +11,34 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License
 
+import gzip
+import json
 import sys
+import threading
 import traceback
+from concurrent.futures import Future
 from unittest import mock
 
 # noinspection PyPackageRequirements
 import pytest
+from behave.capture import Captured, ManyCaptured
 from behave.model_core import Status
+from behave.parser import parse_feature
 from delayed_assert import assert_expectations, expect
-from prettytable import MARKDOWN, PrettyTable
 from reportportal_client import BatchedRPClient, RPClient, ThreadedRPClient
 from reportportal_client.logs import MAX_LOG_BATCH_PAYLOAD_SIZE
 
+from behave_reportportal.attachments import FileContent
 from behave_reportportal.behave_agent import BehaveAgent, convert_to_rp_status, create_rp_service
-from behave_reportportal.config import Config, LogLayout
+from behave_reportportal.compression import GzipLogAdapter
+from behave_reportportal.config import (
+    CaptureMode,
+    Config,
+    FixtureReportMode,
+    LogLayout,
+    OutlineMode,
+    SkippedStepsMode,
+)
 from behave_reportportal.utils import Singleton
 
 
@@ -40,12 +54,6 @@ def config():
     )
 
 
-@pytest.fixture(autouse=True)
-def clean_instances():
-    yield
-    Singleton._instances = {}
-
-
 @pytest.mark.parametrize(
     "status,expected",
     [
@@ -251,10 +259,7 @@ def test_item_description():
     mock_context.active_outline.headings = ["number_a", "number_b"]
     mock_context.active_outline.cells = ["1", "2"]
 
-    pt = PrettyTable(field_names=mock_context.active_outline.headings)
-    pt.add_row(mock_context.active_outline.cells)
-    pt.set_style(MARKDOWN)
-    table = pt.get_string()
+    table = "| number_a | number_b |\n| :------: | :------: |\n|    1     |    2     |"
     expect(
         BehaveAgent._item_description(mock_context, mock_item) == f"Description:\na\nb\n\n{table}",
         f"Description is incorrect:\n"
@@ -343,6 +348,33 @@ def test_finish_launch(mock_timestamp, config):
     mock_rps.close.assert_called_once()
 
 
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_finish_launch_profiling(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.profiling = True
+    config.profiling_attributes = True
+    config.launch_attributes = ["smoke", "key:value"]
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.launch_uuid = None
+    mock_rps.start_launch.return_value = "launch_id"
+    mock_context = mock.Mock()
+    ba = BehaveAgent(config, mock_rps)
+    ba.start_launch(mock_context)
+    ba.post_log("message")
+    ba.finish_launch(mock_context)
+    log_kwargs = mock_rps.log.call_args_list[-1][1]
+    expect(log_kwargs["item_id"] is None)
+    expect("post_log" in log_kwargs["message"])
+    expect("client.start_launch" in log_kwargs["message"])
+    expect(log_kwargs["attachment"]["name"] == "agent_profile.json")
+    attributes = mock_rps.finish_launch.call_args[1]["attributes"]
+    expect([a["key"] for a in attributes[-2:]] == ["agent_cpu_ms", "client_wait_ms"])
+    expect(attributes[:2] == [{"value": "smoke"}, {"key": "key", "value": "value"}])
+    expect(attributes[:-2] == mock_rps.start_launch.call_args[1]["attributes"])
+    expect(ba._client is mock_rps)
+    assert_expectations()
+
+
 @mock.patch("behave_reportportal.behave_agent.timestamp")
 def test_skip_finish_launch(mock_timestamp, config):
     mock_timestamp.return_value = 123
@@ -356,6 +388,61 @@ def test_skip_finish_launch(mock_timestamp, config):
     mock_rps.finish_launch.assert_not_called()
 
 
+@mock.patch("behave_reportportal.behave_agent.create_rp_service")
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_coordinated_launch(mock_timestamp, mock_create_rp_service, config, tmp_path):
+    mock_timestamp.return_value = 123
+    config.launch_coordinator_file = str(tmp_path / "launch.json")
+    first_rps = mock.create_autospec(RPClient)
+    first_rps.launch_uuid = None
+    first_rps.start_launch.return_value = "launch_uuid"
+    first = BehaveAgent(config, first_rps)
+    first.start_launch(mock.Mock())
+
+    Singleton._instances = {}
+    second_rps, joined_rps = mock.create_autospec(RPClient), mock.create_autospec(RPClient)
+    second_rps.launch_uuid = None
+    joined_rps.launch_uuid = "launch_uuid"
+    joined_rps.use_own_launch = False
+    mock_create_rp_service.return_value = joined_rps
+    second = BehaveAgent(config, second_rps)
+    second.start_launch(mock.Mock())
+    expect(second._launch_id == "launch_uuid")
+    expect(second._rp is joined_rps)
+    expect(config.launch_uuid == "launch_uuid")
+    second_rps.start_launch.assert_not_called()
+    second_rps.close.assert_called_once()
+
+    first.finish_launch(mock.Mock())
+    first_rps.finish_launch.assert_not_called()
+    second._launch_failed = True
+    second.finish_launch(mock.Mock())
+    joined_rps.finish_launch.assert_called_once_with(end_time=123, status="FAILED")
+    expect(joined_rps.use_own_launch is True)
+    assert_expectations()
+
+
+@mock.patch("behave_reportportal.behave_agent.create_rp_service")
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_coordinated_launch_threaded_client(mock_timestamp, mock_create_rp_service, config, tmp_path):
+    mock_timestamp.return_value = 123
+    config.launch_coordinator_file = str(tmp_path / "launch.json")
+    rps = mock.create_autospec(ThreadedRPClient)
+    rps.launch_uuid = None
+    rps.own_launch = True
+    # asynchronous clients return a task of the launch UUID
+    rps.start_launch.return_value = mock.Mock(blocking_result=mock.Mock(return_value="launch_uuid"))
+    agent = BehaveAgent(config, rps)
+    agent.start_launch(mock.Mock())
+    with open(config.launch_coordinator_file, encoding="utf-8") as f:
+        expect(json.load(f)["launch_uuid"] == "launch_uuid")
+    rps.own_launch = False
+    agent.finish_launch(mock.Mock())
+    expect(rps.own_launch is True)
+    rps.finish_launch.assert_called_once_with(end_time=123, status="PASSED")
+    assert_expectations()
+
+
 @mock.patch("behave_reportportal.behave_agent.timestamp")
 def test_start_skipped_feature(mock_timestamp, config):
     mock_feature = mock.Mock()
@@ -528,6 +615,191 @@ def test_finish_failed_scenario_step_based(mock_log, mock_start_step, mock_finis
     mock_finish_step.assert_called_once_with(mock_context, mock_skipped_step)
 
 
+@pytest.mark.parametrize(
+    "mode,layout,expected_items",
+    [(SkippedStepsMode.LIGHT, LogLayout.STEP, True), (SkippedStepsMode.LIGHT, LogLayout.NESTED, False)],
+)
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+@mock.patch.object(BehaveAgent, "start_step")
+def test_skipped_steps_light(mock_start_step, mock_timestamp, config, mode, layout, expected_items):
+    mock_timestamp.return_value = 123
+    config.log_layout = layout
+    config.skipped_steps_mode = mode
+    mock_steps = []
+    for name in ("first", "second"):
+        mock_step = mock.Mock(keyword="Then", status=Status.skipped)
+        mock_step.name = name
+        mock_step.location = None
+        mock_steps.append(mock_step)
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "step_id"
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    ba._log_skipped_steps(mock.Mock(), mock.Mock(steps=[mock.Mock(status=Status.failed)] + mock_steps))
+    mock_start_step.assert_not_called()
+    mock_rps.start_test_item.assert_called_once_with(
+        name="Skipped steps (2)",
+        start_time=123,
+        item_type="STEP",
+        parent_item_id="scenario_id",
+        code_ref=None,
+        description="[Then]: first\n[Then]: second",
+        has_stats=expected_items,
+    )
+    mock_rps.finish_test_item.assert_called_once_with(item_id="step_id", end_time=123, status="SKIPPED")
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_skipped_steps_summary(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.log_layout = LogLayout.STEP
+    config.skipped_steps_mode = SkippedStepsMode.SUMMARY
+    mock_steps = []
+    for name in ("first", "second"):
+        mock_step = mock.Mock(keyword="Then", status=Status.skipped)
+        mock_step.name = name
+        mock_steps.append(mock_step)
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    ba._log_skipped_steps(mock.Mock(), mock.Mock(steps=[mock.Mock(status=Status.failed)] + mock_steps))
+    mock_rps.start_test_item.assert_not_called()
+    mock_rps.log.assert_called_once_with(
+        time=123, message="Skipped steps:\n[Then]: first\n[Then]: second", level="INFO", item_id="scenario_id"
+    )
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_coalesced_step_logs(mock_timestamp, config):
+    mock_timestamp.side_effect = map(str, range(1000))
+    config.coalesce_step_logs = True
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "scenario_id"
+    mock_context = mock.Mock()
+    mock_context._stack = [{"@layer": "scenario", "@cleanups": [mock.Mock(__name__="close_browser")]}]
+    mock_context.active_outline = None
+    mock_scenario = mock.Mock()
+    mock_scenario.tags = ["fixture.browser"]
+    mock_scenario.description = []
+    mock_scenario.status.name = "failed"
+    mock_scenario.steps = []
+    mock_scenario.exception = None
+    mock_scenario.error_message = None
+    mock_steps = []
+    for name, status in (("first", "passed"), ("second", "failed")):
+        mock_step = mock.Mock(keyword="Given", text=None, table=None, exception=None, error_message="error")
+        mock_step.name = name
+        mock_step.status.name = status
+        mock_steps.append(mock_step)
+    ba = BehaveAgent(config, mock_rps)
+    ba.start_scenario(mock_context, mock_scenario)
+    for mock_step in mock_steps:
+        ba.start_step(mock_context, mock_step)
+        ba.finish_step(mock_context, mock_step)
+    ba.finish_scenario(mock_context, mock_scenario)
+    messages = [(c[1]["level"], c[1]["message"]) for c in mock_rps.log.call_args_list]
+    times = [int(c[1]["time"]) for c in mock_rps.log.call_args_list]
+    # the coalesced entry has the time of its first line, so it's sorted before the exceptions
+    expect(times[2] < times[0] < times[1])
+    expect(messages[0] == ("ERROR", "Step [Given]: second was finished with exception.\nerror"))
+    expect(messages[1][0] == "ERROR")
+    expect(
+        messages[2]
+        == (
+            "INFO",
+            "Using of 'browser' fixture\n[Given]: first.\n[Given]: second.\n"
+            "Execution of 'close_browser' cleanup function",
+        )
+    )
+    expect(len(messages) == 3)
+    assert_expectations()
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_collapsed_outline(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.outline_mode = OutlineMode.COLLAPSED
+    config.log_layout = LogLayout.STEP
+    feature = parse_feature(
+        "Feature: feature\n"
+        "  Scenario Outline: outline\n"
+        "    Given a step <a>\n"
+        "    Examples:\n"
+        "      | a |\n"
+        "      | 1 |\n"
+        "      | 2 |\n"
+        "      | 3 |\n"
+        "  Scenario: plain\n"
+        "    Given a step\n"
+    )
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.side_effect = lambda **kwargs: kwargs.get("uuid") or kwargs["name"]
+    mock_context = mock.Mock()
+    mock_context._stack = []
+    ba = BehaveAgent(config, mock_rps)
+    ba._feature_id = "feature"
+    for scenario in feature.walk_scenarios():
+        mock_context.active_outline = getattr(scenario, "_row", None)
+        ba.start_scenario(mock_context, scenario)
+        for step in scenario.steps:
+            ba.start_step(mock_context, step)
+            step.set_status(Status.failed if step.name == "a step 2" else Status.passed)
+            ba.finish_step(mock_context, step)
+        ba.finish_scenario(mock_context, scenario)
+
+    started = [c[1] for c in mock_rps.start_test_item.call_args_list]
+    expect([(s["name"], s["parent_item_id"]) for s in started][0] == ("outline", "feature"))
+    expect(started[0]["item_type"] == "TEST")
+    # only the failed row is reported with its step
+    expect(started[1]["name"] == "outline -- @1.2 " and started[1]["parent_item_id"] == "outline")
+    expect(started[2]["parent_item_id"] == started[1]["uuid"])
+    expect(started[3]["name"] == "plain" and started[3]["parent_item_id"] == "feature")
+    expect(len(started) == 5)
+    summary = next(c[1] for c in mock_rps.log.call_args_list if c[1]["item_id"] == "outline")
+    expect(summary["message"].startswith("Passed rows: 2, failed rows: 1, skipped rows: 0"))
+    expect(mock.call(item_id="outline", end_time=123, status="FAILED") in mock_rps.finish_test_item.call_args_list)
+    assert_expectations()
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_post_hoc_reporting(mock_timestamp, config):
+    mock_timestamp.return_value = "123"
+    config.post_hoc_reporting = True
+    config.log_layout = LogLayout.STEP
+    feature = parse_feature("Feature: feature\n  Scenario: scenario\n    Given a step\n")
+    feature.run_starttime = 100.0
+    scenario = feature.scenarios[0]
+    step = scenario.steps[0]
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.side_effect = lambda **kwargs: kwargs["uuid"]
+    mock_context = mock.Mock(_stack=[], active_outline=None, table=None)
+    ba = BehaveAgent(config, mock_rps)
+    ba._launch_id = "launch_id"
+    ba.start_feature(mock_context, feature)
+    ba.start_scenario(mock_context, scenario)
+    ba.start_step(mock_context, step)
+    ba.post_log("message")
+    step.set_status(Status.passed)
+    step.duration = 1.5
+    ba.finish_step(mock_context, step)
+    ba.finish_scenario(mock_context, scenario)
+    expect(not mock_rps.start_test_item.called)
+    ba.finish_feature(mock_context, feature)
+    expect(ba._rp is mock_rps)
+    ba.finish_launch(mock_context)
+
+    started = [c[1] for c in mock_rps.start_test_item.call_args_list]
+    finished = [c[1] for c in mock_rps.finish_test_item.call_args_list]
+    expect([s["start_time"] for s in started] == ["100000", "100000", "100000"])
+    expect([f["end_time"] for f in finished] == ["101500", "101500", "101500"])
+    expect(started[2]["parent_item_id"] == started[1]["uuid"])
+    # the log time is moved into the measured step time
+    mock_rps.log.assert_called_once_with(
+        time="100000", message="message", level="INFO", attachment=None, item_id=started[2]["uuid"]
+    )
+    assert_expectations()
+
+
 @mock.patch("behave_reportportal.behave_agent.timestamp")
 def test_start_step_step_based(mock_timestamp, config):
     config.log_layout = LogLayout.STEP
@@ -691,6 +963,187 @@ def test_finish_failed_step_scenario_based(mock_timestamp, config):
         mock_rps.log.assert_has_calls(calls, any_order=True)
 
 
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_log_exception_compact(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.compact_tracebacks = True
+    try:
+        raise ValueError("error!")
+    except ValueError as exc:
+        error = exc
+        mock_step = mock.Mock(exception=exc, exc_traceback=sys.exc_info()[2], error_message=traceback.format_exc())
+    mock_scenario = mock.Mock(exception=error, exc_traceback=mock_step.exc_traceback, error_message=None)
+    mock_scenario.name = "name"
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    with mock.patch("behave_reportportal.behave_agent.format_traceback", return_value="formatted") as mock_format:
+        ba._log_step_exception(mock_step, "step_id")
+        ba._log_scenario_exception(mock_scenario)
+    mock_format.assert_called_with(error, mock_step.exc_traceback, True, 10, 8192)
+    # the traceback in the Behave error message is not sent again
+    mock_rps.log.assert_has_calls(
+        [
+            mock.call(item_id="step_id", time=123, level="ERROR", message=mock.ANY),
+            mock.call(
+                item_id="scenario_id",
+                time=123,
+                level="ERROR",
+                message="Scenario 'name' finished with error.\nformatted",
+            ),
+        ]
+    )
+    assert mock_rps.log.call_args_list[0].kwargs["message"].endswith("with exception.\nformatted")
+
+
+def failed_scenario(message):
+    try:
+        raise RuntimeError(message)
+    except RuntimeError as exc:
+        mock_scenario = mock.Mock(exception=exc, exc_traceback=sys.exc_info()[2], error_message=f"ERROR: {message}")
+    mock_scenario.name = "name"
+    mock_scenario.tags = ["smoke", "attribute(team:core)"]
+    mock_scenario.status.name = "failed"
+    mock_scenario.steps = []
+    return mock_scenario
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_failure_deduplication(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.failure_deduplication = True
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.launch_uuid = None
+    mock_context = mock.Mock()
+    mock_context._stack = []
+    ba = BehaveAgent(config, mock_rps)
+    ba._launch_id = "launch_id"
+    for scenario_id, message in (("scenario_1", "refused after 3 s"), ("scenario_2", "refused after 5 s")):
+        ba._scenario_id = scenario_id
+        ba.finish_scenario(mock_context, failed_scenario(message))
+
+    first_log, second_log = mock_rps.log.call_args_list
+    first_attributes, second_attributes = [
+        finish.kwargs["attributes"] for finish in mock_rps.finish_test_item.call_args_list
+    ]
+    fingerprint = first_attributes[-1]["value"]
+    expect("Traceback (most recent call last)" in first_log.kwargs["message"])
+    expect(
+        second_log.kwargs["message"] == "Scenario 'name' finished with error.\n"
+        f"Same failure as in item scenario_1, fingerprint: {fingerprint}\nERROR: refused after 5 s"
+    )
+    expect(
+        first_attributes
+        == [{"value": "smoke"}, {"key": "team", "value": "core"}, {"key": "failure", "value": fingerprint}]
+    )
+    expect(second_attributes == first_attributes)
+
+    ba.finish_launch(mock_context)
+    summary = mock_rps.log.call_args.kwargs["message"]
+    expect(summary.startswith("Failure clusters: 1"))
+    expect(f"| {fingerprint} |   2   |" in summary)
+    assert_expectations()
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_log_budget(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.log_budget_messages = 2
+    mock_scenario = mock.Mock()
+    mock_scenario.tags = []
+    mock_scenario.status.name = "passed"
+    mock_context = mock.Mock()
+    mock_context._stack = []
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = ba._log_item_id = "scenario_id"
+    for index in range(5):
+        ba.post_log(f"message {index}")
+    ba.post_log("warning", level="WARN")
+    assert [c.kwargs["message"] for c in mock_rps.log.call_args_list] == ["message 0", "message 1", "warning"]
+
+    ba.finish_scenario(mock_context, mock_scenario)
+    mock_rps.log.assert_called_with(
+        time=123, message="3 log messages (27 bytes) suppressed by the log budget", level="WARN", item_id="scenario_id"
+    )
+
+
+def test_log_level_threshold(config):
+    config.log_level = "INFO"
+    mock_rps = mock.create_autospec(RPClient)
+    expensive_message = mock.Mock(return_value="response dump")
+    ba = BehaveAgent(config, mock_rps)
+    ba._log_item_id = "step_id"
+    ba.post_log(expensive_message, level="DEBUG")
+    ba.post_launch_log("%s", level="DEBUG", args=(expensive_message,))
+    expensive_message.assert_not_called()
+    mock_rps.log.assert_not_called()
+
+    ba.post_log(expensive_message, level="INFO")
+    ba.post_launch_log("Response: %s", level="ERROR", args=("body",))
+    expensive_message.assert_called_once_with()
+    assert [(c.kwargs["message"], c.kwargs["item_id"]) for c in mock_rps.log.call_args_list] == [
+        ("response dump", "step_id"),
+        ("Response: body", None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "status,expected_output", [("passed", "... 8 characters skipped ...\nI log\n"), ("failed", "")]
+)
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_captured_output_log(mock_timestamp, config, status, expected_output):
+    mock_timestamp.return_value = 123
+    config.capture_output = CaptureMode.LOG
+    config.capture_max_size = 20
+    config.coalesced_log_size = 40
+    mock_step = mock.Mock(keyword="When", error_message=None)
+    mock_step.name = "I log"
+    mock_step.status.name = status
+    mock_step.captured = ManyCaptured([Captured(stdout="line 1\nline 2", name="step")])
+    mock_scenario = mock.Mock(steps=[mock_step], all_steps=[mock_step], tags=[], exception=None, error_message=None)
+    mock_scenario.status.name = status
+    mock_context = mock.Mock()
+    mock_context._stack = []
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    with mock.patch.object(BehaveAgent, "_log_exception"):
+        ba.finish_scenario(mock_context, mock_scenario)
+    text = "Captured stdout:\n" + (expected_output or "[When]: I log\n") + "line 1\nline 2"
+    chunks = [c.kwargs["message"] for c in mock_rps.log.call_args_list]
+    assert "\n".join(chunks) == text
+    assert len(chunks) > 1
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_captured_output_attachment(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.capture_output = CaptureMode.ATTACHMENT
+    mock_step = mock.Mock(keyword="When", error_message=None)
+    mock_step.name = "I log"
+    mock_step.captured = ManyCaptured([Captured(stderr="warning", name="step")])
+    mock_scenario = mock.Mock(steps=[mock_step], all_steps=[mock_step], tags=[])
+    mock_scenario.status.name = "passed"
+    mock_context = mock.Mock()
+    mock_context._stack = []
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    ba.finish_scenario(mock_context, mock_scenario)
+    mock_rps.log.assert_called_once_with(
+        time=123,
+        message="Captured output",
+        level="INFO",
+        attachment={
+            "name": "captured_output.txt",
+            "data": b"Captured stderr:\n[When]: I log\nwarning\n",
+            "mime": "text/plain",
+        },
+        item_id="scenario_id",
+    )
+
+
 @mock.patch("behave_reportportal.behave_agent.timestamp")
 def test_log_exception_without_message(mock_timestamp, config):
     mock_timestamp.return_value = 123
@@ -722,7 +1175,7 @@ def test_post_log(mock_log, config):
     ba = BehaveAgent(config, mock_rps)
     ba._log_item_id = "log_item_id"
     ba.post_log("message", file_to_attach="filepath")
-    mock_log.assert_called_once_with("message", "INFO", item_id="log_item_id", file_to_attach="filepath")
+    mock_log.assert_called_once_with("message", "INFO", item_id="log_item_id", file_to_attach="filepath", args=None)
 
 
 @mock.patch.object(BehaveAgent, "_log")
@@ -731,58 +1184,233 @@ def test_post_launch_log(mock_log, config):
     ba = BehaveAgent(config, mock_rps)
     ba._log_item_id = "log_item_id"
     ba.post_launch_log("message", file_to_attach="filepath")
-    mock_log.assert_called_once_with("message", "INFO", file_to_attach="filepath")
+    mock_log.assert_called_once_with("message", "INFO", file_to_attach="filepath", args=None)
 
 
 @mock.patch("behave_reportportal.behave_agent.mimetypes")
 @mock.patch("behave_reportportal.behave_agent.timestamp")
-def test_post__log(mock_timestamp, mock_mime, config):
+def test_post__log(mock_timestamp, mock_mime, config, tmp_path):
     mock_timestamp.return_value = 123
     mock_rps = mock.create_autospec(RPClient)
     ba = BehaveAgent(config, mock_rps)
     mock_mime.guess_type.return_value = ("mime_type", None)
-    with mock.patch("builtins.open", mock.mock_open(read_data="data")):
-        ba._log("message", "ERROR", file_to_attach="filepath", item_id="item_id")
-        mock_rps.log.assert_called_once_with(
-            time=123,
-            message="message",
-            level="ERROR",
-            attachment={
-                "name": "filepath",
-                "data": "data",
-                "mime": "mime_type",
-            },
-            item_id="item_id",
+    file_path = tmp_path / "filepath"
+    file_path.write_bytes(b"data")
+    ba._log("message", "ERROR", file_to_attach=file_path, item_id="item_id")
+    mock_rps.log.assert_called_once_with(
+        time=123,
+        message="message",
+        level="ERROR",
+        attachment={
+            "name": "filepath",
+            "data": mock.ANY,
+            "mime": "mime_type",
+        },
+        item_id="item_id",
+    )
+    assert mock_rps.log.call_args[1]["attachment"]["data"] == b"data"
+
+
+def test_post__log_file_overwritten(config, tmp_path):
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / "screenshot.png"
+    for data in (b"FIRST DATA", b"SECOND"):
+        file_path.write_bytes(data)
+        ba._log("message", "INFO", file_to_attach=file_path)
+    assert [c[1]["attachment"]["data"] for c in mock_rps.log.call_args_list] == [b"FIRST DATA", b"SECOND"]
+
+
+def test_post__log_lazy_attachments(config, tmp_path):
+    config.lazy_attachments = True
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / "filepath"
+    file_path.write_bytes(b"data")
+    ba._log("message", "INFO", file_to_attach=file_path)
+    data = mock_rps.log.call_args[1]["attachment"]["data"]
+    assert isinstance(data, FileContent)
+    assert len(data) == 4
+    file_path.unlink()
+    assert data.read() == b"data"
+
+
+def test_post__log_not_rp_client(config, tmp_path):
+    mock_rps = mock.Mock()
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / "file.txt"
+    file_path.write_bytes(b"data")
+    ba._log("message", "INFO", file_to_attach=file_path)
+    assert mock_rps.log.call_args[1]["attachment"]["data"] == b"data"
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_post__log_attachment_max_size(mock_timestamp, config, tmp_path):
+    mock_timestamp.return_value = 123
+    config.attachment_max_size = 3
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / "file.txt"
+    file_path.write_bytes(b"data")
+    ba._log("message", "INFO", file_to_attach=file_path, item_id="item_id")
+    mock_rps.log.assert_called_once_with(
+        time=123,
+        message="message\n\nAttachment 'file.txt' was not uploaded: its size 4 bytes exceeds the limit of 3 bytes.",
+        level="INFO",
+        attachment=None,
+        item_id="item_id",
+    )
+
+
+@pytest.mark.parametrize(
+    "name,compressed",
+    [("response.json", True), ("image.png", False)],
+)
+def test_post__log_attachment_compression(config, tmp_path, name, compressed):
+    config.attachment_compression_threshold = 10
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / name
+    file_path.write_bytes(b"0" * 100)
+    ba._log("message", "INFO", file_to_attach=file_path)
+    attachment = mock_rps.log.call_args[1]["attachment"]
+    if compressed:
+        assert attachment["name"] == "response.json.gz"
+        assert attachment["mime"] == "application/gzip"
+        assert gzip.decompress(attachment["data"]) == b"0" * 100
+    else:
+        assert attachment["name"] == "image.png"
+        assert attachment["mime"] == "image/png"
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_post__log_deferred_upload(mock_timestamp, config, tmp_path):
+    mock_timestamp.return_value = 123
+    config.upload_workers = 2
+    mock_rps = mock.create_autospec(RPClient)
+    threads = []
+    mock_rps.log.side_effect = lambda **kwargs: threads.append(threading.current_thread().name) or ("log_id",)
+    ba = BehaveAgent(config, mock_rps)
+    ba._launch_id = "launch_id"
+    file_path = tmp_path / "screenshot.png"
+    file_path.write_bytes(b"image")
+    future = ba._log("message", "INFO", file_to_attach=file_path, item_id="item_id")
+    file_path.unlink()
+    assert isinstance(future, Future)
+    assert future.result(5) == ("log_id",)
+    ba.finish_launch(mock.Mock())
+    mock_rps.log.assert_called_once_with(
+        time=123,
+        message="message",
+        level="INFO",
+        attachment={"name": "screenshot.png", "data": mock.ANY, "mime": "image/png"},
+        item_id="item_id",
+    )
+    assert threads[0].startswith("rp-uploader")
+    assert mock_rps.log.call_args[1]["attachment"]["data"] == b"image"
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_finish_launch_upload_timeout(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.upload_workers = 1
+    config.upload_timeout = 0.1
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    ba._launch_id = "launch_id"
+    release = threading.Event()
+    ba._upload_pool.submit(release.wait)
+    ba.finish_launch(mock.Mock())
+    release.set()
+    mock_rps.log.assert_called_once_with(
+        time=123, message="1 attachment(s) were not uploaded in 0.1 seconds", level="WARN"
+    )
+
+
+def test_create_rp_service_log_batch_compression():
+    client = create_rp_service(Config(endpoint="A", api_key="B", project="C", log_batch_compression="True"))
+    # noinspection PyProtectedMember
+    assert isinstance(client.session._client.get_adapter("http://A/api/v2/C/log"), GzipLogAdapter)
+    with pytest.warns(RuntimeWarning):
+        create_rp_service(
+            Config(endpoint="A", api_key="B", project="C", log_batch_compression="True", client_type="ASYNC_THREAD")
         )
 
 
-@mock.patch.object(PrettyTable, "__init__")
-@mock.patch.object(PrettyTable, "add_row")
-@mock.patch.object(PrettyTable, "get_string")
-def test_build_table_content(mock_get_string, mock_add_row, mock_init):
-    mock_init.return_value = None
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_post__log_attachment_not_found(mock_timestamp, config, tmp_path):
+    mock_timestamp.return_value = 123
+    mock_rps = mock.create_autospec(RPClient)
+    ba = BehaveAgent(config, mock_rps)
+    file_path = tmp_path / "file.txt"
+    ba._log("message", "INFO", file_to_attach=file_path, item_id="item_id")
+    mock_rps.log.assert_has_calls(
+        [
+            mock.call(time=123, message=f"Attachment not found: {file_path}", level="WARN", item_id="item_id"),
+            mock.call(time=123, message="message", level="INFO", attachment=None, item_id="item_id"),
+        ]
+    )
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_post__log_attachment_deduplication(mock_timestamp, config, tmp_path):
+    mock_timestamp.return_value = 123
+    config.attachment_deduplication = True
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.launch_uuid = None
+    mock_rps.start_launch.return_value = "launch_id"
+    ba = BehaveAgent(config, mock_rps)
+    ba.start_launch(mock.Mock())
+    first, second, other = tmp_path / "first.txt", tmp_path / "second.txt", tmp_path / "other.txt"
+    first.write_bytes(b"data")
+    second.write_bytes(b"data")
+    other.write_bytes(b"other data")
+    ba._log("first", "INFO", file_to_attach=first, item_id="item_1")
+    ba._log("second", "INFO", file_to_attach=second, item_id="item_2")
+    ba._log("other", "INFO", file_to_attach=other)
+    ba._log("launch", "INFO", file_to_attach=other, item_id="item_3")
+    calls = mock_rps.log.call_args_list
+    expect(calls[0][1]["attachment"] is not None)
+    expect(calls[1][1]["attachment"] is None)
+    expect(calls[1][1]["message"] == "second\n\nSame as attachment 'first.txt' in item item_1")
+    expect(calls[2][1]["attachment"] is not None)
+    expect(calls[3][1]["message"] == "launch\n\nSame as attachment 'other.txt' in item launch_id")
+    assert_expectations()
+
+
+def test_build_table_content(config):
     mock_step, mock_table, mock_rows = mock.Mock(), mock.Mock(), mock.Mock()
     mock_table.headings = ["A", "B"]
-    mock_rows.cells = ["c", "d"]
+    mock_rows.cells = ["c", "long value"]
     mock_table.rows = [mock_rows]
     mock_step.table = mock_table
     mock_step.text = None
-    BehaveAgent._build_step_content(mock_step)
-    mock_init.assert_called_once_with(field_names=["A", "B"])
-    mock_add_row.assert_called_once_with(["c", "d"])
-    mock_get_string.assert_called_once()
+    text = BehaveAgent(config, mock.create_autospec(RPClient))._build_step_content(mock_step)
+    assert text == "|  A  |     B      |\n| :-: | :--------: |\n|  c  | long value |"
 
 
-@mock.patch.object(PrettyTable, "__init__")
-def test_build_text_content(mock_init):
+def test_build_text_content(config):
     mock_step = mock.Mock()
     mock_step.table = None
     mock_step.text = "Step text"
-    text = BehaveAgent._build_step_content(mock_step)
-    mock_init.assert_not_called()
+    text = BehaveAgent(config, mock.create_autospec(RPClient))._build_step_content(mock_step)
     assert text == "```\nStep text\n```\n"
 
 
+@mock.patch("behave_reportportal.rendering.step_content")
+def test_build_step_content_cached(mock_step_content, config):
+    mock_step_content.return_value = "content"
+    mock_step, other_step = mock.Mock(), mock.Mock()
+    other_step.location = mock_step.location
+    ba = BehaveAgent(config, mock.create_autospec(RPClient))
+    expect(ba._build_step_content(mock_step) == "content")
+    expect(ba._build_step_content(mock_step) == "content")
+    expect(mock_step_content.call_count == 1)
+    ba._build_step_content(other_step)
+    expect(mock_step_content.call_count == 2)
+    assert_expectations()
+
+
 @mock.patch("behave_reportportal.behave_agent.timestamp")
 def test_log_scenario_exception_default_message(mock_timestamp, config):
     mock_timestamp.return_value = 123
@@ -958,3 +1586,130 @@ def test_log_cleanup_scenario_based(mock_timestamp, config, scope, item_id):
         for f_name in ("cleanup_func1", "cleanup_func2")
     ]
     mock_rps.log.assert_has_calls(calls)
+
+
+@pytest.mark.parametrize(
+    "mode,log_layout,expected_items",
+    [
+        (FixtureReportMode.AGGREGATED, LogLayout.STEP, True),
+        (FixtureReportMode.AGGREGATED, LogLayout.SCENARIO, False),
+        (FixtureReportMode.LOG, LogLayout.STEP, False),
+    ],
+)
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_log_fixtures_aggregated(mock_timestamp, config, mode, log_layout, expected_items):
+    mock_timestamp.return_value = 123
+    config.fixture_report_mode = mode
+    config.log_layout = log_layout
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "fixtures_id"
+    mock_item = mock.Mock()
+    mock_item.tags = ["fixture.A", "fixture.B"]
+    BehaveAgent(config, mock_rps)._log_fixtures(mock_item, "BEFORE_TEST", "item_id")
+    msg = "Using of fixtures: 'A', 'B'"
+    if expected_items:
+        mock_rps.start_test_item.assert_called_once_with(
+            name=msg, start_time=123, item_type="BEFORE_TEST", parent_item_id="item_id", has_stats=True
+        )
+        mock_rps.finish_test_item.assert_called_once_with(item_id="fixtures_id", end_time=123, status="PASSED")
+        mock_rps.log.assert_not_called()
+    else:
+        mock_rps.log.assert_called_once_with(123, msg, level="INFO", item_id="item_id")
+        mock_rps.start_test_item.assert_not_called()
+
+
+def run_cleanups(context, scope):
+    # the same way as Behave does on the layer pop, after the after_* hook
+    layer = next(level for level in context._stack if level.get("@layer") == scope)
+    for cleanup in reversed(layer["@cleanups"]):
+        try:
+            cleanup()
+        except Exception:
+            pass
+    layer["@cleanups"] = []
+
+
+def failing_cleanup():
+    raise RuntimeError("cleanup error")
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_finish_scenario_with_aggregated_cleanups(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.log_layout = LogLayout.STEP
+    config.fixture_report_mode = FixtureReportMode.AGGREGATED
+    mock_scenario = mock.Mock()
+    mock_scenario.tags = []
+    mock_scenario.status.name = "passed"
+    mock_rps = mock.create_autospec(RPClient)
+    mock_rps.start_test_item.return_value = "cleanups_id"
+    mock_context = mock.Mock()
+    mock_context._stack = [{"@layer": "scenario", "@cleanups": [mock.Mock(__name__="close_browser"), failing_cleanup]}]
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    ba.finish_scenario(mock_context, mock_scenario)
+    mock_rps.start_test_item.assert_not_called()
+    mock_rps.finish_test_item.assert_not_called()
+
+    run_cleanups(mock_context, "scenario")
+    kwargs = mock_rps.start_test_item.call_args.kwargs
+    expect(kwargs["name"] == "Execution of cleanup functions: 'failing_cleanup', 'close_browser'")
+    expect(kwargs["item_type"] == "AFTER_TEST")
+    expect(kwargs["parent_item_id"] == "scenario_id")
+    expect("failed with RuntimeError: cleanup error" in kwargs["description"])
+    expect(
+        mock_rps.finish_test_item.call_args_list
+        == [
+            mock.call(item_id="cleanups_id", end_time=mock.ANY, status="FAILED"),
+            mock.call(item_id="scenario_id", status="PASSED", end_time=123),
+        ]
+    )
+    assert_expectations()
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_finish_scenario_with_logged_cleanups(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.log_layout = LogLayout.STEP
+    config.fixture_report_mode = FixtureReportMode.LOG
+    mock_scenario = mock.Mock()
+    mock_scenario.tags = []
+    mock_scenario.status.name = "passed"
+    mock_rps = mock.create_autospec(RPClient)
+    mock_context = mock.Mock()
+    mock_context._stack = [{"@layer": "scenario", "@cleanups": [mock.Mock(__name__="close_browser")]}]
+    ba = BehaveAgent(config, mock_rps)
+    ba._scenario_id = "scenario_id"
+    ba.finish_scenario(mock_context, mock_scenario)
+    mock_rps.finish_test_item.assert_called_once_with(item_id="scenario_id", status="PASSED", end_time=123)
+    mock_rps.log.assert_not_called()
+
+    run_cleanups(mock_context, "scenario")
+    mock_rps.start_test_item.assert_not_called()
+    mock_rps.log.assert_called_once_with(123, mock.ANY, level="INFO", item_id="scenario_id")
+    message = mock_rps.log.call_args.args[1]
+    assert message.startswith("Execution of 'close_browser' cleanup function: ")
+    assert message.endswith(" ms")
+
+
+@mock.patch("behave_reportportal.behave_agent.timestamp")
+def test_deferred_finish_flushed_on_launch_finish(mock_timestamp, config):
+    mock_timestamp.return_value = 123
+    config.log_layout = LogLayout.STEP
+    config.fixture_report_mode = FixtureReportMode.AGGREGATED
+    mock_feature = mock.Mock()
+    mock_feature.tags = []
+    mock_feature.status.name = "passed"
+    mock_rps = mock.create_autospec(RPClient)
+    mock_context = mock.Mock()
+    mock_context._stack = [{"@layer": "feature", "@cleanups": [mock.Mock(__name__="stop_server")]}]
+    ba = BehaveAgent(config, mock_rps)
+    ba._feature_id = "feature_id"
+    ba.finish_feature(mock_context, mock_feature)
+    mock_rps.finish_test_item.assert_not_called()
+
+    ba.finish_launch(mock_context)
+    mock_rps.finish_test_item.assert_called_once_with(item_id="feature_id", status="PASSED", end_time=123)
+    # cleanup functions which run after the launch finish don't report anything
+    run_cleanups(mock_context, "feature")
+    mock_rps.start_test_item.assert_not_called()
@@ -0,0 +1,69 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import pytest
+
+from behave_reportportal.tags import EMPTY_TAGS, get_parsed_tags, parse_tags
+
+
+@pytest.mark.parametrize(
+    "tags,exp_attrs",
+    [
+        (["attribute(a(b),c)"], ["a(b)", "c"]),
+        (["attribute(key:value\\,with_comma,v2)"], ["key:value,with_comma", "v2"]),
+        (["attribute(v\\)1)"], ["v)1"]),
+        (["attribute(a,,b)"], ["a", "b"]),
+        (["attribute(a(b)"], []),
+        (["attribute(a)b)"], []),
+    ],
+)
+def test_attribute_arguments(tags, exp_attrs):
+    assert list(get_parsed_tags(tags).attributes) == exp_attrs
+
+
+def test_parse_tags():
+    parsed = get_parsed_tags(
+        ["smoke", "skip", "fixture.browser(firefox)", "attribute(k:v)", "test_case_id(TC-1)", "test_case_id(TC-2)"]
+    )
+    assert parsed.plain == ("smoke", "skip")
+    assert parsed.attributes == ("k:v",)
+    assert parsed.payload == ({"value": "smoke"}, {"value": "skip"}, {"key": "k", "value": "v"})
+    assert parsed.fixtures == ("browser(firefox)",)
+    assert parsed.test_case_id == "TC-1"
+    assert parsed.skip is True
+
+
+@pytest.mark.parametrize(
+    "tag,expected",
+    [
+        ("test_case_id(TC-1)", "TC-1"),
+        ("test_case_id( a, b )", "a, b"),
+        (r"test_case_id(a\,b\)c)", "a,b)c"),
+        (r"test_case_id(f(x\\y))", "f(x\\y)"),
+    ],
+)
+def test_test_case_id_unescaped(tag, expected):
+    assert get_parsed_tags([tag]).test_case_id == expected
+
+
+@pytest.mark.parametrize("tags", [None, []])
+def test_parse_empty_tags(tags):
+    assert get_parsed_tags(tags) is EMPTY_TAGS
+
+
+def test_parse_tags_cached():
+    parse_tags.cache_clear()
+    first = get_parsed_tags(["a", "attribute(b)"])
+    second = get_parsed_tags(["a", "attribute(b)"])
+    assert first is second
+    assert parse_tags.cache_info().hits == 1
@@ -0,0 +1,90 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import json
+import os
+import sys
+import traceback
+from unittest import mock
+
+import pytest
+
+from behave_reportportal.tracebacks import TRACEBACK_HEADER, format_traceback, strip_traceback
+
+
+def recurse(depth):
+    if depth:
+        recurse(depth - 1)
+    json.loads("{")
+
+
+def make_exception(depth=0):
+    try:
+        recurse(depth)
+    except ValueError as exc:
+        return exc, sys.exc_info()[2]
+
+
+def test_full_traceback():
+    exc, tb = make_exception()
+    assert format_traceback(exc, tb) == "".join(traceback.format_exception(type(exc), exc, tb))
+
+
+@mock.patch("behave_reportportal.tracebacks._INTERNAL_PATHS", (os.path.dirname(__file__) + os.sep,))
+def test_compact_traceback_internal_frames():
+    exc, tb = make_exception()
+    text = format_traceback(exc, tb, compact=True)
+    assert text.startswith(TRACEBACK_HEADER)
+    assert __file__ not in text
+    assert os.path.join("json", "__init__.py") in text
+    assert text.rstrip().endswith(f"json.decoder.JSONDecodeError: {exc}")
+
+
+@mock.patch("behave_reportportal.tracebacks._INTERNAL_PATHS", ())
+def test_compact_traceback_depth():
+    exc, tb = make_exception(depth=30)
+    text = format_traceback(exc, tb, compact=True, max_depth=5)
+    assert text.count('  File "') == 5
+    # the innermost frames are kept
+    assert "in raw_decode" in text
+
+
+@pytest.mark.parametrize("max_length", [300, 1000])
+def test_compact_traceback_length(max_length):
+    exc, tb = make_exception(depth=30)
+    text = format_traceback(exc, tb, compact=True, max_depth=100, max_length=max_length)
+    assert len(text) == max_length
+    assert text.startswith(TRACEBACK_HEADER)
+    assert text.endswith(f"{exc}\n")
+
+
+def test_formatted_traceback_cached():
+    exc, tb = make_exception()
+    text = format_traceback(exc, tb, compact=True)
+    with mock.patch("behave_reportportal.tracebacks.traceback.TracebackException") as mock_formatter:
+        assert format_traceback(exc, tb, compact=True) is text
+        mock_formatter.assert_not_called()
+    assert format_traceback(exc, tb, compact=True, max_depth=1) != text
+
+
+@pytest.mark.parametrize(
+    "message,expected",
+    [
+        ("ASSERT FAILED: 1 != 2", "ASSERT FAILED: 1 != 2"),
+        (f"ASSERT FAILED: 1 != 2\n{TRACEBACK_HEADER}\n  File ...", "ASSERT FAILED: 1 != 2"),
+        (f"{TRACEBACK_HEADER}\n  File ...", ""),
+    ],
+)
+def test_strip_traceback(message, expected):
+    assert strip_traceback(message) == expected
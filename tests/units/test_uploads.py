@@ -0,0 +1,45 @@
+#  Copyright (c) 2023 EPAM Systems
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import threading
+
+from behave_reportportal.uploads import UploadPool
+
+
+def test_upload_pool():
+    pool = UploadPool(2)
+    results = [pool.submit(pow, 2, i) for i in range(5)]
+    assert pool.close(5) == 0
+    assert [r.result() for r in results] == [1, 2, 4, 8, 16]
+    assert pool.pending == 0
+
+
+def test_upload_pool_error():
+    def fail():
+        raise OSError("disk error")
+
+    pool = UploadPool(1)
+    future = pool.submit(fail)
+    assert pool.close(5) == 0
+    assert future.result() is None
+
+
+def test_upload_pool_timeout():
+    release = threading.Event()
+    pool = UploadPool(1)
+    pool.submit(release.wait)
+    queued = pool.submit(release.wait)
+    assert pool.close(0.1) == 2
+    assert queued.cancelled()
+    release.set()